@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Grafik uchun seriyalarni kamaytirish (downsampling) - lesson_2 va lesson_10 uchun umumiy.
+    - min/max: har bo'lakdan eng kichik va eng katta nuqta (cho'qqilar yo'qolmaydi,
+      piksel kengligiga tushirilganda ko'rinish o'zgarmaydi)
+    - LTTB (Largest-Triangle-Three-Buckets): har bo'lakdan shaklni eng yaxshi
+      saqlaydigan bitta nuqta
+    - numpy bo'lsa vektorlashtirilgan, bo'lmasa sof Python (lesson_10 standart
+      kutubxona bilan ishlaydi)
+
+Natija - tanlangan nuqtalar indekslari (o'sish tartibida): bir xil indekslar
+bilan vaqt o'qi va boshqa seriyalardan ham olish mumkin (take()).
+
+Darslar repo ildizini sys.path ga qo'shib import qiladi:
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+    from downsample import downsample, take
+
+    python downsample.py --points 1000000 --width 1200
+    python downsample.py --check
+"""
+
+import argparse
+import math
+import random
+import time
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+METHODS = ("minmax", "lttb")
+
+
+def _values(y):
+    """Sof Python uchun: ro'yxat (memoryview / array / deque -> list, bitta nusxa)"""
+    return y.tolist() if hasattr(y, "tolist") else list(y)
+
+
+def minmax(y, buckets):
+    """
+    Har bo'lakdan min va max (NaN lar e'tiborsiz)
+    Returns:
+        list yoki numpy.ndarray: Indekslar, ko'pi bilan 2 * buckets + 2
+    """
+    n = len(y)
+    if n <= 2 * buckets or buckets < 1:
+        return np.arange(n) if np is not None else list(range(n))
+    if np is not None:
+        return _minmax_numpy(np.asarray(y), buckets)
+    return _minmax_python(_values(y), buckets)
+
+
+def _minmax_numpy(y, buckets):
+    n = len(y)
+    y = np.asarray(y, dtype=np.float64)
+    # _minmax_python bilan bir xil chegaralar: [bucket * n // buckets, (bucket + 1) * n // buckets)
+    starts = np.arange(buckets) * n // buckets
+    segment = np.repeat(np.arange(buckets), np.diff(np.append(starts, n)))
+    picks = [(0, n - 1)]
+    for reduce in (np.fmin, np.fmax):      # fmin/fmax - NaN e'tiborsiz
+        extreme = reduce.reduceat(y, starts)
+        hits = np.flatnonzero(y == extreme[segment])
+        # Har bo'lakdagi birinchi mos nuqta (list.index kabi); faqat NaN li bo'lak - boshi
+        first = np.ones(len(hits), dtype=bool)
+        first[1:] = segment[hits[1:]] != segment[hits[:-1]]
+        index = starts.copy()
+        index[segment[hits[first]]] = hits[first]
+        picks.append(index)
+    return np.unique(np.concatenate(picks))
+
+
+def _minmax_python(y, buckets):
+    n = len(y)
+    indices = [0]
+    for bucket in range(buckets):
+        start = bucket * n // buckets
+        chunk = y[start:(bucket + 1) * n // buckets]
+        low = min(chunk)
+        high = max(chunk)
+        if low != low or high != high:
+            # Bo'lak NaN bilan boshlangan - min/max uni qaytaradi; NaN siz qayta hisoblash
+            finite = [value for value in chunk if value == value]
+            if not finite:
+                indices.append(start)
+                continue
+            low = min(finite)
+            high = max(finite)
+        i = chunk.index(low)
+        j = chunk.index(high)
+        indices.append(start + min(i, j))
+        indices.append(start + max(i, j))
+    indices.append(n - 1)
+    return sorted(set(indices))
+
+
+def lttb(y, threshold, x=None):
+    """
+    Largest-Triangle-Three-Buckets
+    Args:
+        y: Qiymatlar
+        threshold: Natijadagi nuqtalar soni
+        x: X qiymatlari (None - teng oraliq, indeks)
+    Returns:
+        list yoki numpy.ndarray: `threshold` ta indeks
+    """
+    n = len(y)
+    if n <= threshold or threshold < 3:
+        return np.arange(n) if np is not None else list(range(n))
+    if np is not None:
+        y = np.asarray(y, dtype=np.float64)
+        x = np.arange(n, dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+        return _lttb_numpy(x, y, threshold)
+    y = _values(y)
+    x = range(n) if x is None else _values(x)
+    return _lttb_python(x, y, threshold)
+
+
+def _lttb_numpy(x, y, threshold):
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    # Bo'lak chegaralari: [1 + i * every, 1 + (i + 1) * every)
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # Keyingi bo'laklarning o'rtachalari oldindan (kumulyativ yig'indi bilan);
+    # y da faqat chekli qiymatlar - bitta NaN keyingi bo'laklarni buzmasin
+    finite = np.isfinite(y)
+    cx = np.concatenate(((0.0,), np.cumsum(x)))
+    cy = np.concatenate(((0.0,), np.cumsum(np.where(finite, y, 0.0))))
+    cf = np.concatenate(((0,), np.cumsum(finite)))
+    starts = edges[1:]
+    ends = np.append(edges[2:], n)
+    avg_x = (cx[ends] - cx[starts]) / (ends - starts)
+    with np.errstate(invalid="ignore"):
+        # Faqat NaN li bo'lak: 0 / 0 = NaN (sof Python bilan bir xil)
+        avg_y = (cy[ends] - cy[starts]) / (cf[ends] - cf[starts])
+    indices = np.empty(threshold, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    with np.errstate(invalid="ignore"):     # inf - inf = NaN, quyida -1 ga almashtiriladi
+        for i in range(threshold - 2):
+            start, end = edges[i], edges[i + 1]
+            ax, ay = x[a], y[a]
+            area = np.abs((ax - avg_x[i]) * (y[start:end] - ay) - (ax - x[start:end]) * (avg_y[i] - ay))
+            area[np.isnan(area)] = -1.0
+            a = start + int(area.argmax())
+            indices[i + 1] = a
+    return indices
+
+
+def _lttb_python(x, y, threshold):
+    n = len(y)
+    every = (n - 2) / (threshold - 2)
+    indices = [0]
+    a = 0
+    for i in range(threshold - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = sum(x[end:next_end]) / (next_end - end)
+        finite = [value for value in y[end:next_end] if math.isfinite(value)]
+        avg_y = sum(finite) / len(finite) if finite else math.nan
+        ax, ay = x[a], y[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (y[j] - ay) - (ax - x[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+        indices.append(best)
+        a = best
+    indices.append(n - 1)
+    return indices
+
+
+def downsample(y, width, x=None, method="minmax"):
+    """
+    Seriyani chizish maydoni kengligiga (piksel) tushirish
+    Args:
+        y: Qiymatlar (list, deque, array, memoryview, numpy)
+        width: Chizish maydoni kengligi, piksel
+        x: X qiymatlari (faqat LTTB uchun; None - teng oraliq)
+        method: "minmax" (har 2 pikselga min + max) yoki "lttb" (har pikselga bitta)
+    Returns:
+        list yoki numpy.ndarray: Tanlangan indekslar (o'sish tartibida)
+    """
+    width = max(3, int(width))
+    if method == "lttb":
+        return lttb(y, width, x)
+    if method == "minmax":
+        return minmax(y, width // 2)
+    raise ValueError(f"Noma'lum usul: {method!r} ({', '.join(METHODS)})")
+
+
+def take(values, indices):
+    """Indekslar bo'yicha qiymatlar (numpy bo'lsa massiv, aks holda ro'yxat)"""
+    if np is not None:
+        return np.asarray(values)[indices]
+    return [values[i] for i in indices]
+
+
+def check(points=20_000, width=300, seed=1):
+    """
+    numpy va sof Python natijalari bir xilligini tekshirish (NaN / inf bilan ham)
+    Returns:
+        bool: Hammasi mos
+    """
+    global np
+    module = np
+    if module is None:
+        print("⚠️  numpy o'rnatilmagan - taqqoslab bo'lmaydi")
+        return True
+    rng = random.Random(seed)
+    clean = [25 + 5 * math.sin(i / 500) + rng.random() for i in range(points)]
+    gappy = list(clean)
+    for i in rng.sample(range(points), points // 50):
+        gappy[i] = math.nan
+    gappy[points // 3:points // 3 + 500] = [math.nan] * 500     # Butunlay NaN li bo'laklar
+    gappy[points // 2] = math.inf
+    ok = True
+    for label, data in (("toza", clean), ("NaN bilan", gappy)):
+        for method in METHODS:
+            results = []
+            for np in (module, None):
+                results.append([int(i) for i in downsample(array("d", data), width, method=method)])
+            np = module
+            same = results[0] == results[1]
+            ok = ok and same
+            print(f"   {'✅' if same else '❌'} {label:<10} {method:<7} {len(results[0]):>5} nuqta")
+    print("✅ numpy va Python natijalari bir xil" if ok else "❌ numpy va Python natijalari farq qiladi")
+    return ok
+
+
+def main():
+    global np
+    parser = argparse.ArgumentParser(description="Downsampling benchmarki")
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--width", type=int, default=1200, help="Chizish maydoni kengligi (piksel)")
+    parser.add_argument("--check", action="store_true", help="numpy va Python natijalarini taqqoslash (NaN bilan)")
+    args = parser.parse_args()
+    if args.check:
+        raise SystemExit(0 if check() else 1)
+
+    data = array("f", (25 + 5 * math.sin(i / 5000) + random.random() for i in range(args.points)))
+    backends = [("numpy", np), ("python", None)] if np is not None else [("python", None)]
+    print(f"📊 {args.points} nuqta -> {args.width} piksel")
+    for name, module in backends:
+        np = module
+        for method in METHODS:
+            started = time.perf_counter()
+            indices = downsample(memoryview(data), args.width, method=method)
+            elapsed = time.perf_counter() - started
+            print(f"   {name:<7} {method:<7} {len(indices):>6} nuqta, {elapsed * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
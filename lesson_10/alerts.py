@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sensor oqimlarida anomaliya va chegara ogohlantirishlari (streaming).
+Har namunada har seriya uchun O(1) yangilanish:
+    - Chegaralar (low / high) histerezis bilan: qiymat chegaradan `hysteresis`
+      qadar ichkariga qaytgandagina ogohlantirish yopiladi (titrash yo'q)
+    - z-score: siljuvchi oyna o'rtachasi va dispersiyasi (Welford)
+    - EWMA: vaqt bo'yicha so'nuvchi o'rtacha (vaqt doimiysi `tau` soniya,
+      namunalar chastotasiga bog'liq emas, boshlanishda siljishsiz);
+      o'zgarish tezligi (birlik/s) - shu o'rtachaning `span` soniyadagi o'zgarishi
+    - Drift: tez o'rtacha (`tau`) sekin o'rtachadan (`baseline`) `drift` dan ko'p
+      uzoqlashsa
+Standart chegaralar ingest.py simulyatoriga (butun oraliqda tekis shovqin)
+moslangan: 0.5 Hz da ham, 10 Hz da ham soatiga ogohlantirish chiqmaydi.
+Ogohlantirishlar hodisa (Alert) sifatida chiqadi: raised=True - boshlandi,
+raised=False - tugadi. Bir xil tekshiruv UI da (main.py, har yangi namunada),
+saqlangan tarixda (replay) va benchmarkda ishlatiladi.
+
+    python alerts.py replay sensor_malumotlari.csv
+    python alerts.py replay --store sensor_data
+    python alerts.py bench --samples 200000
+"""
+
+import argparse
+import math
+import random
+import time
+from collections import Counter, namedtuple
+
+from ingest import (HPA_TO_MM, HUM_MAX, HUM_MIN, PRESS_HPA_MAX, PRESS_HPA_MIN, SENSOR_FIELDS,
+                    TEMP_MAX, TEMP_MIN)
+from storage import NS, STORE_DIR, ColumnStore, read_csv
+
+WINDOW = 300                # z-score uchun siljuvchi oyna (namuna)
+WARMUP = 30                 # Shuncha namunadan keyin z-score tekshiruvi
+ZSCORE = 5.0                # Har namunada tekshiriladi: 10 Hz gauss shovqinida ~0.02 marta/soat
+TAU = 60.0                  # Tez o'rtacha vaqt doimiysi (s); tezlik va drift shundan keyin tekshiriladi
+BASELINE = 900.0            # Drift uchun sekin o'rtacha vaqt doimiysi (s)
+RATE_SPAN = 30.0            # O'zgarish tezligi shu oraliqda o'lchanadi (s)
+TOLERANCE = 1e-3            # Chegaralar bilan solishtirishda (float32 saqlash aniqligi)
+CLEAR_RATIO = 0.8           # Statistik ogohlantirish chegaraning 80% idan pastda yopiladi
+
+Alert = namedtuple("Alert", "timestamp sensor series kind raised value detail")
+
+
+class Rule:
+    """
+    Bitta seriya uchun qoidalar (None - tekshirilmaydi)
+    Args:
+        low, high: Ruxsat etilgan oraliq
+        hysteresis: Chegara ogohlantirishi yopilishi uchun ichkariga qaytish
+        max_rate: Tez o'rtachaning eng katta o'zgarish tezligi (birlik/s)
+        zscore: |z| chegarasi
+        drift: Tez va sekin o'rtachalar orasidagi eng katta farq
+        tau, baseline, span: Tez o'rtacha, sekin o'rtacha va tezlik oralig'i (soniya)
+    """
+
+    def __init__(self, low=None, high=None, hysteresis=0.0, max_rate=None, zscore=ZSCORE, drift=None,
+                 window=WINDOW, warmup=WARMUP, tau=TAU, baseline=BASELINE, span=RATE_SPAN):
+        self.low = low
+        self.high = high
+        self.hysteresis = hysteresis
+        self.max_rate = max_rate
+        self.zscore = zscore
+        self.drift = drift
+        self.window = window
+        self.warmup = warmup
+        self.tau = tau
+        self.baseline = baseline
+        self.span = span
+
+
+# Tezlik va drift chegaralari oraliq kengligiga mutanosib: simulyatorning tekis
+# shovqinida (0.5 Hz - eng yomon holat) tez o'rtacha ~0.037 * kenglik tebranadi,
+# chegaralar ~5.5 sigma - tezlik kenglikning 0.6% i / s, drift 20% i.
+# Simulyator bosimni 0.1 mm gacha yaxlitlaydi - chegaralar ham shunday (787.563 emas, 787.6)
+RULES = {
+    "temp": Rule(TEMP_MIN, TEMP_MAX, hysteresis=0.5, max_rate=0.075, drift=2.4),
+    "hum": Rule(HUM_MIN, HUM_MAX, hysteresis=1.0, max_rate=0.2, drift=6.0),
+    "press": Rule(round(PRESS_HPA_MIN * HPA_TO_MM, 1), round(PRESS_HPA_MAX * HPA_TO_MM, 1), hysteresis=1.0,
+                  max_rate=0.3, drift=9.0),
+}
+
+
+class RollingStats:
+    """
+    Oxirgi `window` ta qiymat o'rtachasi va dispersiyasi - siljuvchi Welford, O(1)
+    Yaxlitlash xatosi to'planmasligi uchun har `window` namunada bir marta
+    aniq qayta hisoblanadi (o'rtacha O(1)).
+    """
+
+    __slots__ = ("window", "values", "index", "count", "mean", "m2")
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.values = []
+        self.index = 0
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, x):
+        if self.count < self.window:
+            self.values.append(x)
+            self.count += 1
+            delta = x - self.mean
+            self.mean += delta / self.count
+            self.m2 += delta * (x - self.mean)
+            return
+        old = self.values[self.index]
+        self.values[self.index] = x
+        self.index += 1
+        if self.index == self.window:
+            self.index = 0
+            self.mean = sum(self.values) / self.window
+            self.m2 = sum((value - self.mean) ** 2 for value in self.values)
+            return
+        mean = self.mean + (x - old) / self.window
+        self.m2 = max(0.0, self.m2 + (x - old) * (x - mean + old - self.mean))
+        self.mean = mean
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+class Detector:
+    """
+    Bitta (sensor, seriya) holati
+    O'rtachalar vaqt bo'yicha so'nadi: har namuna og'irligi 1, oldingilari
+    exp(-dt / tau) ga ko'paytiriladi - doimiy chastotada oddiy EWMA, lekin
+    alpha namunalar oralig'iga moslashadi va birinchi namunaga bog'lanib qolmaydi.
+    `tau` dan uzun uzilishdan keyin tez o'rtacha qaytadan o'rnashadi.
+    """
+
+    __slots__ = ("rule", "stats", "fast", "fast_weight", "slow", "slow_weight", "decay", "start_time",
+                 "last_time", "span_time", "span_value", "span_ready", "active")
+
+    def __init__(self, rule):
+        self.rule = rule
+        self.stats = RollingStats(rule.window)
+        self.fast = self.fast_weight = 0.0      # Og'irlikli yig'indi va og'irliklar yig'indisi
+        self.slow = self.slow_weight = 0.0
+        self.decay = (None, 1.0, 1.0)           # (dt, tez, sekin) so'nish - oraliq odatda o'zgarmaydi
+        self.start_time = None                  # Tez o'rtacha o'rnasha boshlagan payt
+        self.last_time = None
+        self.span_time = None                   # Tezlik oralig'i boshi va o'sha paytdagi tez o'rtacha
+        self.span_value = 0.0
+        self.span_ready = False                 # Oraliq boshida o'rtacha o'rnashgan edi
+        self.active = set()                     # Hozir ochiq ogohlantirish turlari
+
+    @property
+    def ewma(self):
+        return self.fast / self.fast_weight if self.fast_weight else None
+
+    def _check(self, events, kind, trigger, clear, detail):
+        active = self.active
+        if kind in active:
+            if clear:
+                active.discard(kind)
+                events.append((kind, False, detail))
+        elif trigger:
+            active.add(kind)
+            events.append((kind, True, detail))
+
+    def update(self, timestamp, x):
+        """
+        Returns:
+            list: (tur, raised, tafsilot) - faqat holat o'zgarganda
+        """
+        events = []
+        rule = self.rule
+        if rule.high is not None:
+            high = rule.high + TOLERANCE
+            self._check(events, "high", x > high, x <= high - rule.hysteresis, f"> {rule.high:g}")
+        if rule.low is not None:
+            low = rule.low - TOLERANCE
+            self._check(events, "low", x < low, x >= low + rule.hysteresis, f"< {rule.low:g}")
+
+        stats = self.stats
+        if stats.count >= rule.warmup and rule.zscore:
+            # Qiymat oynaga qo'shilishidan oldingi statistikaga nisbatan
+            std = math.sqrt(stats.variance)
+            z = (x - stats.mean) / std if std > 0 else 0.0
+            self._check(events, "zscore", abs(z) > rule.zscore, abs(z) < rule.zscore * CLEAR_RATIO, f"z={z:+.1f}")
+        stats.add(x)
+
+        elapsed = None if self.last_time is None else (timestamp - self.last_time) / NS
+        cached, fast_decay, slow_decay = self.decay
+        if elapsed is not None and elapsed != cached:
+            fast_decay = math.exp(-max(elapsed, 0.0) / rule.tau)
+            slow_decay = math.exp(-max(elapsed, 0.0) / rule.baseline)
+            self.decay = (elapsed, fast_decay, slow_decay)
+        self.last_time = timestamp
+        if elapsed is None or elapsed > rule.tau:
+            # Boshlanish yoki uzilish - tez o'rtacha va tezlik oralig'i qaytadan
+            self.start_time = self.span_time = timestamp
+            self.span_ready = False
+            fast_decay = 0.0
+        self.fast = self.fast * fast_decay + x
+        self.fast_weight = self.fast_weight * fast_decay + 1.0
+        self.slow = self.slow * slow_decay + x
+        self.slow_weight = self.slow_weight * slow_decay + 1.0
+        fast = self.fast / self.fast_weight
+        if self.start_time == timestamp:
+            self.span_value = fast
+
+        # Tezlik va drift - tez o'rtacha o'rnashgandan keyin (bitta `tau`)
+        ready = (timestamp - self.start_time) / NS >= rule.tau
+        elapsed = (timestamp - self.span_time) / NS
+        if elapsed >= rule.span:
+            rate = (fast - self.span_value) / elapsed
+            if self.span_ready and rule.max_rate:
+                self._check(events, "rate", abs(rate) > rule.max_rate, abs(rate) < rule.max_rate * CLEAR_RATIO,
+                            f"{rate:+.3f}/s")
+            self.span_time = timestamp
+            self.span_value = fast
+            self.span_ready = ready
+        if ready and rule.drift:
+            drift = fast - self.slow / self.slow_weight
+            self._check(events, "drift", abs(drift) > rule.drift, abs(drift) < rule.drift * CLEAR_RATIO,
+                        f"{drift:+.2f}")
+        return events
+
+
+class AlertEngine:
+    """
+    Sensorlar bo'yicha detektorlar
+    Args:
+        rules: {seriya: Rule}
+        fields: Namunadagi qiymatlar tartibi
+        emit: Har Alert uchun chaqiriladigan funksiya
+    """
+
+    def __init__(self, rules=RULES, fields=SENSOR_FIELDS, emit=None):
+        self.rules = rules
+        self.fields = tuple(fields)
+        self.emit = emit
+        self.detectors = {}         # sensor -> [Detector yoki None] (fields tartibida)
+        self.samples = 0
+        self.raised = Counter()     # tur -> ochilgan ogohlantirishlar
+        self.active = {}            # (sensor, seriya, tur) -> Alert
+
+    def _detectors(self, sensor):
+        detectors = self.detectors.get(sensor)
+        if detectors is None:
+            detectors = [Detector(self.rules[name]) if name in self.rules else None for name in self.fields]
+            self.detectors[sensor] = detectors
+        return detectors
+
+    def process(self, sensor, timestamp, values):
+        """
+        Bitta namuna (values - fields tartibida; NaN o'tkazib yuboriladi)
+        Returns:
+            list: Yangi Alert lar
+        """
+        self.samples += 1
+        alerts = []
+        for name, detector, value in zip(self.fields, self._detectors(sensor), values):
+            if detector is None or value != value:
+                continue
+            for kind, raised, detail in detector.update(timestamp, value):
+                alert = Alert(timestamp, sensor, name, kind, raised, value, detail)
+                key = (sensor, name, kind)
+                if raised:
+                    self.raised[kind] += 1
+                    self.active[key] = alert
+                else:
+                    self.active.pop(key, None)
+                alerts.append(alert)
+                if self.emit is not None:
+                    self.emit(alert)
+        return alerts
+
+    def process_columns(self, sensor, timestamps, columns):
+        """snapshot() / ColumnStore.range() bo'lagi"""
+        alerts = []
+        for row in zip(timestamps, *(columns[name] for name in self.fields)):
+            alerts.extend(self.process(sensor, row[0], row[1:]))
+        return alerts
+
+
+def format_alert(alert):
+    moment = time.strftime("%d.%m.%Y %H:%M:%S", time.localtime(alert.timestamp / NS))
+    mark = "🚨" if alert.raised else "✅"
+    state = "boshlandi" if alert.raised else "tugadi"
+    return f"{mark} {moment} {alert.sensor}/{alert.series} {alert.kind} {state}: {alert.value:.2f} ({alert.detail})"
+
+
+def synthetic(samples, rate=10.0, seed=1):
+    """Benchmark uchun: shovqin + sakrashlar + sekin drift + chegaradan chiqishlar"""
+    rand = random.Random(seed)
+    start = time.time_ns()
+    step = int(NS / rate)
+    temp, hum, press = 26.0, 50.0, 765.0
+    for i in range(samples):
+        offset = 0.0
+        if i % 5000 < 600:
+            offset = (i % 5000) * 0.01         # Drift
+        if i % 7919 == 0:
+            offset += 15.0                      # Sakrash / chegaradan chiqish
+        yield (start + i * step,
+               temp + offset + rand.gauss(0, 0.3),
+               hum + rand.gauss(0, 1.0),
+               press + rand.gauss(0, 0.5))
+
+
+def replay(engine, rows, sensor, verbose=True):
+    started = time.perf_counter()
+    alerts = 0
+    for row in rows:
+        for alert in engine.process(sensor, row[0], row[1:]):
+            alerts += 1
+            if verbose:
+                print(format_alert(alert))
+    return alerts, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sensor ogohlantirishlari")
+    commands = parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser("replay", help="Saqlangan tarixni tekshirish")
+    command.add_argument("csv", nargs="?", help="Eski CSV fayl")
+    command.add_argument("--store", help="Ombor papkasi (CSV o'rniga)")
+    command.add_argument("--quiet", action="store_true", help="Faqat xulosa")
+    command = commands.add_parser("bench", help="O'tkazuvchanlik (namuna/s)")
+    command.add_argument("--samples", type=int, default=200_000)
+    command.add_argument("--sensors", type=int, default=100, help="Namunalar shuncha sensorga taqsimlanadi")
+    args = parser.parse_args()
+
+    engine = AlertEngine()
+    if args.command == "replay":
+        if args.store or not args.csv:
+            store = ColumnStore(args.store or STORE_DIR)
+            rows = store.rows()
+            source = store.directory
+        else:
+            store = None
+            rows = read_csv(args.csv)
+            source = args.csv
+        alerts, elapsed = replay(engine, rows, "replay", verbose=not args.quiet)
+        if store is not None:
+            store.close()
+        print(f"📊 {source}: {engine.samples} namuna, {alerts} hodisa, "
+              f"{dict(engine.raised)} ({engine.samples / max(elapsed, 1e-9):.0f} namuna/s)")
+        return
+
+    rows = list(synthetic(args.samples))
+    started = time.perf_counter()
+    sensors = [f"s{i}" for i in range(args.sensors)]
+    count = len(sensors)
+    for i, row in enumerate(rows):
+        engine.process(sensors[i % count], row[0], row[1:])
+    elapsed = time.perf_counter() - started
+    print(f"🚀 {engine.samples} namuna ({len(SENSOR_FIELDS)} seriya), {args.sensors} sensor: "
+          f"{engine.samples / elapsed:.0f} namuna/s, {elapsed / engine.samples * 1e6:.1f} µs/namuna")
+    print(f"🚨 Ogohlantirishlar: {dict(engine.raised)}, hozir ochiq: {len(engine.active)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ixcham halqa buferlar (array, standart kutubxona).
+    - Vaqt belgilari int64 epoch-ns (array('q')), qiymatlar float32 (array('f'))
+    - list.pop(0) (O(n)) o'rniga bosh indeks: append O(1)
+    - Har qiymat ikki marta yoziladi (i va i + capacity) - oxirgi `capacity`
+      ta qiymat doim xotirada ketma-ket turadi, tartiblangan ko'rinish nusxasiz
+      memoryview bo'ladi (grafik chizish uchun)
+    - Bitta yozuvchi qulfsiz: hisoblagich qiymatlardan keyin oshiriladi,
+      snapshot() nusxadan keyin ustidan yozilganlarni tashlab yuboradi
+
+1M nuqtali 3 seriya + vaqt: ~43 MB (list + float + str bilan ~170 MB).
+
+    python buffers.py --points 1000000
+"""
+
+import argparse
+import time
+import tracemalloc
+from array import array
+
+FIELDS = ("temp", "hum", "press")
+
+
+class SeriesBuffer:
+    """
+    Umumiy vaqt o'qiga ega bir nechta seriya uchun halqa bufer
+    Args:
+        capacity: Saqlanadigan oxirgi nuqtalar soni
+        fields: float32 seriya nomlari
+    """
+
+    def __init__(self, capacity, fields=FIELDS):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self.timestamps = array("q", bytes(16 * capacity))
+        self.columns = {name: array("f", bytes(8 * capacity)) for name in self.fields}
+        self._columns = [self.columns[name] for name in self.fields]
+        self.written = 0            # Jami yozilgan nuqtalar (faqat yozuvchi oshiradi)
+
+    def __len__(self):
+        return min(self.written, self.capacity)
+
+    def append(self, timestamp, *values):
+        capacity = self.capacity
+        index = self.written % capacity
+        mirror = index + capacity
+        self.timestamps[index] = self.timestamps[mirror] = timestamp
+        for column, value in zip(self._columns, values):
+            column[index] = column[mirror] = value
+        self.written += 1
+
+    def _window(self, count=None, written=None):
+        """Oxirgi `count` ta nuqtaning [boshi, oxiri) massivdagi joyi"""
+        written = self.written if written is None else written
+        if not written:
+            return 0, 0
+        size = min(written, self.capacity)
+        count = size if count is None else min(count, size)
+        end = (written - 1) % self.capacity + self.capacity + 1
+        return end - count, end
+
+    def view(self, name, count=None):
+        """Seriyaning oxirgi `count` ta nuqtasi, eski -> yangi (memoryview, nusxasiz)"""
+        start, end = self._window(count)
+        return memoryview(self.columns[name])[start:end]
+
+    def timestamps_view(self, count=None):
+        start, end = self._window(count)
+        return memoryview(self.timestamps)[start:end]
+
+    def latest(self):
+        """Oxirgi nuqta: (timestamp, (qiymat, ...)) yoki None"""
+        written = self.written
+        if not written:
+            return None
+        index = (written - 1) % self.capacity
+        return self.timestamps[index], tuple(column[index] for column in self._columns)
+
+    def snapshot(self, since=0):
+        """
+        `since` kursoridan keyingi nuqtalar nusxasi (boshqa oqim yozayotgan bo'lsa ham izchil)
+        Returns:
+            tuple: (yangi kursor, timestamps array, {seriya: array}, yo'qolgan nuqtalar)
+        """
+        written = self.written
+        start = max(since, written - self.capacity)
+        first, end = self._window(written - start, written)
+        timestamps = self.timestamps[first:end]
+        columns = {name: column[first:end] for name, column in self.columns.items()}
+        # Nusxa olinayotganda yozuvchi eng eski nuqtalarni (yoki hozir yozilayotganini) almashtirgan bo'lishi mumkin
+        overwritten = self.written - self.capacity + 1 - start
+        if overwritten > 0:
+            del timestamps[:overwritten]
+            for column in columns.values():
+                del column[:overwritten]
+            start += overwritten
+        return written, timestamps, columns, start - since
+
+    def extend(self, timestamps, columns):
+        """
+        Ko'p nuqtani birdaniga qo'shish - bo'laklab nusxalanadi, Python sikli yo'q
+        Args:
+            timestamps: array('q') / memoryview (snapshot() yoki ColumnStore.range() dan)
+            columns: {seriya: array('f') / memoryview}
+        """
+        count = len(timestamps)
+        capacity = self.capacity
+        pairs = [(memoryview(self.timestamps), memoryview(timestamps))]
+        pairs += [(memoryview(self.columns[name]), memoryview(columns[name])) for name in self.fields]
+        position = max(0, count - capacity)     # Sig'imdan ortig'i baribir ustidan yoziladi
+        written = self.written + position
+        while position < count:
+            index = written % capacity
+            size = min(count - position, capacity - index)
+            for target, source in pairs:
+                chunk = source[position:position + size]
+                target[index:index + size] = chunk
+                target[index + capacity:index + capacity + size] = chunk
+            position += size
+            written += size
+        self.written = written
+
+    def nbytes(self):
+        return (self.timestamps.itemsize * len(self.timestamps)
+                + sum(column.itemsize * len(column) for column in self._columns))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="list.pop(0) va SeriesBuffer taqqoslash")
+    parser.add_argument("--points", type=int, default=1_000_000, help="Tarix hajmi")
+    parser.add_argument("--appends", type=int, default=200_000, help="To'lgan buferga qo'shishlar")
+    args = parser.parse_args()
+    n = args.points
+    row = (1_765_000_000_000_000_000, 25.5, 50.1, 760.3)
+
+    tracemalloc.start()
+    temps, hums, presses, times = [], [], [], []
+    for i in range(n):
+        temps.append(row[1] + i % 7)
+        hums.append(row[2] + i % 5)
+        presses.append(row[3] + i % 3)
+        times.append(f"20.12.2025 14:{i // 60 % 60:02d}:{i % 60:02d}")
+    list_bytes = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    for i in range(min(args.appends, 2000)):
+        temps.append(row[1])
+        hums.append(row[2])
+        presses.append(row[3])
+        times.append("20.12.2025 14:55:47")
+        temps.pop(0)
+        hums.pop(0)
+        presses.pop(0)
+        times.pop(0)
+    list_us = (time.perf_counter() - started) / min(args.appends, 2000) * 1e6
+    del temps, hums, presses, times
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    buffer = SeriesBuffer(n)
+    buffer_bytes = tracemalloc.get_traced_memory()[0]
+    for i in range(n):
+        buffer.append(*row)
+    started = time.perf_counter()
+    for i in range(args.appends):
+        buffer.append(*row)
+    buffer_us = (time.perf_counter() - started) / args.appends * 1e6
+    started = time.perf_counter()
+    view = buffer.view("temp")
+    view_us = (time.perf_counter() - started) * 1e6
+    tracemalloc.stop()
+
+    print(f"📊 {n} nuqta x 3 seriya + vaqt")
+    print(f"🐢 list + pop(0): {list_bytes / 1e6:.0f} MB, qo'shish {list_us:.1f} µs")
+    print(f"🚀 SeriesBuffer:  {buffer_bytes / 1e6:.0f} MB, qo'shish {buffer_us:.1f} µs, "
+          f"tartiblangan ko'rinish {view_us:.1f} µs ({len(view)} nuqta, nusxasiz)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sensor ma'lumotlarini qabul qilish (ingestion), Tk asosiy siklidan ajratilgan.
+    - Manbalar alohida fon oqimlarida: simulyatsiya (N ta sensor), serial port
+      (yoki fayl), UDP (line protocol)
+    - Har sensor uchun ixcham halqa bufer (buffers.SeriesBuffer): bitta
+      yozuvchi, qulfsiz - yozuvchi avval qiymatlarni yozadi, keyin
+      hisoblagichni oshiradi
+    - UI faqat o'z kadr tezligida snapshot oladi, namunalar tezligiga bog'liq emas
+    - Recorder oqimi tanlangan sensorni omborga yozadi (disk ham GUI oqimida emas)
+
+Line protocol (UDP datagrammasi / serial qatori, bir nechta qator bo'lishi mumkin):
+    <sensor> temp=21.5,hum=50.1,press=760.2 [epoch-ns]
+
+    python ingest.py --sensors 1000 --rate 10 --duration 10   # Yuklama testi (GUI siz)
+    python ingest.py --udp 0.0.0.0:9999 --duration 10         # UDP qabul qilish
+    python ingest.py --send 127.0.0.1:9999 --sensors 1000     # UDP generator
+"""
+
+import argparse
+import math
+import os
+import random
+import select
+import socket
+import threading
+import time
+
+from buffers import SeriesBuffer
+
+try:
+    import serial               # pyserial (ixtiyoriy)
+except ImportError:
+    serial = None
+
+SENSOR_FIELDS = ("temp", "hum", "press")
+RING_SIZE = 256             # Har sensor uchun oxirgi namunalar
+SIM_RATE = 0.5              # Hz (har 2 soniyada, asl dastur kabi)
+RECORD_INTERVAL = 1.0       # Recorder omborga yozish oralig'i (s)
+NAN = math.nan
+
+# Simulyatsiya oraliqlari (main.py dagi bilan bir xil)
+TEMP_MIN, TEMP_MAX = 20.0, 32.0
+HUM_MIN, HUM_MAX = 35.0, 65.0
+PRESS_HPA_MIN, PRESS_HPA_MAX = 990.0, 1050.0
+HPA_TO_MM = 0.75006
+
+
+class Ingestor:
+    """
+    Sensorlar -> halqa buferlar
+    Har bir sensorga faqat bitta manba yozadi (SeriesBuffer bitta yozuvchi uchun).
+    """
+
+    def __init__(self, capacity=RING_SIZE):
+        self.capacity = capacity
+        self.rings = {}             # sensor -> SeriesBuffer
+        self.sources = []
+        self.started = None
+
+    def ring(self, sensor):
+        ring = self.rings.get(sensor)
+        if ring is None:
+            # setdefault GIL ostida atomar - ikki oqim bir xil buferni oladi
+            ring = self.rings.setdefault(sensor, SeriesBuffer(self.capacity, SENSOR_FIELDS))
+        return ring
+
+    def add(self, source):
+        source.ingestor = self
+        self.sources.append(source)
+        if self.started is not None:
+            source.start()
+        return source
+
+    def start(self):
+        self.started = time.monotonic()
+        for source in self.sources:
+            source.start()
+
+    def stop(self):
+        for source in self.sources:
+            source.stopped.set()
+        for source in self.sources:
+            if source.is_alive():
+                source.join(timeout=2)
+
+    def stats(self):
+        samples = sum(source.samples for source in self.sources)
+        elapsed = time.monotonic() - self.started if self.started else 0.0
+        return {
+            "sensors": len(self.rings),
+            "samples": samples,
+            "rate": samples / elapsed if elapsed > 0 else 0.0,
+            "errors": sum(source.errors for source in self.sources),
+        }
+
+
+class Source(threading.Thread):
+    """Manba: fon oqimi, namunalarni Ingestor halqalariga yozadi"""
+
+    def __init__(self, name):
+        super().__init__(name=name, daemon=True)
+        self.ingestor = None
+        self.stopped = threading.Event()
+        self.samples = 0
+        self.errors = 0
+
+    def push(self, sensor, timestamp, values):
+        self.ingestor.ring(sensor).append(timestamp, *values)
+        self.samples += 1
+
+
+class SimulatedSource(Source):
+    """
+    N ta simulyatsiya sensori, `rate` Hz
+    Taktlar rejalashtirilgan vaqtdan hisoblanadi (drift yo'q); kechiksa takt
+    tashlab ketiladi, navbat to'planmaydi.
+    """
+
+    def __init__(self, sensors=1, rate=SIM_RATE, prefix="sim-"):
+        super().__init__(f"sim x{sensors}")
+        self.names = [f"{prefix}{i}" for i in range(sensors)]
+        self.period = 1.0 / rate
+        self.skipped = 0
+
+    def run(self):
+        rings = [self.ingestor.ring(name) for name in self.names]
+        rand = random.random
+        period = self.period
+        deadline = time.monotonic()
+        while not self.stopped.is_set():
+            now = time.time_ns()
+            for ring in rings:
+                ring.append(
+                    now,
+                    round(TEMP_MIN + rand() * (TEMP_MAX - TEMP_MIN), 2),
+                    round(HUM_MIN + rand() * (HUM_MAX - HUM_MIN), 1),
+                    round((PRESS_HPA_MIN + rand() * (PRESS_HPA_MAX - PRESS_HPA_MIN)) * HPA_TO_MM, 1),
+                )
+            self.samples += len(rings)
+            deadline += period
+            delay = deadline - time.monotonic()
+            if delay < 0:
+                missed = int(-delay // period) + 1
+                self.skipped += missed
+                deadline += missed * period
+                delay += missed * period
+            self.stopped.wait(delay)
+
+
+def parse_line(line):
+    """
+    Line protocol qatori
+    Returns:
+        tuple: (sensor, timestamp yoki None, qiymatlar SENSOR_FIELDS tartibida; yo'qlari NaN)
+    """
+    parts = line.split()
+    if len(parts) not in (2, 3):
+        raise ValueError(f"Noto'g'ri qator: {line!r}")
+    fields = dict(item.split("=", 1) for item in parts[1].split(","))
+    values = tuple(float(fields[name]) if name in fields else NAN for name in SENSOR_FIELDS)
+    return parts[0], int(parts[2]) if len(parts) == 3 else None, values
+
+
+class LineSource(Source):
+    """Baytlar oqimidan line protocol qatorlarini ajratish (tugallanmagan qator keyingi bo'lakka o'tadi)"""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self._partial = b""
+
+    def feed(self, data):
+        lines = (self._partial + data).split(b"\n")
+        self._partial = lines.pop()
+        now = time.time_ns()
+        for raw in lines:
+            line = raw.decode("utf-8", "replace").strip()
+            if not line:
+                continue
+            try:
+                sensor, timestamp, values = parse_line(line)
+            except ValueError:
+                self.errors += 1
+                continue
+            self.push(sensor, timestamp or now, values)
+
+
+class UDPSource(LineSource):
+    """UDP port (har datagramma - bir yoki bir nechta qator)"""
+
+    def __init__(self, host="0.0.0.0", port=9999):
+        super().__init__(f"udp {host}:{port}")
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)
+        self.sock.bind((host, port))
+        self.sock.settimeout(0.5)
+
+    def run(self):
+        try:
+            while not self.stopped.is_set():
+                try:
+                    data = self.sock.recv(65536)
+                except socket.timeout:
+                    continue
+                self.feed(data + b"\n")
+        finally:
+            self.sock.close()
+
+
+class SerialSource(LineSource):
+    """
+    Serial port (pyserial bo'lsa) yoki oddiy fayl / qurilma (select bilan)
+    Fayl oxiriga yetganda to'xtaydi - yozib olingan ma'lumotni qayta o'ynatish mumkin.
+    """
+
+    def __init__(self, port, baudrate=115200):
+        super().__init__(f"serial {port}")
+        self.port = port
+        self.baudrate = baudrate
+
+    def run(self):
+        if serial is not None and not os.path.isfile(self.port):
+            with serial.Serial(self.port, self.baudrate, timeout=0.5) as device:
+                while not self.stopped.is_set():
+                    self.feed(device.read(device.in_waiting or 1))
+            return
+        fd = os.open(self.port, os.O_RDONLY | getattr(os, "O_NOCTTY", 0))
+        try:
+            while not self.stopped.is_set():
+                ready, _, _ = select.select([fd], [], [], 0.5)
+                if not ready:
+                    continue
+                data = os.read(fd, 65536)
+                if not data:
+                    break
+                self.feed(data)
+            self.feed(b"\n")
+        finally:
+            os.close(fd)
+
+
+class Recorder(threading.Thread):
+    """Tanlangan sensor namunalarini fon oqimida omborga yozish (ombor faqat shu oqimga tegishli)"""
+
+    def __init__(self, ingestor, store, sensor, interval=RECORD_INTERVAL):
+        super().__init__(name=f"recorder {sensor}", daemon=True)
+        self.ingestor = ingestor
+        self.store = store
+        self.sensor = sensor
+        self.interval = interval
+        self.stopped = threading.Event()
+        self.samples = 0
+        self.errors = 0
+        self.lost = 0
+        self._cursor = 0
+
+    def drain(self):
+        ring = self.ingestor.rings.get(self.sensor)
+        if ring is None:
+            return
+        self._cursor, timestamps, columns, lost = ring.snapshot(self._cursor)
+        self.lost += lost
+        for row in zip(timestamps, *(columns[name] for name in SENSOR_FIELDS)):
+            self.store.append(*row)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            self.drain()
+        self.drain()
+
+
+def send_udp(target, sensors, rate, duration):
+    """UDP generator: `sensors` ta sensor, `rate` Hz, paketlar ~1400 bayt"""
+    host, port = target.rsplit(":", 1)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    address = (host, int(port))
+    names = [f"udp-{i}" for i in range(sensors)]
+    rand = random.random
+    period = 1.0 / rate
+    deadline = time.monotonic()
+    stop = deadline + duration
+    sent = 0
+    while time.monotonic() < stop:
+        now = time.time_ns()
+        packet = []
+        size = 0
+        for name in names:
+            line = (f"{name} temp={TEMP_MIN + rand() * 12:.2f},hum={HUM_MIN + rand() * 30:.1f},"
+                    f"press={(PRESS_HPA_MIN + rand() * 60) * HPA_TO_MM:.1f} {now}\n")
+            packet.append(line)
+            size += len(line)
+            if size > 1400:
+                sock.sendto("".join(packet).encode(), address)
+                packet, size = [], 0
+        if packet:
+            sock.sendto("".join(packet).encode(), address)
+        sent += sensors
+        deadline += period
+        time.sleep(max(0.0, deadline - time.monotonic()))
+    print(f"📤 {sent} namuna yuborildi ({sent / duration:.0f}/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sensor ingestion (GUI siz yuklama testi)")
+    parser.add_argument("--sensors", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=10.0, help="Har sensor uchun Hz")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--frame", type=float, default=0.1, help="UI kadr oralig'i (s)")
+    parser.add_argument("--udp", help="host:port - UDP qabul qilish (simulyatsiya o'rniga)")
+    parser.add_argument("--serial", help="Serial port yoki fayl")
+    parser.add_argument("--send", help="host:port - UDP generator rejimi")
+    args = parser.parse_args()
+
+    if args.send:
+        send_udp(args.send, args.sensors, args.rate, args.duration)
+        return
+
+    ingestor = Ingestor()
+    if args.udp:
+        host, port = args.udp.rsplit(":", 1)
+        ingestor.add(UDPSource(host, int(port)))
+    if args.serial:
+        ingestor.add(SerialSource(args.serial))
+    if not ingestor.sources:
+        ingestor.add(SimulatedSource(args.sensors, args.rate))
+    ingestor.start()
+    print(f"📡 {', '.join(source.name for source in ingestor.sources)}, {args.duration:.0f} s")
+
+    # "UI": har kadrda barcha sensorlarning oxirgi qiymatlari va tanlangan sensor tarixi
+    frames = []
+    late = []
+    cursor = 0
+    stop = time.monotonic() + args.duration
+    deadline = time.monotonic()
+    while time.monotonic() < stop:
+        deadline += args.frame
+        started = time.perf_counter()
+        rings = list(ingestor.rings.items())
+        latest = [ring.latest() for _, ring in rings]
+        if rings:
+            cursor, _, _, _ = rings[0][1].snapshot(cursor)
+        frames.append(time.perf_counter() - started)
+        late.append(max(0.0, time.monotonic() - deadline))
+        time.sleep(max(0.0, deadline - time.monotonic()))
+    ingestor.stop()
+
+    stats = ingestor.stats()
+    frames.sort()
+    print(f"📈 {stats['sensors']} sensor, {stats['samples']} namuna, {stats['rate']:.0f} namuna/s, "
+          f"xatolar: {stats['errors']}")
+    for source in ingestor.sources:
+        if isinstance(source, SimulatedSource):
+            print(f"⏱️  Tashlab ketilgan taktlar: {source.skipped}")
+    print(f"🖼️  Snapshot ({len(latest)} sensor): median {frames[len(frames) // 2] * 1000:.2f} ms, "
+          f"max {frames[-1] * 1000:.2f} ms; kadr kechikishi max {max(late) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
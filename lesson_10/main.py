@@ -2,21 +2,54 @@
 # -*- coding: utf-8 -*-
 """
 IoT sensor simulyatsiyasi (Tkinter, standart kutubxonalar).
-Har 2 soniyada yangi o'lchovlar, real vaqt grafika, CSVga yozish.
+Har 2 soniyada yangi o'lchovlar, real vaqt grafika, ustunli omborga yozish
+(storage.py; CSV - eksport formati).
+Namunalar fon oqimlarida qabul qilinadi (ingest.py); UI faqat o'z kadr
+tezligida tanlangan sensorning halqa buferidan snapshot oladi.
 Java versiyasiga moslashtirilgan layout.
+Kanvas elementlari bir marta yaratiladi va joyida yangilanadi (coords /
+itemconfigure); har seriya - bitta polyline. --full-redraw - eski usul
+(har kadrda delete("all")) bilan solishtirish uchun.
+Har yangi namuna ogohlantirish tekshiruvidan o'tadi (alerts.py: chegaralar,
+z-score, o'zgarish tezligi, drift); oxirgi hodisalar afsona ostida.
+
+    python main.py
+    python main.py --interval 100               # Soniyasiga 10 kadr
+    python main.py --interval 100 --full-redraw # Eski usul bilan solishtirish
+    python main.py --sensors 1000 --rate 10     # 1000 sensor, 10 Hz
+    python main.py --udp 0.0.0.0:9999 --sensor udp-0
+    python main.py --window 100000 --downsample lttb  # Uzun tarix, piksel kengligiga kamaytirilgan
 """
 
+import argparse
 import tkinter as tk
 from tkinter import font
-import random
 from datetime import datetime
 import os
+import sys
+import time
+from collections import deque
+from pathlib import Path
 
-# ---------------- CONFIG ----------------
-UPDATE_INTERVAL_MS = 2000
-MAX_POINTS = 60
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))   # Umumiy modullar (downsample.py)
+
+from downsample import METHODS, downsample, take
+from alerts import WINDOW as ALERT_WARMUP, AlertEngine, format_alert
+from buffers import SeriesBuffer
+from ingest import Ingestor, Recorder, SerialSource, SimulatedSource, UDPSource, SIM_RATE
+from storage import ColumnStore, import_csv
 
-CSV_PATH = "sensor_malumotlari.csv"
+# ---------------- CONFIG ----------------
+UPDATE_INTERVAL_MS = 200   # UI kadr oralig'i (namunalar tezligi - ingest.py)
+MAX_POINTS = 60            # Grafikda ko'rsatiladigan oxirgi nuqtalar (standart oyna)
+DOWNSAMPLE = "minmax"      # Oyna grafik kengligidan uzun bo'lsa: minmax yoki lttb
+HISTORY_POINTS = 100_000   # Xotirada saqlanadigan tarix (har seriya)
+RESIZE_DEBOUNCE_MS = 100   # Oyna o'lchami o'zgarishi tugagandan keyin qayta joylash
+FRAME_ALPHA = 0.1          # Kadr vaqti o'rtachasi (EWMA)
+ALERT_LINES = 5            # Ekrandagi oxirgi ogohlantirishlar
+
+CSV_PATH = "sensor_malumotlari.csv"   # Eski format: ombor bo'sh bo'lsa import qilinadi
+STORE_DIR = "sensor_data"
 TIME_FORMAT = "%d.%m.%Y %H:%M:%S"
 
 BG_COLOR = "#0F1428"       # Color(15, 20, 40)
@@ -36,32 +69,40 @@ HPA_TO_MM = 0.75006
 PRESS_MIN = PRESS_HPA_MIN * HPA_TO_MM  # ~742.5
 PRESS_MAX = PRESS_HPA_MAX * HPA_TO_MM  # ~787.5
 
-# ---------------- Data buffers ----------------
-temps = []
-hums = []
-presses = []
-times = []
-
-# ---------------- CSV init ----------------
-def init_csv():
-    header = f"{'Vaqt':<20} | {'Harorat (°C)':<12} | {'Namlik (%)':<10} | {'Bosim (mm)':<12}\n"
-    sep = "-" * (len(header) - 1) + "\n"
-    # If file doesn't exist or is empty, write header
-    write_header = not os.path.exists(CSV_PATH) or os.path.getsize(CSV_PATH) == 0
-    with open(CSV_PATH, "a", encoding="utf-8") as f:
-        if write_header:
-            f.write(header)
-            f.write(sep)
-
-def append_csv(now, t, h, p):
-    # Format: vaqt | temp | hum | press
-    line = f"{now} | {t:.2f} | {h:.1f} | {p:.1f}\n"
-    with open(CSV_PATH, "a", encoding="utf-8") as f:
-        f.write(line)
+# ---------------- Storage init ----------------
+def open_store(history):
+    """Omborni ochish; birinchi ishga tushishda eski CSV import qilinadi, tarix ombordan yuklanadi"""
+    store = ColumnStore(STORE_DIR)
+    if not len(store) and os.path.exists(CSV_PATH):
+        import_csv(store, CSV_PATH)
+    # Oxirgi segment bo'laklari (nusxasiz) - tarix sig'imigacha
+    need = history.capacity
+    chunks = []
+    for timestamps, columns in reversed(list(store.range())):
+        if need <= 0:
+            break
+        count = min(need, len(timestamps))
+        chunks.append((timestamps[-count:], {name: column[-count:] for name, column in columns.items()}))
+        need -= count
+    for timestamps, columns in reversed(chunks):
+        history.extend(timestamps, columns)
+    return store
 
 # ---------------- Main App ----------------
 class IoTMonitorApp(tk.Tk):
-    def __init__(self):
+    """
+    Args:
+        ingestor: Ingestor (manbalari qo'shilgan, hali ishga tushirilmagan)
+        sensor: Ko'rsatiladigan va omborga yoziladigan sensor
+        history: Xotiradagi tarix hajmi (nuqta)
+        window: Grafikdagi oxirgi nuqtalar (piksel kengligiga kamaytiriladi)
+        method: Kamaytirish usuli (downsample.METHODS)
+        interval_ms: Kadr oralig'i
+        full_redraw: Har kadrda hammasini o'chirib qayta chizish (eski usul)
+    """
+
+    def __init__(self, ingestor, sensor, history=HISTORY_POINTS, window=MAX_POINTS, method=DOWNSAMPLE,
+                 interval_ms=UPDATE_INTERVAL_MS, full_redraw=False):
         super().__init__()
         self.title("10-amaliy ish • IoT Sensor Simulyatsiyasi")
         self.configure(bg=BG_COLOR)
@@ -74,23 +115,206 @@ class IoTMonitorApp(tk.Tk):
         self.font_big = font.Font(family="Consolas", size=52, weight="bold")
         self.font_legend = font.Font(family="Segoe UI", size=22, weight="bold")
         self.font_label = font.Font(family="Segoe UI", size=22, weight="bold")
+        self.font_small = font.Font(family="Consolas", size=12)
+
+        self.ingestor = ingestor
+        self.sensor = sensor
+        self.cursor = 0             # Tanlangan sensor halqasidagi o'qilgan joy
+        self.history = SeriesBuffer(history)
+        self.window = window
+        self.method = method
+        self.plotted = 0            # Oxirgi kadrda chizilgan nuqtalar (bitta seriya)
+        self.interval_ms = interval_ms
+        self.full_redraw = full_redraw
+        self.items = {}             # nom -> kanvas elementi (doimiy)
+        self.lines = []             # (element, seriya, min, max) - har seriya bitta polyline
+        self.graph_box = None       # (x, y, w, h)
+        self.frame_ms = 0.0         # Kadr vaqti, ms (EWMA)
+        self.frame_last = 0.0
+        self.recent_alerts = deque(maxlen=ALERT_LINES)
+        self._resize_job = None
 
         # Canvas for entire window (like Java Canvas)
         self.canvas = tk.Canvas(self, bg=BG_COLOR, highlightthickness=0)
         self.canvas.pack(fill="both", expand=True)
         self.canvas.bind("<Configure>", self.on_resize)
-
-        # initialize csv
-        init_csv()
-
-        # start updates
+        if not full_redraw:
+            self._create_items()
+
+        # initialize storage; disk faqat Recorder oqimida
+        self.store = open_store(self.history)
+        self.recorder = Recorder(ingestor, self.store, sensor)
+
+        # Detektorlar tarixning oxiri bilan jimgina isitiladi, keyin hodisalar chiqadi
+        self.alerts = AlertEngine()
+        self.alerts.process_columns(sensor, self.history.timestamps_view(ALERT_WARMUP),
+                                    {name: self.history.view(name, ALERT_WARMUP) for name in self.history.fields})
+        self.alerts.emit = self.on_alert
+
+        # start ingestion (background threads) and UI updates
+        ingestor.start()
+        self.recorder.start()
         self.updating = True
         self.after(1000, self.update_once)  # start after 1s
 
     def on_resize(self, event=None):
-        # Redraw everything on resize
-        self.redraw_all()
+        # Oyna sudralganda <Configure> ketma-ket keladi - faqat oxirgisidan keyin
+        if self._resize_job is not None:
+            self.after_cancel(self._resize_job)
+        self._resize_job = self.after(RESIZE_DEBOUNCE_MS, self._on_resize_done)
+
+    def _on_resize_done(self):
+        self._resize_job = None
+        if not self.full_redraw:
+            self._layout()
+        self.render()
+
+    def render(self):
+        """Kadrni chizish va vaqtini o'lchash (Tk ning o'zi chizishi ham hisobga olinadi)"""
+        started = time.perf_counter()
+        if self.full_redraw:
+            self.redraw_all()
+        else:
+            self.refresh()
+        self.update_idletasks()
+        self.frame_last = (time.perf_counter() - started) * 1000
+        self.frame_ms += FRAME_ALPHA * (self.frame_last - self.frame_ms)
+
+    def _frame_text(self):
+        mode = "to'liq qayta chizish" if self.full_redraw else "inkremental"
+        stats = self.ingestor.stats()
+        return (f"Kadr: {self.frame_last:.2f} ms (o'rtacha {self.frame_ms:.2f} ms) • {mode} • "
+                f"elementlar: {len(self.canvas.find_all())} • sensorlar: {stats['sensors']} "
+                f"({stats['rate']:.0f} namuna/s) • {self.sensor} • "
+                f"grafik: {self.plotted} / {min(len(self.history), self.window)} nuqta ({self.method})")
+
+    def _alerts_text(self):
+        return "\n".join(self.recent_alerts)
+
+    def on_alert(self, alert):
+        """AlertEngine hodisasi (UI oqimida, update_once ichidan); konsolga update_once chiqaradi"""
+        moment = datetime.fromtimestamp(alert.timestamp / 1e9).strftime("%H:%M:%S")
+        mark = "!" if alert.raised else "ok"
+        self.recent_alerts.appendleft(f"{moment} {mark:<2} {alert.series} {alert.kind} {alert.value:.1f} ({alert.detail})")
+
+    # ---------------- Incremental rendering ----------------
+    def _create_items(self):
+        """Barcha elementlar bir marta yaratiladi; joyi _layout, mazmuni refresh da"""
+        c = self.canvas
+        items = self.items
+        items["background"] = c.create_rectangle(0, 0, 0, 0, fill=BG_COLOR, outline=BG_COLOR)
+        items["title"] = c.create_text(0, 90, text="IoT Sensor Monitoring", font=self.font_title,
+                                       fill="#64C8FF", anchor="center")
+        items["clock"] = c.create_text(0, 130, font=self.font_sub, fill="#E0E0E0", anchor="center")
+        # Ma'lumot kelguncha yashirin ("data" tegi)
+        items["temp"] = c.create_text(120, 250, font=self.font_big, fill=COL_TEMP, anchor="w", tags="data")
+        items["hum"] = c.create_text(120, 350, font=self.font_big, fill=COL_HUM, anchor="w", tags="data")
+        items["press"] = c.create_text(120, 450, font=self.font_big, fill=COL_PRESS, anchor="w", tags="data")
+        items["panel"] = c.create_rectangle(0, 0, 0, 0, fill=PANEL_COLOR, outline="#3C4A66", width=2, tags="data")
+        items["panel_title"] = c.create_text(0, 0, text="Vaqt o'tishi bilan o'zgarish", font=self.font_label,
+                                             fill="white", anchor="w", tags="data")
+        items["graph"] = c.create_rectangle(0, 0, 0, 0, fill="#0F1626", outline="#55607C", width=2, tags="data")
+        self.lines = [
+            (c.create_line(0, 0, 0, 0, fill=color, width=7, capstyle=tk.ROUND, joinstyle=tk.ROUND, state="hidden"),
+             name, vmin, vmax)
+            for name, vmin, vmax, color in (
+                ("temp", TEMP_MIN, TEMP_MAX, COL_TEMP),
+                ("hum", HUM_MIN, HUM_MAX, COL_HUM),
+                ("press", PRESS_MIN, PRESS_MAX, COL_PRESS),
+            )
+        ]
+        for i, (color, text) in enumerate(((COL_TEMP, "Harorat"), (COL_HUM, "Namlik"), (COL_PRESS, "Bosim"))):
+            items[f"legend{i}"] = c.create_oval(0, 0, 0, 0, fill=color, outline=color, tags="data")
+            items[f"legend{i}_text"] = c.create_text(0, 0, text=text, font=self.font_legend, fill="white",
+                                                     anchor="w", tags="data")
+        items["alerts"] = c.create_text(0, 0, font=self.font_small, fill="#FFB347", anchor="nw")
+        items["frame"] = c.create_text(20, 0, font=self.font_small, fill="#8090A8", anchor="sw")
+        c.itemconfigure("data", state="hidden")
+
+    def _layout(self):
+        """Oyna o'lchamiga bog'liq koordinatalar (faqat o'lcham o'zgarganda)"""
+        c = self.canvas
+        items = self.items
+        w = c.winfo_width()
+        h = c.winfo_height()
+        if w <= 0 or h <= 0:
+            return
+        c.coords(items["background"], 0, 0, w, h)
+        c.coords(items["title"], w // 2, 90)
+        c.coords(items["clock"], w // 2, 130)
 
+        box_x = 80
+        box_y = 520
+        box_w = w - 160
+        box_h = h - box_y - 80
+        self.graph_box = (box_x, box_y, box_w, box_h)
+        c.coords(items["panel"], box_x - 15, box_y - 50, box_x + box_w + 15, box_y + box_h + 60)
+        c.coords(items["panel_title"], box_x + 20, box_y - 10)
+        c.coords(items["graph"], box_x, box_y, box_x + box_w, box_y + box_h)
+
+        legend_x = w - 380
+        for i in range(3):
+            legend_y = 180 + 40 * i
+            c.coords(items[f"legend{i}"], legend_x, legend_y - 12, legend_x + 24, legend_y + 12)
+            c.coords(items[f"legend{i}_text"], legend_x + 35, legend_y)
+        c.coords(items["alerts"], legend_x, 310)
+        c.coords(items["frame"], 20, h - 10)
+
+    def refresh(self):
+        """Har kadrda: faqat matnlar va polyline koordinatalari yangilanadi"""
+        c = self.canvas
+        items = self.items
+        if self.graph_box is None:
+            self._layout()
+            if self.graph_box is None:
+                return
+        c.itemconfigure(items["clock"], text=f"Real vaqt rejimida • {datetime.now().strftime(TIME_FORMAT)}")
+        c.itemconfigure(items["frame"], text=self._frame_text())
+        c.itemconfigure(items["alerts"], text=self._alerts_text())
+        latest = self.history.latest()
+        if latest is None:
+            return
+        t, hu, p = latest[1]
+        c.itemconfigure("data", state="normal")
+        c.itemconfigure(items["temp"], text=f"{t:.2f} °C")
+        c.itemconfigure(items["hum"], text=f"{hu:.1f} %")
+        c.itemconfigure(items["press"], text=f"{p:.1f} mm")
+        for line, name, vmin, vmax in self.lines:
+            data = self.history.view(name, self.window)
+            points = self._line_coords(data, vmin, vmax, *self.graph_box)
+            if points:
+                c.coords(line, points)
+                c.itemconfigure(line, state="normal")
+            else:
+                c.itemconfigure(line, state="hidden")
+
+    def _line_coords(self, data, vmin, vmax, x, y, w, h):
+        """
+        Seriya -> bitta polyline uchun [x0, y0, x1, y1, ...] (grafik chegarasiga qisilgan)
+        Nuqtalar grafik kengligidan ko'p bo'lsa piksel kengligiga kamaytiriladi -
+        chizish narxi tarix uzunligiga bog'liq emas.
+        """
+        points = len(data)
+        if points < 2:
+            return []
+        if points > w:
+            indices = downsample(data, w, method=self.method)
+            values = take(data, indices)
+        else:
+            indices = range(points)
+            values = data
+        self.plotted = len(indices)
+        coords = []
+        for i, value in zip(indices, values):
+            coords.append(x + int(i) * w // (points - 1))
+            if vmax == vmin:
+                py = y + h // 2
+            else:
+                py = y + h - int((value - vmin) / (vmax - vmin) * h)
+            coords.append(max(y, min(y + h, py)))
+        return coords
+
+    # ---------------- Full redraw (eski usul, solishtirish uchun) ----------------
     def redraw_all(self):
         self.canvas.delete("all")
         w = self.canvas.winfo_width()
@@ -120,7 +344,14 @@ class IoTMonitorApp(tk.Tk):
             fill="#E0E0E0", 
             anchor="center"
         )
-
+        self.canvas.create_text(20, h - 10, text=self._frame_text(), font=self.font_small,
+                                fill="#8090A8", anchor="sw")
+        self.canvas.create_text(w - 380, 310, text=self._alerts_text(), font=self.font_small,
+                                fill="#FFB347", anchor="nw")
+
+        temps = self.history.view("temp", MAX_POINTS)
+        hums = self.history.view("hum", MAX_POINTS)
+        presses = self.history.view("press", MAX_POINTS)
         if not temps:
             return
 
@@ -187,7 +418,7 @@ class IoTMonitorApp(tk.Tk):
         # Draw graphs with clipping (using create_rectangle clipping region)
         # Tkinter doesn't have setClip, but we can use canvas clipping by drawing only inside bounds
         if len(temps) >= 2:
-            self._draw_graphs(box_x, box_y, box_w, box_h)
+            self._draw_graphs(temps, hums, presses, box_x, box_y, box_w, box_h)
 
         # === AFSONA — O'NG YUQORI BURCHAKDA (grafikdan tashqarida!) ===
         legend_x = w - 380
@@ -213,7 +444,7 @@ class IoTMonitorApp(tk.Tk):
             anchor="w"
         )
 
-    def _draw_graphs(self, box_x, box_y, box_w, box_h):
+    def _draw_graphs(self, temps, hums, presses, box_x, box_y, box_w, box_h):
         # Draw graph lines (clipped to box area by ensuring coords are within bounds)
         self._draw_graph_line(temps, TEMP_MIN, TEMP_MAX, COL_TEMP, box_x, box_y, box_w, box_h)
         self._draw_graph_line(hums, HUM_MIN, HUM_MAX, COL_HUM, box_x, box_y, box_w, box_h)
@@ -254,48 +485,58 @@ class IoTMonitorApp(tk.Tk):
             )
 
     def update_once(self):
-        # Generate new values (like Java version)
-        t = 20 + random.random() * 12
-        hu = 35 + random.random() * 30
-        p_hpa = 990 + random.random() * 60
-        p = p_hpa * HPA_TO_MM
-
-        # Round values
-        t = round(t * 100) / 100.0
-        hu = round(hu * 10) / 10.0
-        p = round(p * 10) / 10.0
-
-        now = datetime.now().strftime(TIME_FORMAT)
-
-        # Append to buffers
-        temps.append(t)
-        hums.append(hu)
-        presses.append(p)
-        times.append(now)
-
-        # Keep only last MAX_POINTS
-        if len(temps) > MAX_POINTS:
-            temps.pop(0)
-            hums.pop(0)
-            presses.pop(0)
-            times.pop(0)
-
-        # Write to CSV
-        append_csv(now, t, hu, p)
+        # Faqat snapshot: tanlangan sensorning yangi namunalari (generatsiya va disk - fon oqimlarida)
+        ring = self.ingestor.rings.get(self.sensor)
+        if ring is not None:
+            self.cursor, stamps, columns, _ = ring.snapshot(self.cursor)
+            # Halqa bufer: eng eskisi O(1) da ustidan yoziladi (pop(0) yo'q)
+            self.history.extend(stamps, columns)
+            # Har namuna uchun O(1) tekshiruv; hodisalar on_alert ga, konsolga kadrda ko'pi bilan ALERT_LINES ta
+            alerts = self.alerts.process_columns(self.sensor, stamps, columns)
+            for alert in alerts[:ALERT_LINES]:
+                print(format_alert(alert))
+            if len(alerts) > ALERT_LINES:
+                print(f"🚨 ... yana {len(alerts) - ALERT_LINES} ta hodisa")
 
         # Redraw canvas
-        self.redraw_all()
+        self.render()
 
         # Schedule next update
         if self.updating:
-            self.after(UPDATE_INTERVAL_MS, self.update_once)
+            self.after(self.interval_ms, self.update_once)
 
     def on_close(self):
         self.updating = False
+        self.ingestor.stop()
+        self.recorder.stopped.set()
+        self.recorder.join()
+        self.store.close()
         self.destroy()
 
 # ---------------- Run ----------------
 if __name__ == "__main__":
-    app = IoTMonitorApp()
+    parser = argparse.ArgumentParser(description="IoT sensor simulyatsiyasi")
+    parser.add_argument("--interval", type=int, default=UPDATE_INTERVAL_MS, help="Kadr oralig'i (ms)")
+    parser.add_argument("--full-redraw", action="store_true", help="Eski usul: har kadrda hammasini qayta chizish")
+    parser.add_argument("--sensors", type=int, default=1, help="Simulyatsiya sensorlari soni (0 - simulyatsiyasiz)")
+    parser.add_argument("--rate", type=float, default=SIM_RATE, help="Simulyatsiya chastotasi (Hz)")
+    parser.add_argument("--udp", help="host:port - UDP line protocol qabul qilish")
+    parser.add_argument("--serial", help="Serial port (yoki yozib olingan fayl)")
+    parser.add_argument("--sensor", default="sim-0", help="Ko'rsatiladigan sensor")
+    parser.add_argument("--history", type=int, default=HISTORY_POINTS, help="Xotiradagi tarix (nuqta, masalan 1000000)")
+    parser.add_argument("--window", type=int, default=MAX_POINTS, help="Grafikdagi oxirgi nuqtalar (tarixgacha)")
+    parser.add_argument("--downsample", choices=METHODS, default=DOWNSAMPLE, help="Kamaytirish usuli")
+    args = parser.parse_args()
+
+    ingestor = Ingestor()
+    if args.sensors:
+        ingestor.add(SimulatedSource(args.sensors, args.rate))
+    if args.udp:
+        host, port = args.udp.rsplit(":", 1)
+        ingestor.add(UDPSource(host, int(port)))
+    if args.serial:
+        ingestor.add(SerialSource(args.serial))
+    app = IoTMonitorApp(ingestor, args.sensor, history=args.history, window=args.window,
+                        method=args.downsample, interval_ms=args.interval, full_redraw=args.full_redraw)
     app.protocol("WM_DELETE_WINDOW", app.on_close)
     app.mainloop()
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Sensor ma'lumotlari uchun ustunli (columnar) vaqt qatorlari ombori.
+    - Yozuvlar xotirada bloklab yig'iladi (array), blok to'lganda yoki
+      `flush_interval` o'tganda bir nechta write bilan diskka tushadi
+    - Vaqt belgisi int64 epoch-ns, qiymatlar float32 - CSV matniga qaraganda
+      ~3 barobar ixcham, parse qilish kerak emas
+    - Segment fayllari mmap qilinadi: o'qishda nusxa olinmaydi (memoryview)
+    - Vaqt indeksi: segmentlar vaqt bo'yicha tartiblangan, segment ichida
+      vaqt belgilari o'smaydigan emas - oraliq so'rovi ikkita bisect
+    - CSV eksport formati sifatida qoladi (import / export)
+
+Segment fayli (<birinchi vaqt>.seg), little-endian:
+    sarlavha: MAGIC, versiya, ustunlar soni, sig'im | yozilgan qatorlar, t_min, t_max | ustun nomlari
+    vaqt belgilari: int64 x sig'im
+    har bir ustun: float32 x sig'im
+Fayl sig'im bo'yicha oldindan ajratiladi, qatorlar soni ma'lumotdan keyin
+yoziladi - o'quvchi hech qachon yarim yozilgan qatorni ko'rmaydi.
+
+    python storage.py import sensor_malumotlari.csv
+    python storage.py export eksport.csv --from "20.12.2025 14:00:00"
+    python storage.py info
+"""
+
+import argparse
+import bisect
+import mmap
+import os
+import struct
+import time
+from array import array
+from datetime import datetime
+
+STORE_DIR = "sensor_data"
+COLUMNS = ("temp", "hum", "press")
+BLOCK_ROWS = 1024           # Xotiradagi blok (shuncha qatordan keyin flush)
+SEGMENT_ROWS = 1 << 16      # Bitta segment faylidagi qatorlar
+FLUSH_INTERVAL = 10.0       # Blok to'lmasa ham shuncha soniyada flush
+
+MAGIC = b"SEG1"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")     # magic, versiya, ustunlar soni, sig'im
+COUNTS = struct.Struct("<Qqq")       # yozilgan qatorlar, t_min, t_max
+NAME_SIZE = 16
+NS = 1_000_000_000
+
+CSV_TIME_FORMAT = "%d.%m.%Y %H:%M:%S"
+CSV_FIELDS = {              # ustun -> (CSV sarlavhasi, kenglik, format)
+    "temp": ("Harorat (°C)", 12, "{:.2f}"),
+    "hum": ("Namlik (%)", 10, "{:.1f}"),
+    "press": ("Bosim (mm)", 12, "{:.1f}"),
+}
+
+
+def _data_offset(columns):
+    """Sarlavha hajmi (64 baytga tekislangan)"""
+    size = HEADER.size + COUNTS.size + NAME_SIZE * columns
+    return (size + 63) // 64 * 64
+
+
+class Segment:
+    """
+    Bitta segment fayli (o'qish mmap orqali)
+    Qaytariladigan memoryview lar segment yopilguncha yashaydi.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, columns, self.capacity = HEADER.unpack_from(self.map)
+        if magic != MAGIC or version != VERSION:
+            self.map.close()
+            raise ValueError(f"Segment fayli emas: {path}")
+        start = HEADER.size + COUNTS.size
+        self.columns = tuple(
+            self.map[start + i * NAME_SIZE:start + (i + 1) * NAME_SIZE].rstrip(b"\0").decode("ascii")
+            for i in range(columns)
+        )
+        self.offset = _data_offset(columns)
+        self.view = memoryview(self.map)
+
+    @staticmethod
+    def create(path, columns, capacity, first):
+        """Bo'sh segment faylini yaratish (sig'im bo'yicha joy ajratiladi)"""
+        offset = _data_offset(len(columns))
+        header = HEADER.pack(MAGIC, VERSION, len(columns), capacity) + COUNTS.pack(0, first, first)
+        header += b"".join(name.encode("ascii")[:NAME_SIZE].ljust(NAME_SIZE, b"\0") for name in columns)
+        with open(path, "wb") as f:
+            f.write(header)
+            f.truncate(offset + capacity * (8 + 4 * len(columns)))
+
+    def _counts(self):
+        return COUNTS.unpack_from(self.map, HEADER.size)
+
+    @property
+    def count(self):
+        return self._counts()[0]
+
+    @property
+    def t_min(self):
+        return self._counts()[1]
+
+    @property
+    def t_max(self):
+        return self._counts()[2]
+
+    def column_offset(self, index):
+        """index = -1 - vaqt belgilari, aks holda ustun raqami"""
+        if index < 0:
+            return self.offset
+        return self.offset + self.capacity * (8 + 4 * index)
+
+    def timestamps(self, count=None):
+        count = self.count if count is None else count
+        start = self.column_offset(-1)
+        return self.view[start:start + 8 * count].cast("q")
+
+    def column(self, name, count=None):
+        count = self.count if count is None else count
+        start = self.column_offset(self.columns.index(name))
+        return self.view[start:start + 4 * count].cast("f")
+
+    def close(self):
+        self.view.release()
+        try:
+            self.map.close()
+        except BufferError:
+            pass                # Tashqarida view lar hali ishlatilmoqda - GC yopadi
+
+
+class ColumnStore:
+    """
+    Ustunli vaqt qatorlari ombori
+    Args:
+        directory: Segment fayllari papkasi
+        columns: float32 ustun nomlari
+        block_rows: Xotiradagi blok hajmi (qator)
+        segment_rows: Segment sig'imi (qator)
+        flush_interval: Blok to'lmasa ham flush oralig'i (soniya)
+    """
+
+    def __init__(self, directory=STORE_DIR, columns=COLUMNS, block_rows=BLOCK_ROWS,
+                 segment_rows=SEGMENT_ROWS, flush_interval=FLUSH_INTERVAL):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.columns = tuple(columns)
+        self.block_rows = block_rows
+        self.segment_rows = segment_rows
+        self.flush_interval = flush_interval
+        self.segments = [Segment(os.path.join(directory, name))
+                         for name in sorted(os.listdir(directory)) if name.endswith(".seg")]
+        for segment in self.segments:
+            if segment.columns != self.columns:
+                raise ValueError(f"Ustunlar mos emas: {segment.path} {segment.columns}")
+        self.last = self.segments[-1].t_max if self.segments else None
+        self.flushes = 0
+        self._timestamps = array("q")
+        self._values = [array("f") for _ in self.columns]
+        self._file = None           # Oxirgi (to'lmagan) segmentga yozish uchun
+        self._flushed_at = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return sum(segment.count for segment in self.segments) + len(self._timestamps)
+
+    def append(self, timestamp, *values):
+        """
+        Bitta qator qo'shish
+        Args:
+            timestamp: epoch-ns (int); orqaga ketsa oxirgisiga tenglanadi (monoton)
+            values: Har bir ustun uchun qiymat
+        """
+        if self.last is not None and timestamp < self.last:
+            timestamp = self.last
+        self.last = timestamp
+        self._timestamps.append(timestamp)
+        for column, value in zip(self._values, values):
+            column.append(value)
+        if (len(self._timestamps) >= self.block_rows
+                or time.monotonic() - self._flushed_at >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Xotiradagi blokni segment(lar)ga yozish"""
+        self._flushed_at = time.monotonic()
+        rows = len(self._timestamps)
+        if not rows:
+            return
+        timestamps = memoryview(self._timestamps)
+        values = [memoryview(column) for column in self._values]
+        start = 0
+        while start < rows:
+            segment = self._writable(self._timestamps[start])
+            count = segment.count
+            end = start + min(rows - start, segment.capacity - count)
+            f = self._file
+            f.seek(segment.column_offset(-1) + 8 * count)
+            f.write(timestamps[start:end])
+            for index, column in enumerate(values):
+                f.seek(segment.column_offset(index) + 4 * count)
+                f.write(column[start:end])
+            # Qatorlar soni oxirida - o'quvchi faqat to'liq yozilgan qatorlarni ko'radi
+            f.seek(HEADER.size)
+            f.write(COUNTS.pack(count + end - start, segment.t_min if count else self._timestamps[start],
+                                self._timestamps[end - 1]))
+            start = end
+        timestamps.release()
+        for column in values:
+            column.release()
+        del self._timestamps[:]
+        for column in self._values:
+            del column[:]
+        self.flushes += 1
+
+    def _writable(self, first):
+        """Bo'sh joyi bor oxirgi segment (kerak bo'lsa yangisi)"""
+        segment = self.segments[-1] if self.segments else None
+        if segment is None or segment.count >= segment.capacity:
+            path = os.path.join(self.directory, f"{first:020d}.seg")
+            Segment.create(path, self.columns, self.segment_rows, first)
+            segment = Segment(path)
+            self.segments.append(segment)
+            self._close_file()
+        if self._file is None:
+            self._file = open(segment.path, "r+b", buffering=0)
+        return segment
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def range(self, start=None, end=None, columns=None):
+        """
+        [start, end) oraliqdagi ma'lumotlar (epoch-ns, None - chegarasiz)
+        Yields:
+            tuple: (vaqt belgilari, {ustun: qiymatlar}) - segment bo'laklari
+                (memoryview, nusxasiz); oxirida xotiradagi blok (nusxa)
+        """
+        columns = self.columns if columns is None else tuple(columns)
+        first = 0 if start is None else bisect.bisect_left(self.segments, start, key=lambda s: s.t_max)
+        for segment in self.segments[first:]:
+            if end is not None and segment.t_min >= end:
+                return
+            count = segment.count
+            timestamps = segment.timestamps(count)
+            i = 0 if start is None else bisect.bisect_left(timestamps, start)
+            j = count if end is None else bisect.bisect_left(timestamps, end, i)
+            if i < j:
+                yield timestamps[i:j], {name: segment.column(name, count)[i:j] for name in columns}
+        timestamps = self._timestamps
+        i = 0 if start is None else bisect.bisect_left(timestamps, start)
+        j = len(timestamps) if end is None else bisect.bisect_left(timestamps, end, i)
+        if i < j:
+            yield timestamps[i:j], {name: self._values[self.columns.index(name)][i:j] for name in columns}
+
+    def rows(self, start=None, end=None, columns=None):
+        """Oraliqdagi qatorlar: (epoch-ns, qiymat, ...)"""
+        columns = self.columns if columns is None else tuple(columns)
+        for timestamps, values in self.range(start, end, columns):
+            yield from zip(timestamps, *(values[name] for name in columns))
+
+    def tail(self, count, columns=None):
+        """Oxirgi `count` ta qator (eski -> yangi), faqat oxirgi segmentlar o'qiladi"""
+        columns = self.columns if columns is None else tuple(columns)
+        result = []
+        for timestamps, values in reversed(list(self.range(columns=columns))):
+            need = count - len(result)
+            if need <= 0:
+                break
+            i = max(0, len(timestamps) - need)
+            result[:0] = zip(timestamps[i:], *(values[name][i:] for name in columns))
+        return result
+
+    def stats(self):
+        return {
+            "rows": len(self),
+            "segments": len(self.segments),
+            "bytes": sum(os.path.getsize(segment.path) for segment in self.segments),
+            "buffered": len(self._timestamps),
+            "flushes": self.flushes,
+        }
+
+    def close(self):
+        self.flush()
+        self._close_file()
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+
+# ---------------- CSV ----------------
+
+def parse_csv_time(text):
+    """'20.12.2025 14:55:47' (mahalliy vaqt) -> epoch-ns"""
+    return int(datetime.strptime(text, CSV_TIME_FORMAT).timestamp()) * NS
+
+
+def read_csv(path, columns=len(COLUMNS)):
+    """
+    Eski matnli CSV qatorlari (sarlavha va buzilgan qatorlar tashlab ketiladi)
+    Yields:
+        tuple: (epoch-ns, qiymat, ...)
+    """
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            parts = line.split("|")
+            if len(parts) != columns + 1:
+                continue
+            try:
+                yield (parse_csv_time(parts[0].strip()), *(float(part) for part in parts[1:]))
+            except ValueError:
+                continue
+
+
+def import_csv(store, path):
+    """
+    Eski matnli CSV ni omborga o'tkazish
+    Returns:
+        int: Import qilingan qatorlar
+    """
+    count = 0
+    for row in read_csv(path, len(store.columns)):
+        store.append(*row)
+        count += 1
+    store.flush()
+    return count
+
+
+def export_csv(store, path, start=None, end=None):
+    """
+    Ombordagi ma'lumotlarni eski CSV formatida yozish
+    Returns:
+        int: Yozilgan qatorlar
+    """
+    fields = [CSV_FIELDS.get(name, (name, 12, "{:.3f}")) for name in store.columns]
+    header = f"{'Vaqt':<20} | " + " | ".join(f"{title:<{width}}" for title, width, _ in fields) + "\n"
+    formats = [fmt for _, _, fmt in fields]
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(header)
+        f.write("-" * (len(header) - 1) + "\n")
+        for row in store.rows(start, end):
+            moment = datetime.fromtimestamp(row[0] / NS).strftime(CSV_TIME_FORMAT)
+            f.write(f"{moment} | " + " | ".join(fmt.format(value) for fmt, value in zip(formats, row[1:])) + "\n")
+            count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sensor ma'lumotlari ombori")
+    parser.add_argument("--store", default=STORE_DIR, help="Ombor papkasi")
+    commands = parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser("import", help="Eski CSV ni import qilish")
+    command.add_argument("csv")
+    command = commands.add_parser("export", help="CSV ga eksport")
+    command.add_argument("csv")
+    command.add_argument("--from", dest="start", help=f"Boshlanish ({CSV_TIME_FORMAT})")
+    command.add_argument("--to", dest="end", help=f"Tugash ({CSV_TIME_FORMAT})")
+    commands.add_parser("info", help="Ombor haqida")
+    args = parser.parse_args()
+
+    with ColumnStore(args.store) as store:
+        if args.command == "import":
+            started = time.perf_counter()
+            count = import_csv(store, args.csv)
+            print(f"📥 {count} qator import qilindi ({time.perf_counter() - started:.2f} s)")
+        elif args.command == "export":
+            start = parse_csv_time(args.start) if args.start else None
+            end = parse_csv_time(args.end) if args.end else None
+            print(f"📤 {export_csv(store, args.csv, start, end)} qator yozildi: {args.csv}")
+        else:
+            stats = store.stats()
+            print(f"📦 {stats['rows']} qator, {stats['segments']} segment, {stats['bytes'] / 1e6:.2f} MB (diskda ajratilgan)")
+            for segment in store.segments:
+                print(f"   {os.path.basename(segment.path)}: {segment.count}/{segment.capacity} qator, "
+                      f"{datetime.fromtimestamp(segment.t_min / NS):%d.%m.%Y %H:%M:%S} - "
+                      f"{datetime.fromtimestamp(segment.t_max / NS):%d.%m.%Y %H:%M:%S}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Rejalashtirish mumkinligi tahlili (schedulability analysis)
+Vazifalar to'plamini ishga tushirmasdan, oflayn tekshirish:
+
+    - Liu & Layland chegarasi (RM):  U <= n(2^(1/n) - 1)       - yetarli shart
+    - Giperbolik chegara (RM):       prod(U_i + 1) <= 2         - yetarli, L&L dan aniqroq
+    - EDF:  U <= 1 (deadline = davr bo'lsa aniq shart), D < T bo'lsa zichlik testi
+    - RM uchun javob vaqti tahlili (Response-Time Analysis):
+          R_i = C_i + sum(ceil(R_i / T_j) * C_j), j - yuqori prioritetli vazifalar
+      R_i <= D_i bo'lsa vazifa har doim o'z deadline ida tugaydi (aniq shart)
+
+Vazifalar scheduler.Task obyektlari (period, wcet, deadline); sporadik vazifa
+eng kichik kelish oralig'i bilan davriy deb qaraladi (eng yomon holat).
+"""
+
+import math
+
+from scheduler import EDF, RM
+
+
+def total_utilization(tasks):
+    """Umumiy protsessor yuklamasi: sum(C / T)"""
+    return math.fsum(task.wcet / task.period for task in tasks)
+
+
+def liu_layland_bound(n):
+    """n ta vazifa uchun Liu & Layland chegarasi (n -> cheksiz: ln 2 ~ 0.693)"""
+    if n <= 0:
+        return 1.0
+    return n * (2 ** (1 / n) - 1)
+
+
+def rm_utilization_test(tasks):
+    """
+    RM uchun Liu & Layland testi (faqat deadline = davr bo'lganda)
+    Returns:
+        tuple: (U, chegara, o'tdimi)
+    """
+    utilization = total_utilization(tasks)
+    bound = liu_layland_bound(len(tasks))
+    return utilization, bound, utilization <= bound
+
+
+def hyperbolic_test(tasks):
+    """RM uchun giperbolik chegara (Bini): prod(U_i + 1) <= 2"""
+    product = 1.0
+    for task in tasks:
+        product *= task.wcet / task.period + 1
+        if product > 2:
+            return False
+    return True
+
+
+def edf_test(tasks):
+    """
+    EDF testi
+    Deadline = davr bo'lsa U <= 1 zarur va yetarli; D < T bo'lsa
+    zichlik (density) sum(C / min(D, T)) <= 1 - faqat yetarli shart.
+    Returns:
+        tuple: (yuklama yoki zichlik, aniq shartmi, o'tdimi)
+    """
+    implicit = all(task.deadline >= task.period for task in tasks)
+    if implicit:
+        utilization = total_utilization(tasks)
+        return utilization, True, utilization <= 1.0
+    density = math.fsum(task.wcet / min(task.deadline, task.period) for task in tasks)
+    return density, False, density <= 1.0
+
+
+def rm_order(tasks):
+    """RM prioritet tartibi: qisqa davr - yuqori prioritet (teng davrda qo'shilish tartibi)"""
+    return sorted(tasks, key=lambda task: task.period)
+
+
+def response_time_analysis(tasks, max_iterations=1000):
+    """
+    RM uchun javob vaqti tahlili
+    Returns:
+        list: [(Task, R yoki None)] prioritet tartibida; None - R > D (deadline buziladi)
+    """
+    ordered = rm_order(tasks)
+    results = []
+    higher = []         # Yuqori prioritetli vazifalar: (T, C)
+    higher_load = 0.0   # Ularning umumiy yuklamasi
+    for task in ordered:
+        wcet = task.wcet
+        if higher_load >= 1.0:
+            # Yuqori prioritetli vazifalar protsessorni to'liq band qiladi
+            results.append((task, None))
+        else:
+            # Boshlang'ich qiymat: C_i + sum(C_j) (R ning quyi chegarasi)
+            response = wcet + math.fsum(c for _, c in higher)
+            for _ in range(max_iterations):
+                interference = 0.0
+                for period, cost in higher:
+                    interference += math.ceil(response / period - 1e-12) * cost
+                updated = wcet + interference
+                if updated > task.deadline:
+                    response = None
+                    break
+                if updated <= response:
+                    break
+                response = updated
+            else:
+                response = None
+            results.append((task, response))
+        higher.append((task.period, wcet))
+        higher_load += wcet / task.period
+    return results
+
+
+class Report:
+    """
+    Tahlil natijasi
+    """
+
+    def __init__(self, tasks, policy):
+        self.tasks = list(tasks)
+        self.policy = policy
+        self.utilization = total_utilization(self.tasks)
+        self.checks = []            # (test nomi, qiymat, chegara, natija)
+        self.responses = []         # RM: [(Task, R)]
+        self.schedulable = None     # True / False / None (aniqlanmadi)
+
+    def add(self, name, value, bound, passed):
+        self.checks.append((name, value, bound, passed))
+
+    def unschedulable(self):
+        """RTA bo'yicha deadline buzadigan vazifalar"""
+        return [task for task, response in self.responses if response is None]
+
+
+def analyze(tasks, policy=EDF, rta=True):
+    """
+    Vazifalar to'plamini tanlangan siyosat uchun tekshirish
+    Args:
+        tasks: Task ro'yxati
+        policy: EDF yoki RM
+        rta: RM da yetarli testlar o'tmasa javob vaqti tahlilini bajarish
+    Returns:
+        Report
+    """
+    report = Report(tasks, policy)
+    tasks = report.tasks
+    if policy == EDF:
+        value, exact, passed = edf_test(tasks)
+        report.add("EDF U <= 1" if exact else "EDF zichlik <= 1", value, 1.0, passed)
+        report.schedulable = passed if (exact or passed) else None
+        return report
+
+    if policy != RM:
+        raise ValueError(f"Noma'lum siyosat: {policy}")
+
+    implicit = all(task.deadline >= task.period for task in tasks)
+    if report.utilization > 1.0:
+        report.add("U <= 1", report.utilization, 1.0, False)
+        report.schedulable = False
+        return report
+    if implicit:
+        # Yetarli testlar faqat deadline = davr bo'lganda o'rinli
+        utilization, bound, passed = rm_utilization_test(tasks)
+        report.add("Liu & Layland", utilization, bound, passed)
+        hyperbolic = hyperbolic_test(tasks)
+        report.add("Giperbolik: prod(U + 1) <= 2", None, None, hyperbolic)
+        if passed or hyperbolic:
+            report.schedulable = True
+            return report
+    if rta:
+        # Yetarli testlar javob bermadi - aniq tahlil
+        report.responses = response_time_analysis(tasks)
+        failed = len(report.unschedulable())
+        report.schedulable = not failed
+        report.add(f"Javob vaqti tahlili (RTA): {failed} ta vazifa deadline buzadi", None, None, not failed)
+    return report
+
+
+def format_report(report, limit=10):
+    """Tahlil natijasini matn ko'rinishida formatlash"""
+    verdict = {True: "✅ rejalashtirish mumkin", False: "❌ rejalashtirib bo'lmaydi", None: "⚠️  aniqlanmadi"}
+    lines = [
+        f"🔍 Tahlil: {report.policy.upper()}, {len(report.tasks)} ta vazifa, U = {report.utilization:.4f}",
+    ]
+    for name, value, bound, passed in report.checks:
+        mark = "✅" if passed else "❌"
+        if bound is None:
+            lines.append(f"   {mark} {name}")
+        else:
+            lines.append(f"   {mark} {name}: {value:.4f} (chegara {bound:.4f})")
+    failed = report.unschedulable()
+    for task in failed[:limit]:
+        lines.append(f"   ⏰ {task.name}: javob vaqti deadline ({task.deadline * 1000:.3f} ms) dan oshadi")
+    if len(failed) > limit:
+        lines.append(f"   ... yana {len(failed) - limit} ta vazifa")
+    lines.append(f"   Natija: {verdict[report.schedulable]}")
+    return "\n".join(lines)
@@ -1,20 +1,69 @@
-import heapq
+import sys
+import threading
 import time
 
-class EDFTask:
-    def __init__(self, deadline, name):
-        self.deadline = deadline
-        self.name = name
+from analysis import analyze, format_report
+from scheduler import EDF, POLICIES, SPORADIC, Scheduler, Task, format_stats
+from simulator import format_sim, format_timeline, simulate
 
-    def __lt__(self, other):
-        return self.deadline < other.deadline
+DURATION = 3.0      # Demo davomiyligi (soniya)
 
-tasks = []
-heapq.heappush(tasks, EDFTask(3, "Sensor o‘qish"))
-heapq.heappush(tasks, EDFTask(1, "Favqulodda signal"))
-heapq.heappush(tasks, EDFTask(5, "Ma’lumot yozish"))
 
-while tasks:
-    task = heapq.heappop(tasks)
-    print(f"{task.name} bajarilmoqda (deadline={task.deadline})")
-    time.sleep(1)
+def demo_tasks():
+    """Dars misolidagi vazifalar: davrlar va WCET soniyalarda"""
+    return [
+        Task("Sensor o‘qish", period=0.020, wcet=0.004),
+        Task("Ma’lumot yozish", period=0.100, wcet=0.020),
+        Task("Favqulodda signal", period=0.050, wcet=0.002, deadline=0.010, kind=SPORADIC),
+    ]
+
+
+def alarm_source(scheduler, stop):
+    """Favqulodda signallarni tasodifiy vaqtlarda yuborish (boshqa thread)"""
+    while not stop.wait(0.137):
+        scheduler.trigger("Favqulodda signal")
+
+
+def offline(hours=1.0):
+    """Demo vazifalarini kutmasdan tekshirish: tahlil + virtual vaqtda simulyatsiya"""
+    tasks = demo_tasks()
+    for policy in POLICIES:
+        print("=" * 60)
+        print(format_report(analyze(tasks, policy)))
+        stats = simulate(tasks, policy, horizon=hours * 3600, timeline=0.2)
+        print(format_sim(stats))
+        print(format_timeline(stats, 0.2))
+    print("=" * 60)
+
+
+def main(policy=EDF):
+    scheduler = Scheduler(policy=policy)
+    for task in demo_tasks():
+        scheduler.add(task)
+
+    utilization = sum(task.utilization for task in scheduler.tasks.values())
+    print("=" * 60)
+    print(f"🚀 RTOS rejalashtiruvchi: {policy.upper()}, {len(scheduler)} ta vazifa")
+    print(f"⚙️  Umumiy yuklama U = {utilization:.2f}")
+    print(f"⏱️  Davomiyligi: {DURATION} soniya")
+    print("=" * 60)
+
+    stop = threading.Event()
+    threading.Thread(target=alarm_source, args=(scheduler, stop), daemon=True).start()
+    started = time.monotonic()
+    scheduler.run(duration=DURATION)
+    stop.set()
+
+    print(format_stats(scheduler))
+    print(f"✅ Tugadi: {time.monotonic() - started:.2f} s")
+
+
+if __name__ == "__main__":
+    policy = sys.argv[1].lower() if len(sys.argv) > 1 else EDF
+    if policy == "sim":
+        offline()
+        sys.exit(0)
+    if policy not in POLICIES:
+        print(f"❌ Noma'lum siyosat: {policy} (mavjud: {', '.join(POLICIES)}, sim)")
+        sys.exit(1)
+    main(policy)
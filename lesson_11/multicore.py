@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ko'p yadroli EDF: partitioned va global rejalashtirish (multiprocessing)
+GIL tufayli bitta jarayon faqat bitta yadrodan foydalanadi, shuning uchun har bir
+yadro - alohida worker jarayon. Asosiy jarayondagi dispetcher releaselarni
+rejalashtiradi va ishlarni prioritet navbatlaridan yadrolarga tarqatadi:
+
+    partitioned - vazifalar yadrolarga bin-packing (FFD/WFD) bilan biriktiriladi,
+                  har bir yadroning o'z EDF navbati bor, migratsiya yo'q
+    global      - barcha yadrolar bitta umumiy EDF navbatidan oladi: har doim eng
+                  yaqin deadline li M ta ish bajariladi, ish boshqa yadroda davom
+                  etishi (migratsiya) mumkin
+
+Preemption: yangi ishning deadline i band yadrodagi eng kech deadline dan oldin
+bo'lsa, o'sha yadroga umumiy xotiradagi bayroq (flag) qo'yiladi; worker keyingi
+bo'lak chegarasida to'xtab, qolgan ishni dispetcherga qaytaradi.
+
+    python multicore.py --policy global --cores 4 --utilization 3.0
+    python multicore.py --policy partitioned --cores 4 --utilization 3.0
+"""
+
+import argparse
+import heapq
+import itertools
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+from scheduler import TaskStats
+from simulator import generate_tasks
+
+GLOBAL = "global"
+PARTITIONED = "partitioned"
+MULTICORE_POLICIES = (GLOBAL, PARTITIONED)
+
+FIRST_FIT = "ffd"
+WORST_FIT = "wfd"
+
+WORK_SLICE = 0.0005     # Sintetik yuklama bo'lagi = preemption nuqtalari oralig'i (soniya)
+
+
+def partition(tasks, cores, heuristic=WORST_FIT, capacity=1.0):
+    """
+    Vazifalarni yadrolarga bin-packing bilan taqsimlash (yuklama bo'yicha kamayish tartibida)
+        ffd - birinchi sig'adigan yadro (First-Fit Decreasing)
+        wfd - eng bo'sh yadro (Worst-Fit Decreasing), yuklamani tekis taqsimlaydi
+    Har bir yadro EDF bilan ishlaydi, shuning uchun sig'im U <= 1.
+    Returns:
+        dict: vazifa nomi -> yadro raqami
+    Raises:
+        ValueError: Vazifa hech bir yadroga sig'masa
+    """
+    loads = [0.0] * cores
+    assignment = {}
+    for task in sorted(tasks, key=lambda t: t.utilization, reverse=True):
+        if heuristic == WORST_FIT:
+            core = min(range(cores), key=loads.__getitem__)
+            fits = loads[core] + task.utilization <= capacity
+        else:
+            core = next((c for c in range(cores) if loads[c] + task.utilization <= capacity), None)
+            fits = core is not None
+        if not fits:
+            raise ValueError(
+                f"{task.name} (U = {task.utilization:.3f}) hech bir yadroga sig'madi: "
+                f"yuklamalar {[round(load, 3) for load in loads]}"
+            )
+        loads[core] += task.utilization
+        assignment[task.name] = core
+    return assignment
+
+
+def core_worker(core, conn, flags, slice_=WORK_SLICE):
+    """
+    Yadro worker jarayoni: dispetcherdan ish olib bajaradi
+    Xabar: (ish id, funksiya yoki None, qolgan vaqt); None - to'xtash.
+    Javob: ("done" | "preempted", ish id, qolgan vaqt, boshlanish, tugash)
+    """
+    try:
+        os.sched_setaffinity(0, {core % os.cpu_count()})
+    except (AttributeError, OSError):
+        pass
+    clock = time.monotonic
+    while True:
+        message = conn.recv()
+        if message is None:
+            return
+        job_id, func, remaining = message
+        start = clock()
+        if func is not None:
+            # Foydalanuvchi funksiyasi bitta bo'lakda (preemptionsiz) bajariladi
+            func()
+            remaining = 0.0
+        else:
+            # Sintetik CPU yuklamasi: har bo'lakdan keyin preemption bayrog'i tekshiriladi
+            end = start + remaining
+            now = start
+            while now < end:
+                stop = min(end, now + slice_)
+                while now < stop:
+                    now = clock()
+                if flags[core] and now < end:
+                    break
+            remaining = max(end - now, 0.0)
+        finish = clock()
+        conn.send(("done" if remaining <= 0 else "preempted", job_id, remaining, start, finish))
+
+
+class CoreJob:
+    """Dispetcherdagi ish: qolgan bajarilish vaqti va oxirgi yadro (migratsiya uchun)"""
+
+    __slots__ = ("id", "task", "release", "deadline", "remaining", "started", "last_core")
+
+    def __init__(self, job_id, task, release):
+        self.id = job_id
+        self.task = task
+        self.release = release
+        self.deadline = release + task.deadline
+        self.remaining = task.wcet
+        self.started = None
+        self.last_core = None
+
+
+class CoreStats:
+    """Yadro statistikasi"""
+
+    __slots__ = ("busy", "jobs", "preemptions", "migrations")
+
+    def __init__(self):
+        self.busy = 0.0         # Ish bajarishga sarflangan vaqt
+        self.jobs = 0           # Yadroga yuborilgan ishlar (davom ettirishlar ham)
+        self.preemptions = 0
+        self.migrations = 0     # Uzilgan (preempted) ish shu yadroda davom ettirilgan, avval boshqasida edi
+
+
+class MulticoreExecutor:
+    """
+    Ko'p yadroli EDF ijrochisi
+    Args:
+        tasks: Task ro'yxati (func - modul darajasidagi funksiya yoki None)
+        cores: Yadrolar (worker jarayonlar) soni
+        policy: GLOBAL yoki PARTITIONED
+        heuristic: Partitioned rejimda bin-packing usuli (ffd/wfd)
+    """
+
+    def __init__(self, tasks, cores=None, policy=GLOBAL, heuristic=WORST_FIT):
+        if policy not in MULTICORE_POLICIES:
+            raise ValueError(f"Noma'lum siyosat: {policy} (mavjud: {', '.join(MULTICORE_POLICIES)})")
+        self.tasks = {task.name: task for task in tasks}
+        self.cores = cores or os.cpu_count()
+        self.policy = policy
+        self.core_stats = [CoreStats() for _ in range(self.cores)]
+        self.task_stats = {name: TaskStats() for name in self.tasks}
+        self.elapsed = 0.0
+
+        if policy == PARTITIONED:
+            self.assignment = partition(self.tasks.values(), self.cores, heuristic)
+            self._queues = [[] for _ in range(self.cores)]
+            self._queue_cores = [[core] for core in range(self.cores)]
+        else:
+            self.assignment = None
+            # Barcha yadrolar uchun bitta umumiy navbat
+            self._queues = [[]]
+            self._queue_cores = [list(range(self.cores))]
+        self._core_queue = [0 if policy == GLOBAL else core for core in range(self.cores)]
+        self._running = [None] * self.cores     # yadro -> CoreJob
+        self._seq = itertools.count()
+        self._timers = []
+        self._jobs = {}
+
+    def _queue_of(self, task):
+        return 0 if self.assignment is None else self.assignment[task.name]
+
+    def _release_due(self, now):
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            release, _, task = timers[0]
+            job = CoreJob(next(self._seq), task, release)
+            self._jobs[job.id] = job
+            self.task_stats[task.name].released += 1
+            heapq.heappush(self._queues[self._queue_of(task)], (job.deadline, job.id, job))
+            heapq.heapreplace(timers, (release + task.period, next(self._seq), task))
+
+    def _dispatch(self, conns, flags):
+        """Bo'sh yadrolarga ishlarni berish va kerak bo'lsa preemption so'rash"""
+        running = self._running
+        for queue, cores in zip(self._queues, self._queue_cores):
+            for core in cores:
+                if not queue:
+                    break
+                if running[core] is None:
+                    _, _, job = heapq.heappop(queue)
+                    self._start(core, job, conns, flags)
+            if not queue:
+                continue
+            # Navbat boshidagi ish band yadrodagi eng kech deadline dan oldin bo'lsa - preemption
+            victim = max(
+                (core for core in cores if running[core] is not None and not flags[core]),
+                key=lambda core: running[core].deadline,
+                default=None,
+            )
+            if victim is not None and queue[0][0] < running[victim].deadline:
+                flags[victim] = 1
+
+    def _start(self, core, job, conns, flags):
+        task = job.task
+        stats = self.core_stats[core]
+        stats.jobs += 1
+        # Migratsiya - faqat uzilgan ish boshqa yadroda davom etganda (yangi ishni joylash emas)
+        if job.last_core is not None and job.last_core != core:
+            stats.migrations += 1
+        job.last_core = core
+        flags[core] = 0
+        self._running[core] = job
+        conns[core].send((job.id, task.func, job.remaining))
+
+    def _on_message(self, core, message):
+        kind, job_id, remaining, start, finish = message
+        job = self._jobs[job_id]
+        stats = self.task_stats[job.task.name]
+        self._running[core] = None
+        self.core_stats[core].busy += finish - start
+        if job.started is None:
+            job.started = start
+            stats.record_start(start - job.release)
+        if kind == "preempted":
+            job.remaining = remaining
+            stats.preempted += 1
+            self.core_stats[core].preemptions += 1
+            queue = self._queues[self._core_queue[core]]
+            heapq.heappush(queue, (job.deadline, job.id, job))
+        else:
+            del self._jobs[job_id]
+            stats.record_finish(finish - job.release, finish > job.deadline, False)
+
+    def run(self, duration):
+        """
+        Worker jarayonlarni ishga tushirib, `duration` soniya rejalashtirish
+        """
+        context = multiprocessing.get_context("spawn")
+        flags = context.Array("b", self.cores, lock=False)
+        conns = []
+        processes = []
+        for core in range(self.cores):
+            parent, child = context.Pipe()
+            process = context.Process(target=core_worker, args=(core, child, flags), daemon=True)
+            process.start()
+            conns.append(parent)
+            processes.append(process)
+        by_conn = {conn: core for core, conn in enumerate(conns)}
+
+        # Workerlar tayyor bo'lishini kutish (spawn sekin) va releaselarni boshlash
+        for conn in conns:
+            conn.send((-1, None, 0.0))
+        for conn in conns:
+            conn.recv()
+        start = time.monotonic()
+        for task in self.tasks.values():
+            heapq.heappush(self._timers, (start + task.offset, next(self._seq), task))
+
+        end = start + duration
+        try:
+            while True:
+                now = time.monotonic()
+                if now >= end:
+                    break
+                self._release_due(now)
+                self._dispatch(conns, flags)
+                timeout = min(self._timers[0][0] if self._timers else end, end) - time.monotonic()
+                for conn in wait(conns, timeout=max(timeout, 0.0)):
+                    self._on_message(by_conn[conn], conn.recv())
+        finally:
+            # Ishlayotgan ishlarni to'xtatish va workerlarni yopish
+            for core in range(self.cores):
+                flags[core] = 1
+            for core, conn in enumerate(conns):
+                if self._running[core] is not None:
+                    self._on_message(core, conn.recv())
+                conn.send(None)
+            for process in processes:
+                process.join(timeout=5)
+            self.elapsed = time.monotonic() - start
+
+    def missed(self):
+        return sum(stats.missed for stats in self.task_stats.values())
+
+
+def format_multicore(executor):
+    """Yadrolar va deadline statistikasini formatlash"""
+    elapsed = executor.elapsed or 1.0
+    released = sum(s.released for s in executor.task_stats.values())
+    completed = sum(s.completed for s in executor.task_stats.values())
+    lines = [
+        f"📊 {executor.policy.upper()} EDF: {executor.cores} yadro, {len(executor.tasks)} vazifa, "
+        f"{executor.elapsed:.2f} s",
+        f"   Ishlar: {released} release, {completed} tugadi, {executor.missed()} deadline buzildi",
+        f"{'yadro':>8}{'bandlik':>10}{'ishlar':>9}{'preempt':>9}{'migratsiya':>12}",
+    ]
+    for core, stats in enumerate(executor.core_stats):
+        lines.append(
+            f"{core:>8}{stats.busy / elapsed * 100:>9.1f}%{stats.jobs:>9}"
+            f"{stats.preemptions:>9}{stats.migrations:>12}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ko'p yadroli EDF (partitioned / global)")
+    parser.add_argument("--policy", choices=MULTICORE_POLICIES, default=GLOBAL)
+    parser.add_argument("--cores", type=int, default=os.cpu_count())
+    parser.add_argument("--tasks", type=int, default=20, help="Tasodifiy vazifalar soni")
+    parser.add_argument("--utilization", type=float, default=None, help="Umumiy yuklama (standart: 0.7 * yadrolar)")
+    parser.add_argument("--period-min", type=float, default=0.02)
+    parser.add_argument("--period-max", type=float, default=0.2)
+    parser.add_argument("--heuristic", choices=(FIRST_FIT, WORST_FIT), default=WORST_FIT)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    utilization = args.utilization if args.utilization is not None else 0.7 * args.cores
+    tasks = generate_tasks(args.tasks, utilization, args.period_min, args.period_max, args.seed)
+    try:
+        executor = MulticoreExecutor(tasks, args.cores, args.policy, args.heuristic)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    print("=" * 60)
+    print(f"🚀 {args.policy} EDF: {args.cores} yadro, {args.tasks} vazifa, U = {utilization:.2f}")
+    if executor.assignment is not None:
+        loads = [0.0] * args.cores
+        for task in tasks:
+            loads[executor.assignment[task.name]] += task.utilization
+        print(f"📦 Bin-packing ({args.heuristic}): yadro yuklamalari {[round(load, 2) for load in loads]}")
+    print("=" * 60)
+    executor.run(args.duration)
+    print(format_multicore(executor))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Real vaqt rejalashtiruvchisi (scheduler): EDF va Rate-Monotonic
+Davriy (periodic) va sporadik (sporadic) vazifalar, preemption, release jitter va
+deadline o'tkazib yuborish statistikasi.
+
+    - Vaqt monoton soat (time.monotonic) bo'yicha o'lchanadi, time.sleep(1) yo'q
+    - Run queue va taymer navbati - heapq (har bir amal O(log n)), o'n minglab
+      vazifalar bilan ham chiziqli qidiruv bo'lmaydi
+    - Preemption kooperativ: vazifa funksiyasi generator bo'lsa, har bir `yield`
+      preemption nuqtasi - shu joyda yuqori prioritetli ish navbatga chiqsa,
+      joriy ish to'xtatilib navbatga qaytariladi. Oddiy funksiya bitta bo'lakda
+      (preemptionsiz) bajariladi.
+
+Misol:
+    scheduler = Scheduler(policy="edf")
+    scheduler.add(Task("sensor", period=0.010, wcet=0.002))
+    scheduler.add(Task("alarm", period=0.050, wcet=0.001, kind=SPORADIC))
+    scheduler.trigger("alarm")
+    scheduler.run(duration=5)
+    print(format_stats(scheduler))
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+PERIODIC = "periodic"
+SPORADIC = "sporadic"
+
+EDF = "edf"
+RM = "rm"
+POLICIES = (EDF, RM)
+
+BUSY_SLICE = 0.0005     # Sintetik yuklamaning bitta bo'lagi (soniya)
+
+
+def busy_work(seconds, slice_=BUSY_SLICE):
+    """
+    Sintetik CPU yuklamasi (generator): `seconds` davomida band bo'ladi,
+    har `slice_` soniyada preemption nuqtasi beradi
+    """
+    end = time.monotonic() + seconds
+    while True:
+        stop = min(end, time.monotonic() + slice_)
+        while time.monotonic() < stop:
+            pass
+        if stop >= end:
+            return
+        yield
+
+
+class Task:
+    """
+    Real vaqt vazifasi
+    Args:
+        name: Vazifa nomi
+        period: Davr (sporadik vazifa uchun - eng kichik kelish oralig'i), soniya
+        wcet: Eng yomon bajarilish vaqti (Worst-Case Execution Time), soniya
+        deadline: Nisbiy deadline (standart - davrga teng)
+        func: Ish funksiyasi; None bo'lsa wcet davomida sintetik yuklama
+        kind: PERIODIC yoki SPORADIC
+        offset: Birinchi release siljishi (faqat davriy vazifalar uchun)
+    """
+
+    __slots__ = ("name", "period", "wcet", "deadline", "func", "kind", "offset", "active", "stats", "last_release")
+
+    def __init__(self, name, period, wcet, deadline=None, func=None, kind=PERIODIC, offset=0.0):
+        if period <= 0 or wcet < 0:
+            raise ValueError(f"{name}: period > 0 va wcet >= 0 bo'lishi kerak")
+        if kind not in (PERIODIC, SPORADIC):
+            raise ValueError(f"{name}: noma'lum vazifa turi: {kind}")
+        self.name = name
+        self.period = period
+        self.wcet = wcet
+        self.deadline = period if deadline is None else deadline
+        self.func = func
+        self.kind = kind
+        self.offset = offset
+        self.active = True
+        self.stats = TaskStats()
+        self.last_release = None
+
+    @property
+    def utilization(self):
+        """Vazifaning protsessor ulushi: C / T"""
+        return self.wcet / self.period
+
+    def __repr__(self):
+        return f"Task({self.name!r}, T={self.period}, C={self.wcet}, D={self.deadline}, {self.kind})"
+
+
+class TaskStats:
+    """
+    Vazifa statistikasi: release, bajarilish, deadline o'tkazib yuborish,
+    preemption, release jitter va javob vaqti (response time)
+    """
+
+    __slots__ = (
+        "released", "completed", "missed", "preempted", "overruns",
+        "jitter_sum", "jitter_max", "response_sum", "response_max",
+    )
+
+    def __init__(self):
+        self.released = 0
+        self.completed = 0
+        self.missed = 0
+        self.preempted = 0
+        self.overruns = 0       # Bajarilish vaqti wcet dan oshgan ishlar
+        self.jitter_sum = 0.0
+        self.jitter_max = 0.0
+        self.response_sum = 0.0
+        self.response_max = 0.0
+
+    def record_start(self, jitter):
+        self.jitter_sum += jitter
+        if jitter > self.jitter_max:
+            self.jitter_max = jitter
+
+    def record_finish(self, response, missed, overrun):
+        self.completed += 1
+        self.response_sum += response
+        if response > self.response_max:
+            self.response_max = response
+        if missed:
+            self.missed += 1
+        if overrun:
+            self.overruns += 1
+
+    def summary(self):
+        """Statistika dict ko'rinishida (vaqtlar millisekundlarda)"""
+        completed = self.completed or 1
+        return {
+            "released": self.released,
+            "completed": self.completed,
+            "missed": self.missed,
+            "miss_ratio": round(self.missed / completed, 4) if self.completed else 0.0,
+            "preempted": self.preempted,
+            "overruns": self.overruns,
+            "jitter_avg_ms": round(self.jitter_sum / completed * 1000, 3),
+            "jitter_max_ms": round(self.jitter_max * 1000, 3),
+            "response_avg_ms": round(self.response_sum / completed * 1000, 3),
+            "response_max_ms": round(self.response_max * 1000, 3),
+        }
+
+
+class Job:
+    """
+    Vazifaning bitta ishi (job): release vaqti, mutlaq deadline va bajarilish holati
+    """
+
+    __slots__ = ("task", "release", "deadline", "seq", "started", "executed", "runner")
+
+    def __init__(self, task, release, seq):
+        self.task = task
+        self.release = release
+        self.deadline = release + task.deadline     # Mutlaq deadline
+        self.seq = seq
+        self.started = None
+        self.executed = 0.0     # Sarflangan protsessor vaqti
+        self.runner = None      # Generator (preemption nuqtalari bilan)
+
+    def priority(self, policy):
+        """Run queue kaliti: EDF - mutlaq deadline, RM - davr (statik prioritet)"""
+        if policy == EDF:
+            return self.deadline
+        return self.task.period
+
+    def step(self):
+        """
+        Bitta bo'lakni bajarish (keyingi preemption nuqtasigacha)
+        Returns:
+            bool: Ish tugagan bo'lsa True
+        """
+        if self.runner is None:
+            task = self.task
+            result = task.func() if task.func is not None else busy_work(task.wcet)
+            if not hasattr(result, "__next__"):
+                return True
+            self.runner = result
+        try:
+            next(self.runner)
+        except StopIteration:
+            return True
+        return False
+
+
+class Scheduler:
+    """
+    EDF / Rate-Monotonic rejalashtiruvchi
+    Args:
+        policy: EDF yoki RM
+        clock: Monoton soat funksiyasi
+    """
+
+    def __init__(self, policy=EDF, clock=time.monotonic):
+        if policy not in POLICIES:
+            raise ValueError(f"Noma'lum siyosat: {policy} (mavjud: {', '.join(POLICIES)})")
+        self.policy = policy
+        self.clock = clock
+        self.tasks = {}
+        self.switches = 0           # Kontekst almashishlari soni
+        self.idle_time = 0.0
+        self.busy_time = 0.0
+        self._run_queue = []        # (prioritet, seq, Job)
+        self._timers = []           # (release vaqti, seq, Task)
+        self._seq = itertools.count()
+        self._triggers = deque()    # Boshqa threadlardan kelgan sporadik release so'rovlari
+        self._wakeup = threading.Event()
+        self._running = False
+        self._current = None
+        self._start = None
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def add(self, task, start=None):
+        """
+        Vazifani qo'shish; davriy vazifaning birinchi releasi start + offset da
+        """
+        if task.name in self.tasks:
+            raise ValueError(f"Vazifa allaqachon mavjud: {task.name}")
+        self.tasks[task.name] = task
+        task.active = True
+        if task.kind == PERIODIC:
+            if start is None:
+                start = self._start if self._start is not None else self.clock()
+            heapq.heappush(self._timers, (start + task.offset, next(self._seq), task))
+        return task
+
+    def remove(self, name):
+        """Vazifani o'chirish (navbatdagi yozuvlari keyin o'tkazib yuboriladi)"""
+        task = self.tasks.pop(name)
+        task.active = False
+        return task
+
+    def trigger(self, name):
+        """
+        Sporadik vazifani ishga tushirish (istalgan threaddan chaqirish mumkin)
+        Eng kichik kelish oralig'i buzilsa, release shu oraliq tugashiga suriladi.
+        """
+        self._triggers.append((name, self.clock()))
+        self._wakeup.set()
+
+    def _release(self, task, release):
+        """Yangi ishni run queue ga qo'yish"""
+        task.last_release = release
+        task.stats.released += 1
+        job = Job(task, release, next(self._seq))
+        heapq.heappush(self._run_queue, (job.priority(self.policy), job.seq, job))
+
+    def _release_due(self, now):
+        """Vaqti kelgan barcha releaselarni bajarish"""
+        while self._triggers:
+            name, at = self._triggers.popleft()
+            task = self.tasks.get(name)
+            if task is None or task.kind != SPORADIC:
+                continue
+            if task.last_release is not None:
+                at = max(at, task.last_release + task.period)
+            task.last_release = at      # Keyingi trigger shu vaqtdan hisoblanadi
+            heapq.heappush(self._timers, (at, next(self._seq), task))
+
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            release, _, task = heapq.heappop(timers)
+            if not task.active:
+                continue
+            self._release(task, release)
+            if task.kind == PERIODIC:
+                # Keyingi release rejalashtirilgan vaqtdan hisoblanadi - siljish (drift) yo'q
+                heapq.heappush(timers, (release + task.period, next(self._seq), task))
+
+    def _finish(self, job, now):
+        task = job.task
+        task.stats.record_finish(
+            now - job.release,
+            now > job.deadline,
+            job.executed > task.wcet,
+        )
+
+    def step(self):
+        """
+        Bitta rejalashtirish qadami: releaselar, eng yuqori prioritetli ishni tanlash
+        va uni keyingi preemption nuqtasigacha bajarish
+        Returns:
+            bool: Bajarilgan ish bo'lsa True, protsessor bo'sh bo'lsa False
+        """
+        now = self.clock()
+        self._release_due(now)
+        run_queue = self._run_queue
+        if not run_queue:
+            return False
+
+        _, _, job = heapq.heappop(run_queue)
+        current = self._current
+        if job is not current:
+            self.switches += 1
+            if current is not None:
+                # Oldingi ish tugamagan va navbatda qoldi - u preemption qilindi
+                current.task.stats.preempted += 1
+            self._current = job
+        if job.started is None:
+            job.started = now
+            job.task.stats.record_start(now - job.release)
+
+        done = job.step()
+        end = self.clock()
+        job.executed += end - now
+        self.busy_time += end - now
+        if done:
+            self._current = None
+            self._finish(job, end)
+        else:
+            heapq.heappush(run_queue, (job.priority(self.policy), job.seq, job))
+        return True
+
+    def next_release(self):
+        """Eng yaqin release vaqti (yo'q bo'lsa None)"""
+        timers = self._timers
+        while timers and not timers[0][2].active:
+            heapq.heappop(timers)
+        return timers[0][0] if timers else None
+
+    def run(self, duration=None):
+        """
+        Rejalashtiruvchini ishga tushirish
+        Args:
+            duration: Ishlash davomiyligi (soniya); None - stop() chaqirilguncha
+        """
+        self._running = True
+        self._start = self.clock()
+        deadline = None if duration is None else self._start + duration
+        try:
+            while self._running:
+                if deadline is not None and self.clock() >= deadline:
+                    break
+                if self.step():
+                    continue
+
+                # Protsessor bo'sh: keyingi release yoki trigger gacha kutish
+                now = self.clock()
+                wake = self.next_release()
+                if deadline is not None:
+                    wake = deadline if wake is None else min(wake, deadline)
+                timeout = None if wake is None else max(wake - now, 0.0)
+                self._wakeup.wait(timeout)
+                self._wakeup.clear()
+                self.idle_time += self.clock() - now
+        finally:
+            self._running = False
+
+    def stop(self):
+        """Rejalashtiruvchini to'xtatish (istalgan threaddan)"""
+        self._running = False
+        self._wakeup.set()
+
+    def stats(self):
+        """Barcha vazifalar statistikasi"""
+        return {name: task.stats.summary() for name, task in self.tasks.items()}
+
+
+def format_stats(scheduler):
+    """Statistikani jadval ko'rinishida formatlash"""
+    lines = [
+        f"📊 Siyosat: {scheduler.policy.upper()}, vazifalar: {len(scheduler)}, "
+        f"kontekst almashishlari: {scheduler.switches}",
+        f"{'vazifa':<20}{'release':>9}{'tugadi':>9}{'miss':>7}{'preempt':>9}"
+        f"{'jitter avg/max ms':>20}{'javob avg/max ms':>20}",
+    ]
+    for name, task in scheduler.tasks.items():
+        s = task.stats.summary()
+        lines.append(
+            f"{name:<20}{s['released']:>9}{s['completed']:>9}{s['missed']:>7}{s['preempted']:>9}"
+            f"{s['jitter_avg_ms']:>11.3f}/{s['jitter_max_ms']:<8.3f}"
+            f"{s['response_avg_ms']:>11.3f}/{s['response_max_ms']:<8.3f}"
+        )
+    total = scheduler.busy_time + scheduler.idle_time
+    if total:
+        lines.append(f"⚙️  Protsessor bandligi: {scheduler.busy_time / total * 100:.1f}%")
+    return "\n".join(lines)
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Diskret hodisali (discrete-event) rejalashtirish simulyatori
+Virtual vaqt hodisadan hodisaga sakrab o'tadi (release yoki ish tugashi) - hech
+qanday kutish (sleep) yo'q. Preemption aniq: yuqori prioritetli ish release
+bo'lgan onda joriy ish to'xtatiladi. Har bir hodisa O(log n) (heapq).
+Narx ishlar soniga bog'liq (~250 ming ish/soniya): 10 000 vazifa, davrlar
+1-100 s, 1 virtual soat - 7.7M ish, ~30 s. Standart davrlar (0.01-10 s) bilan
+xuddi shu to'plam virtual soniyasiga ~145 ming ish beradi (soatiga ~520M ish).
+RM javob vaqti tahlili O(n^2): 1000 vazifa ~1 s, 3000 vazifa ~11 s - shuning
+uchun RTA_LIMIT dan ko'p vazifada u faqat --rta bilan bajariladi.
+
+    python simulator.py --tasks 10000 --utilization 0.9 --hours 1 --period-min 1 --period-max 100
+    python simulator.py --tasks 5 --utilization 0.95 --policy rm --timeline 0.5
+    python simulator.py --tasks 5000 --policy rm --no-sim --rta
+    python simulator.py --check
+
+Jonli Scheduler (scheduler.py) bilan bir xil Task obyektlaridan foydalanadi;
+sporadik vazifa eng kichik kelish oralig'i bilan davriy deb olinadi (eng yomon holat).
+"""
+
+import argparse
+import heapq
+import math
+import random
+import time
+
+from analysis import analyze, format_report
+from scheduler import EDF, POLICIES, RM, Task
+
+TIMELINE_LIMIT = 100_000        # Saqlanadigan timeline bo'laklarining maksimal soni
+RTA_LIMIT = 1000                # Bundan ko'p vazifada RTA (O(n^2)) faqat --rta bilan bajariladi
+
+
+class SimStats:
+    """
+    Simulyatsiya natijasi: vazifalar bo'yicha hisoblagichlar (indeks bo'yicha ro'yxatlar)
+    """
+
+    def __init__(self, tasks, policy, horizon):
+        n = len(tasks)
+        self.tasks = tasks
+        self.policy = policy
+        self.horizon = horizon
+        self.released = [0] * n
+        self.completed = [0] * n
+        self.missed = [0] * n
+        self.preempted = [0] * n
+        self.response_max = [0.0] * n
+        self.busy = 0.0
+        self.events = 0
+        self.timeline = []          # (boshlanish, tugash, vazifa indeksi)
+        self.elapsed = 0.0          # Haqiqiy (devor soati) simulyatsiya vaqti
+
+    @property
+    def total_missed(self):
+        return sum(self.missed)
+
+    def summary(self, name):
+        """Bitta vazifa statistikasi"""
+        i = next(i for i, task in enumerate(self.tasks) if task.name == name)
+        return {
+            "released": self.released[i],
+            "completed": self.completed[i],
+            "missed": self.missed[i],
+            "preempted": self.preempted[i],
+            "response_max_ms": round(self.response_max[i] * 1000, 3),
+        }
+
+
+def simulate(tasks, policy=EDF, horizon=60.0, timeline=0.0):
+    """
+    Vazifalar to'plamini virtual vaqtda simulyatsiya qilish
+    Args:
+        tasks: Task ro'yxati
+        policy: EDF yoki RM
+        horizon: Simulyatsiya davomiyligi (virtual soniya)
+        timeline: Boshidan shuncha soniyalik bajarilish bo'laklarini saqlash
+    Returns:
+        SimStats
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Noma'lum siyosat: {policy}")
+    tasks = list(tasks)
+    stats = SimStats(tasks, policy, horizon)
+    periods = [task.period for task in tasks]
+    wcets = [task.wcet for task in tasks]
+    deadlines = [task.deadline for task in tasks]
+    released, completed, missed = stats.released, stats.completed, stats.missed
+    preempted, response_max = stats.preempted, stats.response_max
+    segments = stats.timeline
+    rm = policy == RM
+
+    # Taymer: (release vaqti, vazifa indeksi); run queue: (kalit, seq, ish)
+    # Ish - ro'yxat: [qolgan vaqt, mutlaq deadline, release, vazifa indeksi]
+    timers = [(task.offset, i) for i, task in enumerate(tasks) if task.offset < horizon]
+    heapq.heapify(timers)
+    run_queue = []
+    seq = 0
+    now = 0.0
+    busy = 0.0
+    events = 0
+    current = None      # Oxirgi bajarilgan (tugamagan) ish
+    heappush, heappop, heapreplace = heapq.heappush, heapq.heappop, heapq.heapreplace
+    started = time.perf_counter()
+
+    while True:
+        next_release = timers[0][0] if timers else math.inf
+        if run_queue:
+            job = run_queue[0][2]
+            if job is not current:
+                if current is not None and current[0] > 0:
+                    preempted[current[3]] += 1
+                current = job
+            finish = now + job[0]
+            end = min(finish, next_release, horizon)
+            if timeline and now < min(end, timeline) and len(segments) < TIMELINE_LIMIT:
+                segments.append((now, min(end, timeline), job[3]))
+            busy += end - now
+            if finish <= end:
+                # Ish tugadi - shu ondagi releaselar keyingi ish tanlanishidan oldin
+                # qo'shiladi (aks holda past prioritetli ish nol uzunlikdagi bo'lak olib,
+                # preemption sifatida hisoblanardi)
+                heappop(run_queue)
+                job[0] = 0.0
+                index = job[3]
+                completed[index] += 1
+                response = finish - job[2]
+                if response > response_max[index]:
+                    response_max[index] = response
+                if finish > job[1] + 1e-12:
+                    missed[index] += 1
+                current = None
+                now = finish
+                events += 1
+            else:
+                job[0] = finish - end
+                now = end
+        else:
+            now = next_release
+        if now >= horizon:
+            break
+
+        # Vaqti kelgan releaselar
+        while timers and timers[0][0] <= now:
+            release, index = timers[0]
+            released[index] += 1
+            deadline = release + deadlines[index]
+            heappush(run_queue, (periods[index] if rm else deadline, seq, [wcets[index], deadline, release, index]))
+            seq += 1
+            events += 1
+            nxt = release + periods[index]
+            if nxt < horizon:
+                heapreplace(timers, (nxt, index))      # pop + push bitta amalda
+            else:
+                heappop(timers)
+
+    # Gorizont oxirida deadline i o'tib ketgan, tugamagan ishlar ham o'tkazib yuborilgan
+    for _, _, job in run_queue:
+        if job[1] < horizon:
+            missed[job[3]] += 1
+
+    stats.busy = busy
+    stats.events = events
+    stats.elapsed = time.perf_counter() - started
+    return stats
+
+
+def generate_tasks(count, utilization, period_min=0.01, period_max=10.0, seed=1):
+    """
+    Tasodifiy vazifalar to'plami (UUniFast): yuklamalar yig'indisi = utilization,
+    davrlar [period_min, period_max] oralig'ida log-tekis taqsimlangan
+    """
+    rng = random.Random(seed)
+    shares = []
+    remaining = utilization
+    for i in range(1, count):
+        next_remaining = remaining * rng.random() ** (1 / (count - i))
+        shares.append(remaining - next_remaining)
+        remaining = next_remaining
+    shares.append(remaining)
+
+    log_min, log_max = math.log(period_min), math.log(period_max)
+    tasks = []
+    for i, share in enumerate(shares):
+        period = round(math.exp(rng.uniform(log_min, log_max)), 6)
+        tasks.append(Task(f"task_{i}", period=period, wcet=share * period))
+    return tasks
+
+
+def format_timeline(stats, until, width=80, limit=20):
+    """
+    Timeline ni matnli Gantt diagrammasi ko'rinishida chizish
+    Har bir qator - vazifa, har bir ustun - until / width soniya.
+    """
+    used = sorted({index for _, _, index in stats.timeline})[:limit]
+    if not used:
+        return "📉 Timeline bo'sh"
+    rows = {index: [" "] * width for index in used}
+    scale = width / until
+    for start, end, index in stats.timeline:
+        row = rows.get(index)
+        if row is None:
+            continue
+        first = int(start * scale)
+        last = max(first + 1, math.ceil(end * scale))
+        for column in range(first, min(last, width)):
+            row[column] = "█"
+    name_width = max(len(stats.tasks[index].name) for index in used)
+    lines = [f"🕒 Timeline: 0 - {until * 1000:.1f} ms (1 belgi = {until / width * 1000:.2f} ms)"]
+    for index in used:
+        lines.append(f"{stats.tasks[index].name:<{name_width}} |{''.join(rows[index])}|")
+    return "\n".join(lines)
+
+
+def format_sim(stats, limit=10):
+    """Simulyatsiya natijasini formatlash (eng ko'p deadline buzgan vazifalar)"""
+    released = sum(stats.released)
+    missed = stats.total_missed
+    lines = [
+        f"🧪 Simulyatsiya: {stats.policy.upper()}, {len(stats.tasks)} ta vazifa, "
+        f"{stats.horizon:.0f} virtual soniya, {stats.elapsed:.2f} s da",
+        f"   Hodisalar: {stats.events}, ishlar: {released}, deadline buzilgan: {missed}"
+        f" ({missed / released * 100 if released else 0:.3f}%)",
+        f"   Protsessor bandligi: {stats.busy / stats.horizon * 100:.1f}%",
+    ]
+    worst = sorted(range(len(stats.tasks)), key=lambda i: -stats.missed[i])[:limit]
+    for i in worst:
+        if not stats.missed[i]:
+            break
+        task = stats.tasks[i]
+        lines.append(
+            f"   ⏰ {task.name}: {stats.missed[i]}/{stats.released[i]} buzilgan, "
+            f"T = {task.period * 1000:.3f} ms, max javob {stats.response_max[i] * 1000:.3f} ms"
+        )
+    return "\n".join(lines)
+
+
+def check():
+    """
+    Ma'lum jadvallar bilan solishtirish (regressiya tekshiruvi)
+    Returns:
+        bool: Hammasi mos
+    """
+    ok = True
+    # Ish tugagan ondagi release: C nol uzunlikdagi bo'lak olmasligi, faqat t = 2 da uzilishi kerak
+    stats = simulate([Task("A", 1, 0.5), Task("B", 2, 0.5), Task("C", 4, 1)], RM, horizon=4, timeline=4)
+    expected = [(0.0, 0.5, 0), (0.5, 1.0, 1), (1.0, 1.5, 0), (1.5, 2.0, 2),
+                (2.0, 2.5, 0), (2.5, 3.0, 1), (3.0, 3.5, 0), (3.5, 4.0, 2)]
+    for name, got, want in (
+        ("preempted", stats.preempted, [0, 0, 1]),
+        ("completed", stats.completed, [4, 2, 1]),
+        ("missed", stats.missed, [0, 0, 0]),
+        ("timeline", stats.timeline, expected),
+    ):
+        if got != want:
+            print(f"❌ RM A/B/C {name}: {got} (kutilgan {want})")
+            ok = False
+    print("✅ Regressiya tekshiruvi o'tdi" if ok else "❌ Regressiya tekshiruvi o'tmadi")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejalashtirish tahlili va diskret hodisali simulyatsiya")
+    parser.add_argument("--tasks", type=int, default=1000, help="Tasodifiy vazifalar soni")
+    parser.add_argument("--utilization", type=float, default=0.9, help="Umumiy yuklama U")
+    parser.add_argument("--period-min", type=float, default=0.01, help="Eng qisqa davr (soniya)")
+    parser.add_argument("--period-max", type=float, default=10.0, help="Eng uzun davr (soniya)")
+    parser.add_argument("--policy", choices=POLICIES, default=EDF)
+    parser.add_argument("--hours", type=float, default=1.0, help="Simulyatsiya davomiyligi (virtual soat)")
+    parser.add_argument("--timeline", type=float, default=0.0, help="Boshidan shuncha soniyani Gantt ko'rinishida chiqarish")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--no-sim", action="store_true", help="Faqat tahlil (simulyatsiyasiz)")
+    parser.add_argument("--rta", action="store_true", help=f"RTA ni {RTA_LIMIT} dan ko'p vazifada ham bajarish")
+    parser.add_argument("--check", action="store_true", help="Regressiya tekshiruvi (ma'lum jadvallar)")
+    args = parser.parse_args()
+    if args.check:
+        raise SystemExit(0 if check() else 1)
+
+    tasks = generate_tasks(args.tasks, args.utilization, args.period_min, args.period_max, args.seed)
+    print("=" * 60)
+    rta = args.rta or len(tasks) <= RTA_LIMIT
+    report = analyze(tasks, args.policy, rta=rta)
+    print(format_report(report))
+    if not rta and report.schedulable is None:
+        print(f"   ⚠️  RTA o'tkazib yuborildi ({len(tasks)} > {RTA_LIMIT} vazifa), yoqish uchun: --rta")
+    if args.no_sim:
+        return
+
+    print("-" * 60)
+    stats = simulate(tasks, args.policy, horizon=args.hours * 3600, timeline=args.timeline)
+    print(format_sim(stats))
+    if args.timeline:
+        print(format_timeline(stats, args.timeline))
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,22 @@
+import sys
+from pathlib import Path
+
 import psutil
 from collections import deque
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 from matplotlib.animation import FuncAnimation
 import datetime as dt
 
-max_points = 30
-cpu_data = deque(maxlen=max_points)
-ram_data = deque(maxlen=max_points)
-timestamps = deque(maxlen=max_points)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))   # Umumiy modullar (downsample.py)
+from downsample import downsample, take
+
+max_points = 30             # Shundan kam bo'lsa nuqtalar markerlar bilan
+history_points = 5400       # Saqlanadigan tarix: 3 soat (har 2 soniyada)
+method = "minmax"           # Kamaytirish usuli: minmax yoki lttb
+cpu_data = deque(maxlen=history_points)
+ram_data = deque(maxlen=history_points)
+timestamps = deque(maxlen=history_points)
 
 fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(9,6))
 fig.tight_layout(pad=3.0)
@@ -29,20 +38,31 @@ ax2.set_xlabel("Vaqt")
 ax1.legend(loc="upper right")
 ax2.legend(loc="upper right")
 
+for ax in (ax1, ax2):
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%H:%M:%S"))
+
+def plot_series(ax, line, values):
+    """Seriyani o'q kengligiga (piksel) kamaytirib chizish - tarix uzunligi chizish narxiga ta'sir qilmaydi"""
+    width = ax.get_window_extent().width
+    indices = downsample(values, width, method=method)
+    line.set_data(take(timestamps, indices), take(values, indices))
+    line.set_marker("o" if len(indices) <= max_points else "")
+
 def update(frame):
     cpu = psutil.cpu_percent(interval=0.1)
     ram = psutil.virtual_memory().percent
-    t = dt.datetime.now().strftime("%H:%M:%S")
+    t = dt.datetime.now()
 
     cpu_data.append(cpu)
     ram_data.append(ram)
     timestamps.append(t)
 
-    cpu_line.set_data(timestamps, cpu_data)
-    ram_line.set_data(timestamps, ram_data)
+    plot_series(ax1, cpu_line, cpu_data)
+    plot_series(ax2, ram_line, ram_data)
 
-    ax1.set_xlim(timestamps[0], timestamps[-1])
-    ax2.set_xlim(timestamps[0], timestamps[-1])
+    if len(timestamps) > 1:
+        ax1.set_xlim(timestamps[0], timestamps[-1])
+        ax2.set_xlim(timestamps[0], timestamps[-1])
 
     return cpu_line, ram_line
 
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+SMTP yetkazib berish benchmarki (lokal stand-in server bilan)
+Eski usul (har bir xabar uchun yangi ulanish, threadpool) va DeliveryPool
+solishtiriladi. Server shu jarayonda ishga tushadi - haqiqiy pochta yuborilmaydi.
+
+    python bench_mailer.py --messages 1000 --pool 4
+    python bench_mailer.py --messages 500 --drop-every 50     # uzilish va qayta ulanish
+"""
+
+import argparse
+import asyncio
+import smtplib
+import time
+
+from mailer import DeliveryPool, SMTPConfig, build_message
+from smtp_stub import StubSMTPServer
+
+
+def send_per_connection(config, msg):
+    """Eski usul: har bir xabar uchun EHLO (+ STARTTLS + LOGIN) bilan yangi ulanish"""
+    with smtplib.SMTP(config.host, config.port, timeout=config.timeout) as smtp:
+        smtp.ehlo()
+        if config.user:
+            smtp.login(config.user, config.password)
+        smtp.send_message(msg)
+
+
+async def bench_per_connection(config, messages, workers):
+    """Bir vaqtda `workers` ta thread (BackgroundTasks threadpool kabi)"""
+    semaphore = asyncio.Semaphore(workers)
+
+    async def one(msg):
+        async with semaphore:
+            await asyncio.to_thread(send_per_connection, config, msg)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(msg) for msg in messages))
+    return time.perf_counter() - started
+
+
+async def bench_pool(config, messages, size, queue_size):
+    """DeliveryPool: doimiy ulanishlar, cheklangan navbat (backpressure)"""
+    pool = DeliveryPool(config, size=size, queue_size=queue_size, retry_delay=0.05)
+    pool.start()
+    started = time.perf_counter()
+    futures = [await pool.submit(msg) for msg in messages]
+    results = await asyncio.gather(*futures, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    await pool.stop()
+    failed = sum(1 for result in results if isinstance(result, Exception))
+    return elapsed, failed, pool.stats()
+
+
+async def run(args):
+    async with StubSMTPServer(port=0, drop_every=args.drop_every) as server:
+        config = SMTPConfig("127.0.0.1", server.port, user="bench", password="bench",
+                            from_email="bench@example.com", starttls=False)
+        messages = [
+            build_message(config, f"user{i}@example.com", f"Benchmark #{i}", "Salom! " * 20)
+            for i in range(args.messages)
+        ]
+
+        print("=" * 60)
+        print(f"📮 {args.messages} ta xabar, stand-in server 127.0.0.1:{server.port}")
+        print("=" * 60)
+
+        if not args.drop_every:
+            before = server.connections
+            elapsed = await bench_per_connection(config, messages, args.pool)
+            print(f"🐢 Har xabarga ulanish: {elapsed:.2f} s, {args.messages / elapsed:.0f} xabar/s, "
+                  f"{server.connections - before} ulanish")
+
+        before = server.connections
+        elapsed, failed, stats = await bench_pool(config, messages, args.pool, args.queue)
+        print(f"🚀 DeliveryPool ({args.pool} ulanish): {elapsed:.2f} s, {args.messages / elapsed:.0f} xabar/s, "
+              f"{server.connections - before} ulanish, {stats['retries']} qayta urinish, {failed} xato")
+        print(f"📬 Server qabul qildi: {server.received} xabar")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SMTP yetkazib berish benchmarki")
+    parser.add_argument("--messages", type=int, default=1000)
+    parser.add_argument("--pool", type=int, default=4, help="Ulanishlar (threadlar) soni")
+    parser.add_argument("--queue", type=int, default=100, help="Pool navbati hajmi")
+    parser.add_argument("--drop-every", type=int, default=0, help="Server har N xabarda ulanishni uzadi")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
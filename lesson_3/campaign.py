@@ -0,0 +1,209 @@
+"""
+Ommaviy yuborish (kampaniya) yordamchilari
+    - CampaignTemplate: Jinja mavzu va matn shablonlari bir marta kompilyatsiya
+      qilinadi, har bir qabul qiluvchi uchun faqat render qilinadi
+    - AddressValidator: validate_email natijalari LRU keshda saqlanadi, DNS
+      javoblari esa domen bo'yicha keshlanadi (bir domendagi minglab manzil
+      uchun bitta MX so'rovi)
+    - iter_json / iter_csv: qabul qiluvchilarni ro'yxat yoki CSV fayldan
+      birma-bir o'qish (hammasi xotiraga yuklanmaydi)
+
+Xabarlar navbatga render qilinmasdan (email + shablon o'zgaruvchilari) yoziladi,
+EmailMessage esa faqat dispetcher yuborish uchun olganda yaratiladi.
+"""
+
+import csv
+import io
+import threading
+from collections import OrderedDict
+from itertools import islice
+
+from email_validator import EmailNotValidError, caching_resolver, validate_email
+from jinja2 import StrictUndefined, TemplateError
+from jinja2.sandbox import SandboxedEnvironment
+
+CHUNK_SIZE = 1000           # Bir tranzaksiyada navbatga yoziladigan qabul qiluvchilar
+VALIDATION_CACHE = 100_000  # Keshda saqlanadigan tekshirilgan manzillar soni
+TEMPLATE_CACHE = 32         # Dispetcher keshidagi kompilyatsiya qilingan shablonlar
+DNS_TIMEOUT = 5             # MX so'rovi timeout (soniya)
+
+# Foydalanuvchi shablonlari sandbox da bajariladi; aniqlanmagan o'zgaruvchi - xato
+_environment = SandboxedEnvironment(undefined=StrictUndefined, autoescape=False, keep_trailing_newline=True)
+
+
+class RenderError(ValueError):
+    """Shablon xatosi (sintaksis yoki yetishmayotgan o'zgaruvchi) - qayta urinish befoyda"""
+
+
+class LRUCache:
+    """
+    Oddiy LRU kesh (OrderedDict asosida; event loop va worker threaddan ishlatiladi)
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self.data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self.data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self.data[key] = value
+            self.data.move_to_end(key)
+            if len(self.data) > self.size:
+                self.data.popitem(last=False)
+
+
+class CampaignTemplate:
+    """
+    Mavzu va matn shablonlari (bir marta kompilyatsiya qilinadi)
+    Raises:
+        RenderError: Shablon sintaksisi noto'g'ri
+    """
+
+    def __init__(self, subject, body):
+        self.source = (subject, body)
+        try:
+            self.subject = _environment.from_string(subject)
+            self.body = _environment.from_string(body)
+        except TemplateError as e:
+            raise RenderError(f"Shablon xatosi: {e}") from None
+
+    def render(self, context):
+        """
+        Returns:
+            tuple: (mavzu, matn)
+        Raises:
+            RenderError: O'zgaruvchi yetishmaydi yoki shablon bajarilmadi
+        """
+        try:
+            subject = self.subject.render(context)
+            body = self.body.render(context)
+        except TemplateError as e:
+            raise RenderError(f"Shablon xatosi: {e}") from None
+        # Sarlavhada yangi qator bo'lishi mumkin emas
+        return " ".join(subject.split()), body
+
+
+class AddressValidator:
+    """
+    Keshli email tekshiruvi
+    Args:
+        check_deliverability: Domen MX yozuvini tekshirish (DNS javoblari keshlanadi)
+    """
+
+    def __init__(self, cache_size=VALIDATION_CACHE, check_deliverability=True, dns_timeout=DNS_TIMEOUT):
+        self.cache = LRUCache(cache_size)
+        self.check_deliverability = check_deliverability
+        self.resolver = caching_resolver(timeout=dns_timeout) if check_deliverability else None
+
+    def validate(self, email):
+        """
+        Returns:
+            str: Normallashtirilgan manzil
+        Raises:
+            EmailNotValidError: Manzil noto'g'ri
+        """
+        key = email.strip()
+        result = self.cache.get(key)
+        if result is None:
+            try:
+                info = validate_email(key, check_deliverability=self.check_deliverability,
+                                      dns_resolver=self.resolver)
+                result = (True, info.normalized)
+            except EmailNotValidError as e:
+                result = (False, str(e))
+            self.cache.put(key, result)
+        ok, value = result
+        if not ok:
+            raise EmailNotValidError(value)
+        return value
+
+    def validate_many(self, recipients):
+        """
+        Partiyani tekshirish (bloklovchi - asyncio.to_thread orqali chaqiriladi)
+        Args:
+            recipients: [(email, o'zgaruvchilar)]
+        Returns:
+            tuple: ([(normallashtirilgan email, o'zgaruvchilar)], [(email, sabab)])
+        """
+        valid, invalid = [], []
+        for email, context in recipients:
+            try:
+                valid.append((self.validate(email), context))
+            except EmailNotValidError as e:
+                invalid.append((email, str(e)))
+        return valid, invalid
+
+    def stats(self):
+        return {"cached": len(self.cache), "hits": self.cache.hits, "misses": self.cache.misses}
+
+
+def iter_json(items):
+    """
+    JSON ro'yxatdan qabul qiluvchilar: "a@b.uz" yoki {"email": "a@b.uz", "name": ...}
+    Yields:
+        tuple: (email, o'zgaruvchilar)
+    Raises:
+        ValueError: Element noto'g'ri
+    """
+    for number, item in enumerate(items, 1):
+        if isinstance(item, str):
+            yield item, {}
+        elif isinstance(item, dict) and isinstance(item.get("email"), str):
+            yield item["email"], {key: value for key, value in item.items() if key != "email"}
+        else:
+            raise ValueError(f"{number}-qabul qiluvchi noto'g'ri: email maydoni kerak")
+
+
+def iter_csv(binary_file, encoding="utf-8-sig"):
+    """
+    CSV fayldan qabul qiluvchilar (sarlavha qatorida "email" ustuni bo'lishi kerak,
+    qolgan ustunlar shablon o'zgaruvchilari bo'ladi). Fayl qatorma-qator o'qiladi.
+    Yields:
+        tuple: (email, o'zgaruvchilar)
+    Raises:
+        ValueError: "email" ustuni yo'q
+    """
+    text = io.TextIOWrapper(binary_file, encoding=encoding, newline="")
+    try:
+        reader = csv.reader(text)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [name.strip().lower() for name in header]
+        if "email" not in header:
+            raise ValueError("CSV faylda 'email' ustuni topilmadi")
+        index = header.index("email")
+        for row in reader:
+            if len(row) <= index or not row[index].strip():
+                continue
+            yield row[index], {name: value for name, value in zip(header, row) if name != "email"}
+    finally:
+        # Yuklangan faylni yopmaslik uchun (uni Starlette o'zi yopadi)
+        text.detach()
+
+
+def chunks(iterable, size=CHUNK_SIZE):
+    """Iteratorni `size` elementli ro'yxatlarga bo'lish"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
@@ -0,0 +1,306 @@
+"""
+SMTP yetkazib berish pooli
+Har bir xabar uchun yangi ulanish (EHLO + STARTTLS + LOGIN) ochish o'rniga bir
+nechta autentifikatsiyadan o'tgan doimiy ulanishlar ochiq turadi:
+
+    - har bir ulanishni bitta worker vazifasi boshqaradi (bir vaqtda cheklangan
+      sondagi yuborish - pool o'lchami)
+    - xabarlar cheklangan asyncio.Queue orqali keladi: navbat to'lsa submit()
+      kutadi (backpressure), submit_nowait() esa asyncio.QueueFull ko'taradi
+    - bo'sh turgan ulanish har KEEPALIVE soniyada NOOP bilan tekshiriladi
+    - ulanish uzilsa (server timeout, tarmoq xatosi) qayta ulanib, xabar qayta
+      yuboriladi; doimiy (5xx) xatolar qayta urinilmaydi
+
+smtplib bloklovchi kutubxona, shuning uchun har bir SMTP amali asyncio.to_thread
+orqali bajariladi - event loop bloklanmaydi.
+"""
+
+import asyncio
+import smtplib
+import ssl
+import time
+from email.message import EmailMessage
+
+POOL_SIZE = 4               # Doimiy SMTP ulanishlari soni
+QUEUE_SIZE = 1000           # Navbatdagi maksimal xabarlar soni
+KEEPALIVE = 30.0            # Bo'sh ulanishni NOOP bilan tekshirish oralig'i (soniya)
+MAX_PER_CONNECTION = 100    # Shuncha xabardan keyin ulanish yangilanadi (server limitlari)
+MAX_ATTEMPTS = 3            # Vaqtinchalik xatoda yuborish urinishlari
+RETRY_DELAY = 1.0           # Qayta ulanishdan oldingi boshlang'ich kutish (soniya)
+TIMEOUT = 30                # SMTP socket timeout (soniya)
+
+
+class SMTPConfig:
+    """
+    SMTP sozlamalari
+    Args:
+        starttls: None bo'lsa 587 va 25 portlarda yoqiladi
+    """
+
+    def __init__(self, host, port=587, user="", password="", from_name="FastAPI Mailer",
+                 from_email="", starttls=None, timeout=TIMEOUT):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.from_name = from_name
+        self.from_email = from_email or user
+        self.starttls = port in (587, 25) if starttls is None else starttls
+        self.timeout = timeout
+
+    def check(self):
+        """
+        Raises:
+            RuntimeError: SMTP sozlamalari to'liq bo'lmasa
+        """
+        if not self.host or not self.from_email:
+            raise RuntimeError(
+                "SMTP sozlamalari topilmadi. .env faylni yarating va quyidagilarni to'ldiring:\n"
+                "SMTP_HOST=smtp.gmail.com\n"
+                "SMTP_PORT=587\n"
+                "SMTP_USER=your_email@gmail.com\n"
+                "SMTP_PASS=your_app_password\n"
+                "FROM_NAME=FastAPI Mailer\n"
+                "FROM_EMAIL=your_email@gmail.com"
+            )
+
+    @property
+    def sender(self):
+        return f"{self.from_name} <{self.from_email}>"
+
+
+def build_message(config, to_email, subject, body):
+    """EmailMessage yaratish"""
+    msg = EmailMessage()
+    msg["From"] = config.sender
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg.set_content(body)
+    return msg
+
+
+def _consume(future):
+    """Natijasi kutilmagan future xatosi "never retrieved" ogohlantirishini bermasligi uchun"""
+    if not future.cancelled():
+        future.exception()
+
+
+def is_permanent(error):
+    """5xx javoblar (noto'g'ri qabul qiluvchi, rad etilgan xabar) - qayta urinish befoyda"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    code = getattr(error, "smtp_code", None)
+    return code is not None and code >= 500
+
+
+class SMTPConnection:
+    """
+    Bitta doimiy SMTP ulanishi (bloklovchi, worker thread ichida chaqiriladi)
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.smtp = None
+        self.sent = 0           # Shu ulanish orqali yuborilgan xabarlar
+        self.connects = 0       # Jami ulanishlar (handshake lar) soni
+        self.last_used = 0.0
+
+    @property
+    def connected(self):
+        return self.smtp is not None
+
+    def connect(self):
+        """Ulanish: EHLO, kerak bo'lsa STARTTLS va LOGIN"""
+        config = self.config
+        smtp = smtplib.SMTP(config.host, config.port, timeout=config.timeout)
+        try:
+            smtp.ehlo()
+            if config.starttls:
+                smtp.starttls(context=ssl.create_default_context())
+                smtp.ehlo()
+            if config.user:
+                smtp.login(config.user, config.password)
+        except Exception:
+            smtp.close()
+            raise
+        self.smtp = smtp
+        self.sent = 0
+        self.connects += 1
+        self.last_used = time.monotonic()
+
+    def close(self):
+        """Ulanishni yopish (QUIT, xato bo'lsa socketni yopish)"""
+        smtp, self.smtp = self.smtp, None
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            smtp.close()
+
+    def noop(self):
+        """
+        Keepalive: ulanish tirikligini tekshirish
+        Returns:
+            bool: Ulanish ishlayapti
+        """
+        if self.smtp is None:
+            return False
+        try:
+            code, _ = self.smtp.noop()
+        except OSError:     # smtplib.SMTPException ham OSError dan meros oladi
+            code = None
+        if code != 250:
+            self.close()
+            return False
+        self.last_used = time.monotonic()
+        return True
+
+    def send(self, msg):
+        """Xabarni yuborish (ulanish yo'q bo'lsa yoki limit tugagan bo'lsa - qayta ulanish)"""
+        if self.smtp is not None and self.sent >= MAX_PER_CONNECTION:
+            self.close()
+        if self.smtp is None:
+            self.connect()
+        try:
+            self.smtp.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self.close()
+            raise
+        except smtplib.SMTPException:
+            # Xabar rad etildi, ulanish esa ishlayapti - faqat holatni tiklash
+            try:
+                self.smtp.rset()
+            except OSError:
+                self.close()
+            raise
+        except OSError:
+            # Tarmoq xatosi - ulanish yaroqsiz
+            self.close()
+            raise
+        self.sent += 1
+        self.last_used = time.monotonic()
+
+
+class DeliveryPool:
+    """
+    Doimiy SMTP ulanishlari pooli va cheklangan yetkazib berish navbati
+    """
+
+    def __init__(self, config, size=POOL_SIZE, queue_size=QUEUE_SIZE, keepalive=KEEPALIVE,
+                 max_attempts=MAX_ATTEMPTS, retry_delay=RETRY_DELAY):
+        self.config = config
+        self.size = size
+        self.keepalive = keepalive
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.connections = [SMTPConnection(config) for _ in range(size)]
+        self.delivered = 0
+        self.failed = 0
+        self.retries = 0
+        self._workers = []
+
+    def __len__(self):
+        """Navbatdagi xabarlar soni"""
+        return self.queue.qsize()
+
+    def start(self):
+        """Worker vazifalarini ishga tushirish"""
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker(conn)) for conn in self.connections]
+
+    async def stop(self, drain=True):
+        """
+        Poolni to'xtatish
+        Args:
+            drain: Navbatdagi xabarlar yuborilishini kutish
+        """
+        if drain:
+            await self.queue.join()
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        await asyncio.gather(*(asyncio.to_thread(conn.close) for conn in self.connections))
+
+    async def submit(self, msg):
+        """
+        Xabarni navbatga qo'yish; navbat to'la bo'lsa joy bo'shashini kutadi (backpressure)
+        Returns:
+            asyncio.Future: Yuborilganda True, xatoda exception
+        """
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume)
+        await self.queue.put((msg, future))
+        return future
+
+    def submit_nowait(self, msg):
+        """
+        Xabarni kutmasdan navbatga qo'yish
+        Raises:
+            asyncio.QueueFull: Navbat to'la
+        """
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_consume)
+        self.queue.put_nowait((msg, future))
+        return future
+
+    async def send(self, msg):
+        """Xabarni yuborib, natijani kutish"""
+        return await (await self.submit(msg))
+
+    async def _deliver(self, conn, msg):
+        """Bitta xabarni yuborish: vaqtinchalik xatoda qayta ulanib, qayta urinish"""
+        delay = self.retry_delay
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await asyncio.to_thread(conn.send, msg)
+                return
+            except Exception as e:
+                if is_permanent(e) or attempt == self.max_attempts:
+                    raise
+                self.retries += 1
+                print(f"⚠️  SMTP xatosi ({e.__class__.__name__}), qayta urinish {attempt}/{self.max_attempts - 1}")
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    async def _worker(self, conn):
+        """Bitta ulanish workeri: navbatdan xabar olib yuboradi, bo'sh paytda NOOP"""
+        while True:
+            try:
+                msg, future = await asyncio.wait_for(self.queue.get(), timeout=self.keepalive)
+            except asyncio.TimeoutError:
+                if conn.connected:
+                    await asyncio.to_thread(conn.noop)
+                continue
+            try:
+                await self._deliver(conn, msg)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.cancel()
+                raise
+            except Exception as e:
+                self.failed += 1
+                print(f"❌ Xabar yuborilmadi ({msg['To']}): {e}")
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.delivered += 1
+                if not future.done():
+                    future.set_result(True)
+            finally:
+                self.queue.task_done()
+
+    def stats(self):
+        """Pool statistikasi"""
+        return {
+            "pool_size": self.size,
+            "queued": self.queue.qsize(),
+            "queue_limit": self.queue.maxsize,
+            "connected": sum(1 for conn in self.connections if conn.connected),
+            "connects": sum(conn.connects for conn in self.connections),
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "retries": self.retries,
+        }
@@ -1,12 +1,17 @@
-from fastapi import FastAPI, Request, Form, BackgroundTasks
+from contextlib import asynccontextmanager
+import asyncio
+
+from fastapi import FastAPI, HTTPException, Request, Form
 from fastapi.responses import HTMLResponse
 from fastapi.templating import Jinja2Templates
-from email_validator import validate_email, EmailNotValidError
-import smtplib
-from email.message import EmailMessage
+from email_validator import EmailNotValidError
 from environs import Env
 import os
 
+from campaign import AddressValidator, CampaignTemplate, chunks, iter_csv, iter_json
+from mailer import DeliveryPool, SMTPConfig
+from outbox import OutboxDispatcher, OutboxStore
+
 env = Env()
 # .env faylni o'qish (mavjud bo'lsa)
 env_file = os.path.join(os.path.dirname(__file__), ".env")
@@ -24,36 +29,45 @@ SMTP_PASS = env.str("SMTP_PASS", default="")
 FROM_NAME = env.str("FROM_NAME", "FastAPI Mailer")
 FROM_EMAIL = env.str("FROM_EMAIL", SMTP_USER if SMTP_USER else "")
 
-app = FastAPI()
-templates = Jinja2Templates(directory="templates")
+# Yetkazib berish pooli sozlamalari
+SMTP_POOL_SIZE = env.int("SMTP_POOL_SIZE", 4)
+SMTP_QUEUE_SIZE = env.int("SMTP_QUEUE_SIZE", 1000)
 
+# Diskdagi navbat (server qayta ishga tushsa ham xabarlar saqlanadi)
+OUTBOX_DB = env.str("OUTBOX_DB", os.path.join(os.path.dirname(os.path.abspath(__file__)), "outbox.db"))
 
-def send_email_smtp(to_email: str, subject: str, body: str):
-    if not all([SMTP_HOST, SMTP_USER, SMTP_PASS]):
-        raise RuntimeError(
-            "SMTP sozlamalari topilmadi. .env faylni yarating va quyidagilarni to'ldiring:\n"
-            "SMTP_HOST=smtp.gmail.com\n"
-            "SMTP_PORT=587\n"
-            "SMTP_USER=your_email@gmail.com\n"
-            "SMTP_PASS=your_app_password\n"
-            "FROM_NAME=FastAPI Mailer\n"
-            "FROM_EMAIL=your_email@gmail.com"
-        )
+MAX_REPORTED_ERRORS = 100  # /send/bulk javobida ko'rsatiladigan noto'g'ri manzillar
+
+smtp_config = SMTPConfig(SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASS, FROM_NAME, FROM_EMAIL)
+validator = AddressValidator()
+store = None
+pool = None
+dispatcher = None
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global store, pool, dispatcher
+    store = OutboxStore(OUTBOX_DB)
+    try:
+        smtp_config.check()
+    except RuntimeError as e:
+        print(f"⚠️  {e}")
+    else:
+        pool = DeliveryPool(smtp_config, size=SMTP_POOL_SIZE, queue_size=SMTP_QUEUE_SIZE)
+        pool.start()
+        dispatcher = OutboxDispatcher(store, pool, smtp_config)
+        dispatcher.start()
+    yield
+    if dispatcher is not None:
+        # Poolga berilgan xabarlarni yuborib, natijalarini yozish
+        await dispatcher.stop()
+        await pool.stop(drain=False)
+    store.close()
 
-    msg = EmailMessage()
-    msg["From"] = f"{FROM_NAME} <{FROM_EMAIL}>"
-    msg["To"] = to_email
-    msg["Subject"] = subject
-    msg.set_content(body)
 
-    # TLS bilan ulanish
-    with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30) as smtp:
-        _ = smtp.ehlo() 
-        if SMTP_PORT in (587, 25):
-            _ = smtp.starttls()
-            _ = smtp.ehlo()
-        _ = smtp.login(SMTP_USER, SMTP_PASS)
-        _ = smtp.send_message(msg)
+app = FastAPI(lifespan=lifespan)
+templates = Jinja2Templates(directory="templates")
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -61,17 +75,41 @@ async def form(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+@app.get("/stats")
+async def stats():
+    """Yetkazib berish pooli statistikasi"""
+    if dispatcher is None:
+        return {"enabled": False, "outbox": store.counts(), "validation": validator.stats()}
+    return {"enabled": True, "pool": pool.stats(), "outbox": dispatcher.stats(), "validation": validator.stats()}
+
+
+@app.get("/status/{message_id}")
+async def status(message_id: int):
+    """Xabar holati: queued, sending, sent yoki failed"""
+    info = store.get(message_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Xabar topilmadi")
+    return info
+
+
+@app.get("/campaigns/{campaign_id}")
+async def campaign_status(campaign_id: int):
+    """Kampaniya holati: qabul qiluvchilar va holatlar bo'yicha xabarlar soni"""
+    info = store.campaign(campaign_id)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Kampaniya topilmadi")
+    return info
+
+
 @app.post("/send", response_class=HTMLResponse)
 async def send(
     request: Request,
-    background_tasks: BackgroundTasks,
     email: str = Form(...),
     message: str = Form(...),
     subject: str = Form("Xabar FastAPI dan"),
 ):
     try:
-        valid_email_info = validate_email(email)
-        valid_email = valid_email_info.email
+        valid_email = validator.validate(email)
     except EmailNotValidError:
         return templates.TemplateResponse(
             "result.html",
@@ -79,25 +117,135 @@ async def send(
             status_code=400,
         )
 
-    try:
-        background_tasks.add_task(send_email_smtp, valid_email, subject, message)
-    except Exception as e:
+    if dispatcher is None:
         return templates.TemplateResponse(
             "result.html",
-            {"request": request, "ok": False, "msg": f"Xatolik: {e}"},
+            {"request": request, "ok": False, "msg": "Xatolik: SMTP sozlamalari topilmadi (.env)."},
             status_code=500,
         )
 
+    # Faqat diskdagi navbatga yozish - SMTP ni kutmaymiz
+    message_id = store.enqueue(valid_email, subject, message)
+    dispatcher.notify()
+
     return templates.TemplateResponse(
         "result.html",
         {
             "request": request,
             "ok": True,
-            "msg": "Xabar yuborish jo'natildi — tekshiring inbox/kirish papkasini.",
+            "msg": f"Xabar navbatga qo'yildi (#{message_id}) — tekshiring inbox/kirish papkasini.",
+            "status_url": f"/status/{message_id}",
         },
     )
 
 
+def read_batch(batches):
+    """Keyingi partiyani o'qish va manzillarni tekshirish (worker threadda - DNS bloklaydi)"""
+    batch = next(batches, None)
+    if batch is None:
+        return None
+    return validator.validate_many(batch)
+
+
+async def enqueue_campaign(template, recipients):
+    """
+    Qabul qiluvchilarni partiyalab tekshirish va navbatga yozish. Har partiyadan
+    keyin dispetcher uyg'otiladi - yuborish ro'yxat o'qib bo'linishini kutmaydi.
+    Raises:
+        ValueError: Ma'lumot noto'g'ri (RenderError - shablon birinchi qabul qiluvchida bajarilmadi)
+    """
+    campaign_id = None
+    queued = duplicates = invalid = 0
+    errors = []
+    seen = set()
+    batches = chunks(recipients)
+    while True:
+        try:
+            result = await asyncio.to_thread(read_batch, batches)
+        except ValueError as e:
+            if campaign_id is None:
+                raise
+            # Oldingi partiyalar navbatda qoladi - buni javobda aytamiz
+            raise ValueError(f"{e} (kampaniya #{campaign_id}: {queued} ta xabar navbatga qo'yilgan)") from None
+        if result is None:
+            break
+        valid, bad = result
+        invalid += len(bad)
+        errors.extend({"email": email, "error": reason} for email, reason in bad[:MAX_REPORTED_ERRORS - len(errors)])
+
+        fresh = []
+        for email, context in valid:
+            key = email.lower()
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            fresh.append((email, context))
+        if not fresh:
+            continue
+
+        if campaign_id is None:
+            # Shablonni birinchi qabul qiluvchida sinab ko'rish: xato bo'lsa hech narsa navbatga qo'yilmaydi
+            email, context = fresh[0]
+            template.render({**context, "email": email})
+            campaign_id = store.create_campaign(*template.source)
+        queued += store.enqueue_many(campaign_id, fresh)
+        dispatcher.notify()
+
+    if campaign_id is not None and invalid:
+        store.add_invalid(campaign_id, invalid)
+    return {
+        "campaign_id": campaign_id,
+        "queued": queued,
+        "invalid": invalid,
+        "duplicates": duplicates,
+        "errors": errors,
+        "status_url": f"/campaigns/{campaign_id}" if campaign_id is not None else None,
+    }
+
+
+async def start_campaign(subject, body, recipients):
+    """Shablonlarni kompilyatsiya qilib, qabul qiluvchilarni navbatga yozish"""
+    if not isinstance(subject, str) or not isinstance(body, str) or not body.strip():
+        raise HTTPException(status_code=400, detail="'subject' va 'body' shablonlari kerak")
+    try:
+        template = CampaignTemplate(subject, body)
+        result = await enqueue_campaign(template, recipients)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if result["campaign_id"] is None:
+        raise HTTPException(status_code=400, detail={"msg": "Yaroqli qabul qiluvchi topilmadi", **result})
+    return result
+
+
+@app.post("/send/bulk", status_code=202)
+async def send_bulk(request: Request):
+    """
+    Ommaviy yuborish. Ikki xil kirish:
+        JSON: {"subject": "...", "body": "...", "recipients": ["a@b.uz", {"email": "c@d.uz", "name": "Ali"}]}
+        multipart forma: subject, body va file (CSV, "email" ustuni + shablon o'zgaruvchilari)
+    Mavzu va matn Jinja shablonlari: "Salom, {{ name }}!"
+    """
+    if dispatcher is None:
+        raise HTTPException(status_code=500, detail="SMTP sozlamalari topilmadi (.env)")
+
+    if request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            data = await request.json()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="JSON noto'g'ri")
+        if not isinstance(data, dict) or not isinstance(data.get("recipients"), list):
+            raise HTTPException(status_code=400, detail="'recipients' ro'yxati kerak")
+        return await start_campaign(data.get("subject"), data.get("body"), iter_json(data["recipients"]))
+
+    # CSV fayl diskdan qatorma-qator o'qiladi (Starlette katta yuklamalarni vaqtinchalik faylda saqlaydi)
+    async with request.form() as form:
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="CSV fayl (file) kerak")
+        return await start_campaign(form.get("subject"), form.get("body"), iter_csv(upload.file))
+
+
 if __name__ == "__main__":
     import uvicorn
     
@@ -107,6 +255,7 @@ if __name__ == "__main__":
     print("📍 Server: http://localhost:8000")
     print("📧 Email yuborish uchun: http://localhost:8000")
     print("📖 API Docs: http://localhost:8000/docs")
+    print(f"📮 SMTP pool: {SMTP_POOL_SIZE} ulanish, navbat {SMTP_QUEUE_SIZE} xabar")
     print("=" * 60)
     
     if not all([SMTP_HOST, SMTP_USER, SMTP_PASS]):
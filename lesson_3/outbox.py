@@ -0,0 +1,397 @@
+"""
+Diskda saqlanadigan chiquvchi pochta navbati (SQLite WAL)
+/send faqat bitta INSERT qiladi (O(1)) va darhol javob qaytaradi; xabarlar
+server qayta ishga tushsa ham yo'qolmaydi. Fon dispetcheri navbatdan xabarlarni
+partiyalab (batch) oladi va DeliveryPool ga beradi:
+
+    queued  -> sending -> sent
+                       -> queued (vaqtinchalik xato, eksponensial kutish bilan)
+                       -> failed (doimiy xato yoki urinishlar tugadi)
+
+Server to'xtab qolganda "sending" holatida qolgan xabarlar qayta ishga
+tushganda navbatga qaytariladi (kamida bir marta yetkazish).
+
+Kampaniya xabarlari render qilinmasdan saqlanadi (campaign_id + JSON
+o'zgaruvchilar); mavzu va matn dispetcher xabarni olganda shablondan yaratiladi.
+"""
+
+import asyncio
+import json
+import random
+import sqlite3
+import time
+
+from campaign import TEMPLATE_CACHE, CampaignTemplate, LRUCache, RenderError
+from mailer import build_message, is_permanent
+
+BATCH_SIZE = 100            # Bir so'rovda olinadigan xabarlar soni
+POLL_INTERVAL = 5.0         # Yangi xabar signali bo'lmasa navbatni tekshirish oralig'i (soniya)
+MAX_ATTEMPTS = 6            # Shuncha urinishdan keyin xabar "failed"
+BACKOFF_BASE = 5.0          # Birinchi qayta urinishgacha kutish (soniya)
+BACKOFF_MAX = 3600.0        # Eng uzun kutish (soniya)
+
+QUEUED = "queued"
+SENDING = "sending"
+SENT = "sent"
+FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    to_email TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS messages_due ON messages (status, next_attempt);
+CREATE TABLE IF NOT EXISTS campaigns (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    recipients INTEGER NOT NULL DEFAULT 0,
+    invalid INTEGER NOT NULL DEFAULT 0,
+    created REAL NOT NULL
+);
+"""
+
+# Eski bazalarga qo'shiladigan ustunlar
+MIGRATIONS = (
+    ("campaign_id", "ALTER TABLE messages ADD COLUMN campaign_id INTEGER"),
+    ("context", "ALTER TABLE messages ADD COLUMN context TEXT"),
+)
+
+
+def backoff(attempts, base=BACKOFF_BASE, limit=BACKOFF_MAX):
+    """Eksponensial kutish (tasodifiy siljish bilan - hamma bir vaqtda urinmasligi uchun)"""
+    delay = min(base * 2 ** (attempts - 1), limit)
+    return delay * random.uniform(0.8, 1.2)
+
+
+class OutboxStore:
+    """
+    SQLite navbat (faqat event loop threadidan ishlatiladi)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        # WAL rejimida NORMAL: commit tez, elektr uzilishida oxirgi tranzaksiyalar yo'qolishi mumkin
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        columns = {row["name"] for row in self.db.execute("PRAGMA table_info(messages)")}
+        for column, statement in MIGRATIONS:
+            if column not in columns:
+                self.db.execute(statement)
+        self.db.execute("CREATE INDEX IF NOT EXISTS messages_campaign ON messages (campaign_id, status)")
+
+    def close(self):
+        self.db.close()
+
+    def enqueue(self, to_email, subject, body):
+        """
+        Xabarni navbatga qo'shish
+        Returns:
+            int: Xabar id si
+        """
+        now = time.time()
+        cursor = self.db.execute(
+            "INSERT INTO messages (to_email, subject, body, next_attempt, created, updated) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (to_email, subject, body, now, now, now),
+        )
+        return cursor.lastrowid
+
+    def create_campaign(self, subject, body):
+        """
+        Kampaniya shablonlarini saqlash
+        Returns:
+            int: Kampaniya id si
+        """
+        cursor = self.db.execute(
+            "INSERT INTO campaigns (subject, body, created) VALUES (?, ?, ?)",
+            (subject, body, time.time()),
+        )
+        return cursor.lastrowid
+
+    def enqueue_many(self, campaign_id, recipients):
+        """
+        Kampaniya qabul qiluvchilarini bitta tranzaksiyada navbatga qo'shish
+        Args:
+            recipients: [(email, o'zgaruvchilar)]
+        Returns:
+            int: Qo'shilgan xabarlar soni
+        """
+        now = time.time()
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                "INSERT INTO messages (to_email, subject, body, next_attempt, created, updated, campaign_id, context) "
+                "VALUES (?, '', '', ?, ?, ?, ?, ?)",
+                [(email, now, now, now, campaign_id, json.dumps(context, ensure_ascii=False))
+                 for email, context in recipients],
+            )
+            db.execute(
+                "UPDATE campaigns SET recipients = recipients + ? WHERE id = ?",
+                (len(recipients), campaign_id),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return len(recipients)
+
+    def add_invalid(self, campaign_id, count):
+        """Rad etilgan (noto'g'ri) manzillar sonini qo'shish"""
+        self.db.execute("UPDATE campaigns SET invalid = invalid + ? WHERE id = ?", (count, campaign_id))
+
+    def campaign(self, campaign_id):
+        """Kampaniya shablonlari va holatlar bo'yicha xabarlar soni (yo'q bo'lsa None)"""
+        row = self.db.execute(
+            "SELECT id, subject, body, recipients, invalid, created FROM campaigns WHERE id = ?",
+            (campaign_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        counts = self.db.execute(
+            "SELECT status, COUNT(*) FROM messages WHERE campaign_id = ? GROUP BY status",
+            (campaign_id,),
+        ).fetchall()
+        return {**dict(row), "messages": {status: count for status, count in counts}}
+
+    def claim(self, limit, now=None):
+        """
+        Vaqti kelgan xabarlarni olish va "sending" deb belgilash (bitta tranzaksiya)
+        Returns:
+            list: sqlite3.Row lar
+        """
+        now = time.time() if now is None else now
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            rows = db.execute(
+                "SELECT * FROM messages WHERE status = ? AND next_attempt <= ? "
+                "ORDER BY next_attempt LIMIT ?",
+                (QUEUED, now, limit),
+            ).fetchall()
+            if rows:
+                db.executemany(
+                    "UPDATE messages SET status = ?, attempts = attempts + 1, updated = ? WHERE id = ?",
+                    [(SENDING, now, row["id"]) for row in rows],
+                )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return rows
+
+    def complete(self, sent, retries, failed):
+        """
+        Natijalarni bitta tranzaksiyada yozish
+        Args:
+            sent: [id]
+            retries: [(id, keyingi urinish vaqti, xato)]
+            failed: [(id, xato)]
+        """
+        now = time.time()
+        db = self.db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                "UPDATE messages SET status = ?, updated = ?, last_error = NULL WHERE id = ?",
+                [(SENT, now, message_id) for message_id in sent],
+            )
+            db.executemany(
+                "UPDATE messages SET status = ?, next_attempt = ?, updated = ?, last_error = ? WHERE id = ?",
+                [(QUEUED, due, now, error, message_id) for message_id, due, error in retries],
+            )
+            db.executemany(
+                "UPDATE messages SET status = ?, updated = ?, last_error = ? WHERE id = ?",
+                [(FAILED, now, error, message_id) for message_id, error in failed],
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def recover(self):
+        """To'xtab qolgan "sending" xabarlarni navbatga qaytarish (ishga tushishda)"""
+        cursor = self.db.execute(
+            "UPDATE messages SET status = ?, updated = ? WHERE status = ?",
+            (QUEUED, time.time(), SENDING),
+        )
+        return cursor.rowcount
+
+    def next_due(self):
+        """Eng yaqin navbatdagi xabar vaqti (yo'q bo'lsa None)"""
+        row = self.db.execute(
+            "SELECT MIN(next_attempt) FROM messages WHERE status = ?", (QUEUED,)
+        ).fetchone()
+        return row[0]
+
+    def get(self, message_id):
+        """Xabar holati (yo'q bo'lsa None)"""
+        row = self.db.execute(
+            "SELECT id, to_email, subject, status, attempts, next_attempt, created, updated, last_error, "
+            "campaign_id FROM messages WHERE id = ?",
+            (message_id,),
+        ).fetchone()
+        return dict(row) if row is not None else None
+
+    def counts(self):
+        """Holatlar bo'yicha xabarlar soni"""
+        rows = self.db.execute("SELECT status, COUNT(*) FROM messages GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+
+class OutboxDispatcher:
+    """
+    Navbatdan xabarlarni partiyalab olib DeliveryPool ga berish va natijalarni yozish
+    """
+
+    def __init__(self, store, pool, config, batch_size=BATCH_SIZE, poll_interval=POLL_INTERVAL,
+                 max_attempts=MAX_ATTEMPTS):
+        self.store = store
+        self.pool = pool
+        self.config = config
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self._wakeup = asyncio.Event()
+        self._results = []          # (id, urinishlar, xato yoki None)
+        self._inflight = 0
+        self._templates = LRUCache(TEMPLATE_CACHE)
+        self._task = None
+
+    def notify(self):
+        """Yangi xabar qo'shildi - dispetcherni uyg'otish"""
+        self._wakeup.set()
+
+    def start(self):
+        recovered = self.store.recover()
+        if recovered:
+            print(f"♻️  {recovered} ta tugallanmagan xabar navbatga qaytarildi")
+        self._task = asyncio.create_task(self.run())
+
+    async def stop(self, drain=True):
+        """
+        Dispetcherni to'xtatish
+        Args:
+            drain: Poolga berilgan xabarlar yuborilishini kutib, natijalarini yozish
+        """
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if drain:
+            await self.pool.queue.join()
+        self._flush()
+
+    def _on_done(self, message_id, attempts, future):
+        error = asyncio.CancelledError() if future.cancelled() else future.exception()
+        self._results.append((message_id, attempts, error))
+        self._inflight -= 1
+        self._wakeup.set()
+
+    def _flush(self):
+        """To'plangan natijalarni bitta tranzaksiyada yozish"""
+        if not self._results:
+            return
+        results, self._results = self._results, []
+        sent, retries, failed = [], [], []
+        now = time.time()
+        for message_id, attempts, error in results:
+            if error is None:
+                sent.append(message_id)
+            elif isinstance(error, asyncio.CancelledError):
+                # Server to'xtadi - xabar keyingi ishga tushishda yuboriladi
+                retries.append((message_id, now, "to'xtatildi"))
+            elif is_permanent(error) or isinstance(error, RenderError) or attempts >= self.max_attempts:
+                failed.append((message_id, f"{error.__class__.__name__}: {error}"))
+            else:
+                retries.append((message_id, now + backoff(attempts), f"{error.__class__.__name__}: {error}"))
+        self.store.complete(sent, retries, failed)
+
+    def _template(self, campaign_id):
+        """Kampaniya shablonini keshdan olish (birinchi marta - bazadan o'qib kompilyatsiya)"""
+        template = self._templates.get(campaign_id)
+        if template is None:
+            campaign = self.store.campaign(campaign_id)
+            if campaign is None:
+                raise RenderError(f"Kampaniya #{campaign_id} topilmadi")
+            template = CampaignTemplate(campaign["subject"], campaign["body"])
+            self._templates.put(campaign_id, template)
+        return template
+
+    def _build(self, row):
+        """Navbat qatoridan EmailMessage yaratish (kampaniya xabari shu yerda render qilinadi)"""
+        if row["campaign_id"] is None:
+            subject, body = row["subject"], row["body"]
+        else:
+            context = json.loads(row["context"])
+            context["email"] = row["to_email"]
+            subject, body = self._template(row["campaign_id"]).render(context)
+        return build_message(self.config, row["to_email"], subject, body)
+
+    def _dispatch(self):
+        """
+        Pool navbatida joy bo'lgancha xabarlarni olib yuborish
+        Returns:
+            int: Olingan xabarlar soni; pool navbati to'la bo'lsa None
+        """
+        pool = self.pool
+        free = pool.queue.maxsize - pool.queue.qsize() if pool.queue.maxsize else self.batch_size
+        limit = min(self.batch_size, free)
+        if limit <= 0:
+            return None
+        rows = self.store.claim(limit)
+        for row in rows:
+            try:
+                msg = self._build(row)
+            except RenderError as e:
+                self._results.append((row["id"], row["attempts"] + 1, e))
+                self._wakeup.set()
+                continue
+            future = pool.submit_nowait(msg)
+            self._inflight += 1
+            future.add_done_callback(
+                lambda f, message_id=row["id"], attempts=row["attempts"] + 1: self._on_done(message_id, attempts, f)
+            )
+        return len(rows)
+
+    async def run(self):
+        """Asosiy sikl: natijalarni yozish, yangi partiya olish, signal yoki vaqtni kutish"""
+        while True:
+            self._wakeup.clear()
+            self._flush()
+            claimed = self._dispatch()
+            if claimed is not None and claimed >= self.batch_size:
+                # Navbatda yana xabarlar bo'lishi mumkin - kutmasdan davom etish
+                await asyncio.sleep(0)
+                continue
+            timeout = self.poll_interval
+            if claimed is not None:
+                due = self.store.next_due()
+                if due is not None:
+                    timeout = min(timeout, max(due - time.time(), 0.05))
+            # Pool to'la bo'lsa - yuborish tugashi (_on_done) uyg'otadi
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def stats(self):
+        return {"inflight": self._inflight, **self.store.counts()}
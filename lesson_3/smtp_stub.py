@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Lokal SMTP stand-in server (aiosmtpd uslubida, faqat standart kutubxona)
+Haqiqiy pochta yubormasdan DeliveryPool ni sinash uchun: xabarlar xotirada
+saqlanadi, ulanishlar va xabarlar hisoblanadi. Uzilishlarni simulyatsiya qilish:
+
+    --drop-every N     - har N ta xabardan keyin ulanishni kutilmaganda uzish
+    --idle-timeout S   - S soniya jim turgan ulanishni yopish (server timeout)
+
+"reject" so'zi bor qabul qiluvchilar 550 bilan rad etiladi (doimiy xato).
+
+    python smtp_stub.py --port 1025
+    # .env: SMTP_HOST=127.0.0.1  SMTP_PORT=1025
+"""
+
+import argparse
+import asyncio
+
+HOST = "127.0.0.1"
+PORT = 1025
+
+
+class StubSMTPServer:
+    """
+    Minimal SMTP server: EHLO/HELO, AUTH PLAIN/LOGIN (har qanday parol), MAIL,
+    RCPT, DATA, NOOP, RSET, QUIT
+    """
+
+    def __init__(self, host=HOST, port=PORT, drop_every=0, idle_timeout=None, keep=1000):
+        self.host = host
+        self.port = port
+        self.drop_every = drop_every
+        self.idle_timeout = idle_timeout
+        self.keep = keep            # Xotirada saqlanadigan oxirgi xabarlar soni
+        self.connections = 0
+        self.active = 0
+        self.commands = 0
+        self.received = 0
+        self.messages = []          # (kimdan, [kimga], ma'lumot baytlari)
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # port=0 bo'lsa tizim tanlagan port
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def _readline(self, reader):
+        if self.idle_timeout is None:
+            return await reader.readline()
+        return await asyncio.wait_for(reader.readline(), self.idle_timeout)
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self.active += 1
+
+        def reply(text):
+            writer.write(text.encode("utf-8") + b"\r\n")
+
+        sender = None
+        recipients = []
+        handled = 0
+        reply("220 stub ESMTP tayyor")
+        try:
+            while True:
+                line = await self._readline(reader)
+                if not line:
+                    break
+                self.commands += 1
+                command = line.decode("utf-8", "replace").rstrip("\r\n")
+                verb = command.split(" ", 1)[0].upper()
+
+                if verb == "EHLO":
+                    reply("250-stub salom")
+                    reply("250-AUTH PLAIN LOGIN")
+                    reply("250-8BITMIME")
+                    reply("250 SIZE 10485760")
+                elif verb == "HELO":
+                    reply("250 stub salom")
+                elif verb == "AUTH":
+                    parts = command.split()
+                    if len(parts) > 1 and parts[1].upper() == "LOGIN":
+                        # Login va parol so'raladi (ular tekshirilmaydi)
+                        if len(parts) == 2:
+                            reply("334 VXNlcm5hbWU6")
+                            await self._readline(reader)
+                        reply("334 UGFzc3dvcmQ6")
+                        await self._readline(reader)
+                    elif len(parts) == 2:
+                        reply("334 ")
+                        await self._readline(reader)
+                    reply("235 2.7.0 Autentifikatsiya muvaffaqiyatli")
+                elif verb == "MAIL":
+                    sender = command[10:].strip()
+                    recipients = []
+                    reply("250 OK")
+                elif verb == "RCPT":
+                    recipient = command[8:].strip()
+                    if "reject" in recipient.lower():
+                        reply("550 5.1.1 Qabul qiluvchi mavjud emas")
+                    else:
+                        recipients.append(recipient)
+                        reply("250 OK")
+                elif verb == "DATA":
+                    if sender is None or not recipients:
+                        reply("503 5.5.1 Avval MAIL va RCPT")
+                        continue
+                    reply("354 Ma'lumotni yuboring, <CRLF>.<CRLF> bilan tugating")
+                    await writer.drain()
+                    data = await reader.readuntil(b"\r\n.\r\n")
+                    self.received += 1
+                    self.messages.append((sender, recipients, data[:-5]))
+                    if len(self.messages) > self.keep:
+                        del self.messages[:len(self.messages) - self.keep]
+                    sender = None
+                    recipients = []
+                    handled += 1
+                    if self.drop_every and handled % self.drop_every == 0:
+                        # Javob bermasdan uzish - mijoz SMTPServerDisconnected oladi
+                        break
+                    reply("250 OK qabul qilindi")
+                elif verb == "NOOP":
+                    reply("250 OK")
+                elif verb == "RSET":
+                    sender = None
+                    recipients = []
+                    reply("250 OK")
+                elif verb == "QUIT":
+                    reply("221 Xayr")
+                    break
+                else:
+                    reply("502 5.5.2 Buyruq qo'llab-quvvatlanmaydi")
+                await writer.drain()
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.active -= 1
+            writer.close()
+
+
+async def serve(args):
+    server = StubSMTPServer(args.host, args.port, args.drop_every, args.idle_timeout)
+    await server.start()
+    print("=" * 60)
+    print(f"📮 SMTP stand-in server: {server.host}:{server.port}")
+    print("=" * 60)
+    print("💡 lesson_3 uchun .env: SMTP_HOST=127.0.0.1, SMTP_PORT=%d" % server.port)
+    print("💡 To'xtatish uchun Ctrl+C bosing\n")
+    try:
+        while True:
+            await asyncio.sleep(5)
+            print(f"📊 Ulanishlar: {server.connections} (faol {server.active}), xabarlar: {server.received}")
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokal SMTP stand-in server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--drop-every", type=int, default=0, help="Har N xabardan keyin ulanishni uzish")
+    parser.add_argument("--idle-timeout", type=float, default=None, help="Jim ulanishni yopish (soniya)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Real vaqt chat serveri - asyncio (event loop) rejimi
+Har bir mijoz uchun thread yaratish o'rniga bitta event loop barcha ulanishlarni
+boshqaradi. Har bir mijozning o'z chiquvchi navbati (outbox) bor, shuning uchun
+sekin o'qiydigan mijoz boshqalarga xabar yetkazilishini to'xtatib qo'ymaydi.
+
+--workers N bilan bir nechta jarayonli klaster rejimida ishlaydi (cluster.py).
+"""
+
+import argparse
+import asyncio
+import os
+from datetime import datetime
+
+from cluster import BusClient, run_cluster
+from console import start_console
+from protocol import HELLO, FrameDecoder, ProtocolError, encode_frame, parse_command
+from registry import DEFAULT_ROOM, Session, SessionRegistry, valid_room_name
+
+try:
+    import resource  # Faqat Unix tizimlarida mavjud
+except ImportError:
+    resource = None
+
+# Server sozlamalari
+HOST = '127.0.0.1'   # Lokal IP (localhost)
+PORT = 12345         # Port raqami
+
+NICK_TIMEOUT = 30        # Nickname kutish vaqti (soniya)
+OUTBOX_LIMIT = 1000      # Bitta mijoz navbatidagi maksimal xabarlar soni
+BACKLOG = 4096           # listen() navbati (ko'p ulanishlar uchun)
+
+# Global o'zgaruvchilar
+registry = SessionRegistry()    # Mijozlar reestri (writer va nickname bo'yicha O(1))
+bus = None                      # Klaster rejimida xabar shinasi (BusClient)
+
+
+class Connection(Session):
+    """
+    Bitta mijoz ulanishi: sessiya, stream obyektlari va chiquvchi xabarlar navbati
+    """
+
+    __slots__ = ("reader", "writer", "outbox", "writer_task")
+
+    def __init__(self, reader, writer, nickname, decoder=None):
+        super().__init__(writer, nickname, writer.get_extra_info("peername"), decoder)
+        self.reader = reader
+        self.writer = writer
+        self.outbox = asyncio.Queue(maxsize=OUTBOX_LIMIT)
+        self.writer_task = None
+
+    def enqueue(self, message):
+        """
+        Xabarni navbatga qo'yish (hech qachon bloklanmaydi)
+        Returns:
+            bool: Navbat to'lgan bo'lsa False (mijoz juda sekin)
+        """
+        try:
+            self.outbox.put_nowait(message)
+            self.record_out(len(message))
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def send(self, message):
+        """Bitta xabarni mijoz rejimiga mos ko'rinishda navbatga qo'yish"""
+        return self.enqueue(encode_frame(message) if self.framed else message)
+
+    async def write_loop(self):
+        """Navbatdagi xabarlarni mijozga yozish (faqat shu mijoz kutadi)"""
+        try:
+            while True:
+                message = await self.outbox.get()
+                if self.writer.is_closing():
+                    break
+                self.writer.write(message)
+                # Navbatda yig'ilib qolgan xabarlarni bitta drain() bilan yuborish
+                while not self.outbox.empty():
+                    self.writer.write(self.outbox.get_nowait())
+                await self.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+    def close(self):
+        """Ulanishni yopish"""
+        if self.writer_task is not None:
+            self.writer_task.cancel()
+        self.writer.close()
+
+
+def get_timestamp():
+    """Joriy vaqtni formatlangan ko'rinishda qaytaradi"""
+    return datetime.now().strftime("%H:%M:%S")
+
+
+def raise_nofile_limit():
+    """
+    Ochiq fayllar (socketlar) limitini ruxsat etilgan maksimumgacha oshirish.
+    10k+ ulanish uchun standart 1024 limit yetmaydi.
+    """
+    if resource is None:
+        return None
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard != resource.RLIM_INFINITY and soft < hard:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+            soft = hard
+        except (ValueError, OSError):
+            pass
+    return soft
+
+
+def broadcast(message, sender=None, room=None):
+    """
+    Xona (yoki barcha) mijozlariga xabar yuborish, klaster rejimida
+    boshqa workerlarga ham
+    Args:
+        message: Yuboriladigan xabar (bytes yoki memoryview)
+        sender: Xabar yuboruvchi Connection (uni o'ziga yubormaslik uchun)
+        room: Xona (Room); None bo'lsa - barcha mijozlarga
+    """
+    fan_out(message, sender, room)
+    if bus is not None:
+        bus.publish(room.name if room is not None else "", message)
+
+
+def deliver(name, message):
+    """
+    Boshqa workerdan kelgan xabarni shu workerdagi xona a'zolariga yetkazish
+    Args:
+        name: Xona nomi ("" - barcha mijozlar)
+        message: Xabar tanasi
+    """
+    room = registry.room(name) if name else None
+    if name and room is None:
+        # Bu workerda xona a'zolari yo'q
+        return
+    fan_out(message, room=room)
+
+
+def track_member(room, delta):
+    """Klaster rejimida xona a'zolari sonini shinaga xabar qilish"""
+    if bus is not None and room is not None:
+        bus.member(room.name, delta)
+
+
+def fan_out(message, sender=None, room=None):
+    """
+    Shu jarayondagi xona (yoki barcha) mijozlariga xabar yuborish (navbatga qo'yish)
+    Args:
+        message: Yuboriladigan xabar (bytes yoki memoryview)
+        sender: Xabar yuboruvchi Connection (uni o'ziga yubormaslik uchun)
+        room: Xona (Room); None bo'lsa - barcha mijozlarga
+    """
+    if room is not None:
+        room.record(len(message))
+        targets = room.sessions()      # O(xona hajmi)
+    else:
+        targets = registry.sessions()
+
+    slow = []
+    frame = plain = None
+    for conn in targets:
+        if conn is sender:
+            continue
+        if conn.framed:
+            if frame is None:
+                # Frame faqat bir marta kodlanadi, barcha mijozlar uchun umumiy
+                frame = encode_frame(message)
+            data = frame
+        else:
+            if plain is None:
+                plain = bytes(message)
+            data = plain
+        if not conn.enqueue(data):
+            slow.append(conn)
+
+    # Navbati to'lib ketgan mijozlarni uzish
+    for conn in slow:
+        print(f"🐢 {conn.nickname} juda sekin, ulanish uziladi")
+        conn.close()
+
+
+def switch_room(conn, name):
+    """
+    Mijozni boshqa xonaga o'tkazish va xonalarga xabar berish
+    Args:
+        conn: Mijoz ulanishi
+        name: Yangi xona nomi
+    """
+    previous = registry.join(conn, name)
+    room = conn.room
+    track_member(previous, -1)
+    track_member(room, +1)
+    conn.send(f"[{get_timestamp()}] ✅ #{name} xonasiga o'tdingiz ({len(room)} mijoz)".encode('utf-8'))
+
+    if previous is not None:
+        broadcast(f"[{get_timestamp()}] {conn.nickname} #{previous.name} xonasidan chiqdi!".encode('utf-8'), room=previous)
+    broadcast(f"[{get_timestamp()}] {conn.nickname} #{name} xonasiga qo'shildi!".encode('utf-8'), conn, room)
+    print(f"🚪 {conn.nickname}: #{previous.name if previous else '-'} → #{name}")
+
+
+def run_command(conn, command, arg):
+    """
+    Mijoz buyrug'ini bajarish
+    Args:
+        conn: Mijoz ulanishi
+        command: Buyruq ("/join", "/leave")
+        arg: Buyruq argumenti
+    """
+    if command == "/join" and valid_room_name(arg):
+        if conn.room is not None and conn.room.name == arg:
+            reply = f"💡 Siz allaqachon #{arg} xonasidasiz"
+        else:
+            switch_room(conn, arg)
+            return
+    elif command == "/join":
+        reply = "❌ Xona nomi: 1-32 ta harf, raqam, '_' yoki '-' (masalan: /join python)"
+    elif command == "/leave":
+        if conn.room is not None and conn.room.name == DEFAULT_ROOM:
+            reply = f"💡 Siz #{DEFAULT_ROOM} xonasidasiz"
+        else:
+            switch_room(conn, DEFAULT_ROOM)
+            return
+    else:
+        reply = "💡 Buyruqlar: /join <xona>, /leave"
+
+    conn.send(reply.encode('utf-8'))
+
+
+def dispatch(conn, message):
+    """
+    Mijozdan kelgan xabarni qayta ishlash: buyruq bajariladi,
+    oddiy xabar esa mijoz xonasiga yuboriladi
+    """
+    conn.record_in(len(message))
+    command = parse_command(message, conn.nickname)
+    if command is None:
+        broadcast(message, conn, conn.room)
+    else:
+        run_command(conn, *command)
+
+
+async def read_nickname(reader):
+    """
+    Mijozdan nickname o'qish va protokol rejimini aniqlash
+    Args:
+        reader: asyncio.StreamReader
+    Returns:
+        tuple: (nickname, decoder) - decoder None bo'lsa mijoz oddiy matn rejimida
+    """
+    data = await reader.read(1024)
+    while data and len(data) < len(HELLO) and HELLO.startswith(data):
+        # HELLO belgisi bo'linib kelgan bo'lishi mumkin
+        chunk = await reader.read(1024)
+        if not chunk:
+            break
+        data += chunk
+
+    if not data.startswith(HELLO):
+        return data.decode('utf-8', errors='replace'), None
+
+    decoder = FrameDecoder()
+    decoder.feed(data[len(HELLO):])
+    while True:
+        for payload in decoder.frames():
+            return str(payload, 'utf-8', errors='replace'), decoder
+        chunk = await reader.read(1024)
+        if not chunk:
+            return "", None
+        decoder.feed(chunk)
+
+
+async def handle(reader, writer):
+    """
+    Yangi ulanish: nickname so'rash, ro'yxatga qo'shish va xabarlarni o'qish
+    Args:
+        reader: asyncio.StreamReader
+        writer: asyncio.StreamWriter
+    """
+    address = writer.get_extra_info("peername")
+    print(f"✅ Yangi ulanish: {address[0]}:{address[1]}")
+
+    try:
+        # Mijozdan nickname so'rash
+        writer.write("NICK".encode('utf-8'))
+        await writer.drain()
+        nickname, decoder = await asyncio.wait_for(read_nickname(reader), NICK_TIMEOUT)
+    except (asyncio.TimeoutError, ConnectionError, ProtocolError):
+        writer.close()
+        return
+
+    if not nickname:
+        writer.close()
+        return
+
+    # Nickname tekshirish va ro'yxatga qo'shish (dict - O(1))
+    # Klaster rejimida nickname avval butun klaster bo'yicha band qilinadi
+    conn = Connection(reader, writer, nickname, decoder)
+    reserved = bus is None or await bus.reserve(nickname)
+    if not reserved or not registry.add(conn):
+        if reserved and bus is not None:
+            bus.release(nickname)
+        reply = "NICK_EXISTS".encode('utf-8')
+        writer.write(encode_frame(reply) if decoder is not None else reply)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+        print(f"⚠️  Nickname '{nickname}' allaqachon mavjud, ulanish rad etildi")
+        return
+
+    conn.writer_task = asyncio.create_task(conn.write_loop())
+    track_member(conn.room, +1)
+
+    print(f"👤 {nickname} chatga qo'shildi (Jami: {len(registry)} mijoz)")
+
+    # Mijozga muvaffaqiyatli ulanish haqida xabar
+    conn.send(f"[{get_timestamp()}] Serverga ulandingiz! Xush kelibsiz, {nickname}! Xona: #{DEFAULT_ROOM}".encode('utf-8'))
+
+    # Boshqa mijozlarga yangi foydalanuvchi haqida xabar
+    broadcast(f"[{get_timestamp()}] {nickname} chatga qo'shildi!".encode('utf-8'), sender=conn, room=conn.room)
+
+    try:
+        while True:
+            if decoder is None:
+                # Oddiy matn rejimi - har bir read() bitta xabar
+                message = await reader.read(1024)
+                if not message:
+                    # Bo'sh xabar - mijoz ulanishni uzgan
+                    break
+                dispatch(conn, message)
+                continue
+
+            data = await reader.read(65536)
+            if not data:
+                break
+            decoder.feed(data)
+            for payload in decoder.frames():
+                dispatch(conn, payload)
+    except (ConnectionError, ProtocolError):
+        pass
+    finally:
+        room = conn.room
+        if registry.remove(writer) is not None:
+            track_member(room, -1)
+            if bus is not None:
+                bus.release(nickname)
+            broadcast(f"[{get_timestamp()}] {nickname} chatdan chiqdi!".encode('utf-8'), room=room)
+            print(f"❌ {nickname} chatdan chiqdi ({len(registry)} mijoz qoldi)")
+            print(f"   📊 {conn.summary()}")
+        conn.close()
+
+
+async def serve(worker=None, bus_path=None):
+    """
+    Serverni ishga tushirish va ulanishlarni kutish
+    Args:
+        worker: Klaster rejimida worker raqami (None - oddiy rejim)
+        bus_path: Klaster xabar shinasining Unix socket yo'li
+    """
+    global bus
+    limit = raise_nofile_limit()
+    if bus_path is not None:
+        bus = BusClient(deliver)
+        await bus.connect(bus_path)
+
+    # Klaster rejimida barcha workerlar bir xil portni tinglaydi (SO_REUSEPORT)
+    server = await asyncio.start_server(
+        handle, HOST, PORT, reuse_address=True, reuse_port=worker is not None, backlog=BACKLOG
+    )
+
+    if worker is not None:
+        print(f"🔧 Worker #{worker} tayyor (pid {os.getpid()}, {HOST}:{PORT})")
+    else:
+        print_banner(limit)
+        start_console(registry)
+
+    async with server:
+        try:
+            await server.serve_forever()
+        finally:
+            # Barcha ulanishlarni yopish
+            for conn in registry.sessions():
+                conn.close()
+
+
+def print_banner(limit):
+    """Server haqida ma'lumot chiqarish"""
+    print("=" * 60)
+    print("🚀 Real vaqt chat serveri ishga tushdi (asyncio rejimi)")
+    print("=" * 60)
+    print(f"📍 Server manzili: {HOST}:{PORT}")
+    if limit is not None:
+        print(f"📂 Ochiq fayllar limiti: {limit}")
+    print(f"⏳ Mijozlarni kutmoqda...")
+    print("=" * 60)
+    print("💡 Konsol buyruqlari: /rooms, /users")
+    print("💡 To'xtatish uchun Ctrl+C bosing\n")
+
+
+def receive(workers=1):
+    """
+    Event loop rejimidagi serverni ishga tushirish (server.receive() bilan bir xil interfeys)
+    Args:
+        workers: Jarayonlar soni (1 dan katta bo'lsa - klaster rejimi)
+    """
+    if workers > 1:
+        run_cluster(workers, PORT)
+    else:
+        asyncio.run(serve())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Real vaqt chat serveri (asyncio)")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker jarayonlar soni (SO_REUSEPORT klaster rejimi)")
+    args = parser.parse_args()
+    try:
+        receive(args.workers)
+    except KeyboardInterrupt:
+        print("\n\n🛑 Server to'xtatildi")
+    print("✅ Server yopildi")
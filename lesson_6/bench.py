@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chat serveri uchun yuklama generatori va kechikish (latency) benchmarki
+Minglab simulyatsiya qilingan mijozlarni ochadi, NICK handshake qiladi,
+belgilangan tezlikda xabar yuboradi va xabar yetkazilish kechikishini o'lchaydi.
+Natija JSON ko'rinishida chiqariladi - turli server rejimlarini solishtirish uchun:
+
+    python server.py &              # yoki: python async_server.py [--workers 4]
+    python bench.py --clients 1000 --senders 50 --rate 20 --duration 10
+
+Har bir xabar ichida yuborilgan vaqt (perf_counter_ns) bo'ladi; barcha mijozlar
+bitta jarayonda bo'lgani uchun soatlar bir xil.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import socket
+import sys
+import time
+
+from async_server import raise_nofile_limit
+from protocol import HELLO, FrameDecoder, ProtocolError, encode_frame
+
+# Server sozlamalari
+HOST = '127.0.0.1'
+PORT = 12345
+
+BENCH_TAG = b"BENCH "           # Benchmark xabarlarini ajratish belgisi: "BENCH id seq ns;"
+BENCH_END = b";"
+PARTIAL_LIMIT = 4096            # Oddiy matn rejimida keyingi o'qishga qoldiriladigan tugallanmagan qism
+CONNECT_BATCH = 200             # Bir vaqtda ochiladigan ulanishlar soni
+
+
+class LatencyHistogram:
+    """
+    Logarifmik bucketli kechikish gistogrammasi (HDR uslubida)
+    Har bir o'nlik (decade) BUCKETS_PER_DECADE ta bo'lakka bo'linadi, xotira
+    o'lchovlar soniga bog'liq emas, nisbiy xatolik ~2.3%.
+    """
+
+    BUCKETS_PER_DECADE = 100
+
+    def __init__(self):
+        self.counts = {}
+        self.total = 0
+        self.min = math.inf
+        self.max = 0
+
+    def record(self, value_ns):
+        """Bitta kechikishni (nanosekund) qayd etish"""
+        value = max(value_ns, 1)
+        bucket = int(math.log10(value) * self.BUCKETS_PER_DECADE)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.total += 1
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def percentile(self, p):
+        """p-persentil (0-100) qiymati, nanosekundlarda"""
+        if not self.total:
+            return 0.0
+        target = math.ceil(self.total * p / 100.0)
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= target:
+                # Bucket o'rtasi
+                return 10 ** ((bucket + 0.5) / self.BUCKETS_PER_DECADE)
+        return float(self.max)
+
+    def summary_ms(self):
+        """Asosiy persentillar millisekundlarda"""
+        ms = 1e6
+        return {
+            "count": self.total,
+            "min": round(self.min / ms, 3) if self.total else 0.0,
+            "p50": round(self.percentile(50) / ms, 3),
+            "p90": round(self.percentile(90) / ms, 3),
+            "p99": round(self.percentile(99) / ms, 3),
+            "p999": round(self.percentile(99.9) / ms, 3),
+            "max": round(self.max / ms, 3),
+        }
+
+
+class SimClient:
+    """
+    Simulyatsiya qilingan chat mijozi
+    """
+
+    def __init__(self, index, framed, histogram):
+        self.index = index
+        self.nickname = f"bench_{index}"
+        self.framed = framed
+        self.histogram = histogram
+        self.reader = None
+        self.writer = None
+        self.ready = False
+        self.sent = 0
+        self.received = 0
+        self._partial = b""     # Oddiy matn rejimi: ikki o'qishga bo'linib kelgan xabar boshi
+
+    async def connect(self, host, port):
+        """Ulanish va NICK handshake"""
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        sock = self.writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        greeting = await self.reader.readexactly(4)
+        if greeting != b"NICK":
+            raise ConnectionError(f"Kutilmagan javob: {greeting!r}")
+
+        nickname = self.nickname.encode('utf-8')
+        if self.framed:
+            self.writer.write(HELLO + encode_frame(nickname))
+        else:
+            self.writer.write(nickname)
+        await self.writer.drain()
+        self.ready = True
+
+    def send(self, seq):
+        """Vaqt belgisi bilan benchmark xabarini yuborish"""
+        message = f"{self.nickname}: BENCH {self.index} {seq} {time.perf_counter_ns()};".encode('utf-8')
+        self.writer.write(encode_frame(message) if self.framed else message)
+        self.sent += 1
+
+    def _on_data(self, data):
+        """
+        Kelgan ma'lumotdagi barcha benchmark xabarlaridan kechikishni hisoblash
+        (oddiy matn rejimida bir nechta xabar qo'shilib yoki bo'linib kelishi mumkin)
+        """
+        now = time.perf_counter_ns()
+        if self._partial:
+            data = self._partial + data
+            self._partial = b""
+        position = 0
+        index = data.find(BENCH_TAG)
+        while index >= 0:
+            end = data.find(BENCH_END, index)
+            if end < 0:
+                if not self.framed and len(data) - index <= PARTIAL_LIMIT:
+                    self._partial = data[index:]
+                return
+            parts = data[index + len(BENCH_TAG):end].split()
+            if len(parts) == 3 and parts[2].isdigit():
+                self.received += 1
+                self.histogram.record(now - int(parts[2]))
+            position = end + 1
+            index = data.find(BENCH_TAG, position)
+        if not self.framed:
+            # Belgining o'zi ham bo'linishi mumkin ("...BEN" + "CH 3 ...")
+            self._partial = data[max(position, len(data) - len(BENCH_TAG) + 1):]
+
+    async def read_loop(self):
+        """Serverdan kelgan xabarlarni o'qish"""
+        decoder = FrameDecoder() if self.framed else None
+        try:
+            while True:
+                data = await self.reader.read(65536)
+                if not data:
+                    return
+                if decoder is None:
+                    self._on_data(data)
+                    continue
+                decoder.feed(data)
+                for payload in decoder.frames():
+                    self._on_data(bytes(payload))
+        except (ConnectionError, ProtocolError, asyncio.CancelledError):
+            pass
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def send_loop(client, rate, deadline):
+    """Belgilangan tezlikda (xabar/soniya) xabar yuborish"""
+    interval = 1.0 / rate
+    loop = asyncio.get_running_loop()
+    # Barcha yuboruvchilar bir vaqtda boshlamasligi uchun tasodifiy siljish
+    next_time = loop.time() + random.random() * interval
+    seq = 0
+    while next_time < deadline:
+        await asyncio.sleep(max(0.0, next_time - loop.time()))
+        client.send(seq)
+        seq += 1
+        next_time += interval
+        if client.writer.transport.get_write_buffer_size() > 1024 * 1024:
+            await client.writer.drain()
+
+
+async def run_bench(args):
+    """Benchmarkni bajarish va natijani dict ko'rinishida qaytarish"""
+    raise_nofile_limit()
+    histogram = LatencyHistogram()
+    clients = [SimClient(i, not args.plain, histogram) for i in range(args.clients)]
+
+    # Ulanishlarni partiyalab ochish (serverning listen() navbatini to'ldirmaslik uchun)
+    connect_start = time.perf_counter()
+    failed = 0
+    for start in range(0, len(clients), CONNECT_BATCH):
+        batch = clients[start:start + CONNECT_BATCH]
+        results = await asyncio.gather(
+            *(client.connect(args.host, args.port) for client in batch), return_exceptions=True
+        )
+        failed += sum(1 for result in results if isinstance(result, Exception))
+    connected = [client for client in clients if client.ready]
+    connect_time = time.perf_counter() - connect_start
+
+    readers = [asyncio.create_task(client.read_loop()) for client in connected]
+
+    # Handshake va kirish e'lonlari tugashini kutish
+    await asyncio.sleep(args.warmup)
+
+    senders = connected[:args.senders]
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + args.duration
+    await asyncio.gather(*(send_loop(client, args.rate, deadline) for client in senders))
+    # Tezliklar faqat yuborish oynasi bo'yicha (drain kutishi kirmaydi)
+    elapsed = loop.time() - started
+
+    # Oxirgi xabarlar yetib kelishini kutish
+    drain_started = loop.time()
+    await asyncio.sleep(args.drain)
+    drain_time = loop.time() - drain_started
+
+    for task in readers:
+        task.cancel()
+    for client in clients:
+        client.close()
+
+    sent = sum(client.sent for client in senders)
+    received = sum(client.received for client in connected)
+    expected = sent * max(len(connected) - 1, 0)
+    return {
+        "server": f"{args.host}:{args.port}",
+        "label": args.label,
+        "protocol": "plain" if args.plain else "framed",
+        "clients": args.clients,
+        "connected": len(connected),
+        "connect_failed": failed,
+        "connect_seconds": round(connect_time, 3),
+        "senders": len(senders),
+        "rate_per_sender": args.rate,
+        "duration_seconds": round(elapsed, 3),
+        "drain_seconds": round(drain_time, 3),
+        "messages_sent": sent,
+        "messages_received": received,
+        "delivery_ratio": round(received / expected, 4) if expected else 0.0,
+        "send_rate": round(sent / elapsed, 1) if elapsed else 0.0,
+        "delivery_rate": round(received / elapsed, 1) if elapsed else 0.0,
+        "latency_ms": histogram.summary_ms(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat serveri uchun yuklama va kechikish benchmarki")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--clients", type=int, default=200, help="Jami mijozlar soni")
+    parser.add_argument("--senders", type=int, default=10, help="Xabar yuboradigan mijozlar soni")
+    parser.add_argument("--rate", type=float, default=10.0, help="Har bir yuboruvchi uchun xabar/soniya")
+    parser.add_argument("--duration", type=float, default=10.0, help="Yuborish davomiyligi (soniya)")
+    parser.add_argument("--warmup", type=float, default=1.0, help="Ulanishdan keyin kutish (soniya)")
+    parser.add_argument("--drain", type=float, default=2.0, help="Yuborishdan keyin kutish (soniya)")
+    parser.add_argument("--plain", action="store_true", help="Eski oddiy matn protokoli (framingsiz)")
+    parser.add_argument("--label", default="", help="Natijadagi yorliq (masalan: threaded, asyncio)")
+    parser.add_argument("--output", help="Natijani JSON faylga yozish")
+    args = parser.parse_args()
+
+    if args.senders > args.clients:
+        parser.error("--senders --clients dan katta bo'lmasligi kerak")
+
+    try:
+        result = asyncio.run(run_bench(args))
+    except KeyboardInterrupt:
+        sys.exit(130)
+
+    text = json.dumps(result, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
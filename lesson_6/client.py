@@ -9,38 +9,66 @@ import socket
 import threading
 import sys
 
+from protocol import HELLO, FrameDecoder, encode_frame, recv_exact, recv_frame
+
 # Server sozlamalari
 HOST = '127.0.0.1'
 PORT = 12345
 
-def receive(client):
+# Uzunlik-prefiksli protokoldan foydalanish (False - eski oddiy matn rejimi)
+USE_FRAMING = True
+
+def send_message(client, message, decoder=None):
+    """
+    Serverga bitta xabar yuborish (rejimga mos ko'rinishda)
+    Args:
+        client: Mijoz socket obyekti
+        message: Xabar matni
+        decoder: FrameDecoder (framing rejimida) yoki None
+    """
+    data = message.encode('utf-8')
+    client.sendall(encode_frame(data) if decoder is not None else data)
+
+def receive(client, decoder=None):
     """
     Serverdan kelayotgan xabarlarni qabul qilish va ekranga chiqarish
     Args:
         client: Mijoz socket obyekti
+        decoder: FrameDecoder (framing rejimida) yoki None
     """
     while True:
         try:
-            # Serverdan xabar olish
-            message = client.recv(1024).decode('utf-8')
-            
-            if message == "NICK":
-                # Server nickname so'rayapti
-                nickname = input("Nickingizni kiriting: ").strip()
-                if not nickname:
-                    nickname = f"User_{id(client)}"
-                client.send(nickname.encode('utf-8'))
-                continue
-            
-            if message == "NICK_EXISTS":
-                # Bu nickname allaqachon mavjud
-                print("❌ Bu nickname allaqachon ishlatilmoqda. Boshqa nickname tanlang.")
-                client.close()
-                sys.exit(1)
+            if decoder is None:
+                # Serverdan xabar olish (oddiy matn rejimi)
+                messages = [client.recv(1024).decode('utf-8')]
+            else:
+                # Avval buferda qolganlar (handshake paytida recv_frame o'qib qo'ygan
+                # framelar), keyin yangi recv_into() - u bir nechta xabar olib kelishi mumkin
+                messages = [str(payload, 'utf-8') for payload in decoder.frames()]
+                if not messages:
+                    if not decoder.recv_into(client):
+                        print("\n❌ Server ulanishni yopdi!")
+                        break
+                    messages = [str(payload, 'utf-8') for payload in decoder.frames()]
             
-            if message:
-                # Oddiy xabar - ekranga chiqarish
-                print(message)
+            for message in messages:
+                if message == "NICK":
+                    # Server nickname so'rayapti
+                    nickname = input("Nickingizni kiriting: ").strip()
+                    if not nickname:
+                        nickname = f"User_{id(client)}"
+                    send_message(client, nickname, decoder)
+                    continue
+                
+                if message == "NICK_EXISTS":
+                    # Bu nickname allaqachon mavjud
+                    print("❌ Bu nickname allaqachon ishlatilmoqda. Boshqa nickname tanlang.")
+                    client.close()
+                    sys.exit(1)
+                
+                if message:
+                    # Oddiy xabar - ekranga chiqarish
+                    print(message)
             
         except ConnectionAbortedError:
             print("\n❌ Server bilan aloqa uzildi!")
@@ -55,12 +83,13 @@ def receive(client):
     client.close()
     sys.exit(0)
 
-def write(client, nickname):
+def write(client, nickname, decoder=None):
     """
     Serverga xabar yuborish
     Args:
         client: Mijoz socket obyekti
         nickname: Foydalanuvchi nomi
+        decoder: FrameDecoder (framing rejimida) yoki None
     """
     while True:
         try:
@@ -68,9 +97,12 @@ def write(client, nickname):
             message = input('')
             
             # Xabar yuborish
-            if message.strip():
+            if message.strip().startswith("/"):
+                # Buyruq (/join <xona>, /leave) - nickname qo'shilmaydi
+                send_message(client, message.strip(), decoder)
+            elif message.strip():
                 formatted_message = f"{nickname}: {message}"
-                client.send(formatted_message.encode('utf-8'))
+                send_message(client, formatted_message, decoder)
             
         except EOFError:
             # Ctrl+D bosilganda
@@ -90,8 +122,12 @@ def write(client, nickname):
         pass
     sys.exit(0)
 
-def main():
-    """Asosiy funksiya"""
+def main(framed=USE_FRAMING):
+    """
+    Asosiy funksiya
+    Args:
+        framed: Uzunlik-prefiksli protokolni ishlatish (False - oddiy matn)
+    """
     print("=" * 60)
     print("💬 Real vaqt chat mijoz dasturi")
     print("=" * 60)
@@ -107,22 +143,36 @@ def main():
         
         # Serverdan "NICK" xabarini kutish
         nickname = None
+        decoder = None
         try:
-            message = client.recv(1024).decode('utf-8')
+            # "NICK" aynan 4 bayt - keyingi ma'lumot bilan qo'shilib ketmasligi uchun
+            message = recv_exact(client, 4).decode('utf-8')
             if message == "NICK":
                 nickname = input("Nickingizni kiriting: ").strip()
                 if not nickname:
                     nickname = f"User_{id(client)}"
-                client.send(nickname.encode('utf-8'))
                 
-                # Serverdan javob kutish
-                response = client.recv(1024).decode('utf-8')
+                if framed:
+                    # Framing rejimini so'rash: HELLO + nickname frame ko'rinishida
+                    decoder = FrameDecoder()
+                    client.sendall(HELLO + encode_frame(nickname.encode('utf-8')))
+                    payload = recv_frame(client, decoder)
+                    if payload is None:
+                        raise ConnectionError("Server ulanishni yopdi")
+                    response = payload.decode('utf-8')
+                else:
+                    client.send(nickname.encode('utf-8'))
+                    
+                    # Serverdan javob kutish
+                    response = client.recv(1024).decode('utf-8')
                 if response == "NICK_EXISTS":
                     print("❌ Bu nickname allaqachon ishlatilmoqda. Boshqa nickname tanlang.")
                     client.close()
                     sys.exit(1)
                 
+                print(response)
                 print(f"✅ Nickname: {nickname}")
+                print("💡 Buyruqlar: /join <xona>, /leave")
                 print("💬 Xabar yuborishni boshlang (chiqish uchun Ctrl+C):\n")
             else:
                 # Agar "NICK" emas, boshqa xabar bo'lsa
@@ -133,12 +183,12 @@ def main():
             sys.exit(1)
         
         # Xabarlarni qabul qilish uchun thread
-        receive_thread = threading.Thread(target=receive, args=(client,))
+        receive_thread = threading.Thread(target=receive, args=(client, decoder))
         receive_thread.daemon = True
         receive_thread.start()
         
         # Xabar yuborish (asosiy thread)
-        write(client, nickname if nickname else "User")
+        write(client, nickname if nickname else "User", decoder)
         
     except ConnectionRefusedError:
         print("❌ Serverga ulanib bo'lmadi!")
@@ -160,5 +210,6 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
+    # --plain: eski oddiy matn protokoli bilan ulanish
+    main(framed="--plain" not in sys.argv[1:])
 
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Ko'p jarayonli (multi-process) chat klasteri
+GIL tufayli bitta jarayon faqat bitta yadrodan foydalanadi. Klaster rejimida
+N ta worker jarayon bir xil portni SO_REUSEPORT orqali tinglaydi (yadro ulanishlarni
+ular orasida taqsimlaydi), xabarlar esa Unix socket orqali ishlaydigan lokal
+xabar shinasi (message bus) yordamida boshqa workerlarga yetkaziladi.
+
+Shina (hub) asosiy jarayonda ishlaydi va:
+    - nicknamelarni butun klaster bo'yicha band qiladi (yagonalik)
+    - xona xabarlarini (kirish/chiqish e'lonlari ham) boshqa workerlarga tarqatadi
+    - xonalar statistikasini yig'adi (/rooms konsol buyrug'i)
+
+Shina xabarlari protocol.py dagi framelar ichida yuboriladi:
+    JSON sarlavha + "\\n" + xabar tanasi
+"""
+
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import socket
+import tempfile
+from collections import OrderedDict
+
+from console import start_console
+from protocol import FrameDecoder, ProtocolError, encode_frame
+from registry import ROOM_HISTORY
+
+BUS_READ_SIZE = 256 * 1024      # Shinadan bitta o'qishdagi maksimal baytlar
+HEADER_LIMIT = 64 * 1024        # Sarlavhaning maksimal hajmi
+
+
+def bus_path(port):
+    """Shina Unix socketining fayl yo'li"""
+    return os.path.join(tempfile.gettempdir(), f"chat-bus-{port}.sock")
+
+
+def pack(header, body=b""):
+    """Shina xabarini frame ko'rinishiga o'tkazish"""
+    return encode_frame(json.dumps(header, separators=(",", ":")).encode('utf-8') + b"\n" + body)
+
+
+def unpack(payload):
+    """
+    Shina xabarini ajratish
+    Returns:
+        tuple: (sarlavha dict, xabar tanasi memoryview)
+    """
+    payload = memoryview(payload)
+    index = bytes(payload[:HEADER_LIMIT]).find(b"\n")
+    if index < 0:
+        raise ProtocolError("Shina xabarida sarlavha topilmadi")
+    return json.loads(bytes(payload[:index])), payload[index + 1:]
+
+
+class RoomStats:
+    """Xonaning klaster bo'yicha statistikasi (format_room_stats bilan mos)"""
+
+    __slots__ = ("name", "members", "messages", "bytes")
+
+    def __init__(self, name):
+        self.name = name
+        self.members = 0
+        self.messages = 0
+        self.bytes = 0
+
+    def __len__(self):
+        return self.members
+
+
+class Hub:
+    """
+    Workerlar orasidagi xabar shinasi (asosiy jarayonda ishlaydi)
+    """
+
+    def __init__(self):
+        self.workers = {}       # writer -> {xona: a'zolar soni} (shu worker hissasi)
+        self.nicknames = {}     # nickname -> writer (qaysi worker band qilgan)
+        self._rooms = {}        # xona nomi -> RoomStats (a'zosi bor xonalar)
+        self._retired = OrderedDict()   # bo'shagan xona nomi -> (xabarlar, baytlar)
+
+    def __len__(self):
+        """Klasterdagi jami mijozlar soni"""
+        return len(self.nicknames)
+
+    def rooms(self):
+        """Xonalar statistikasi (konsol uchun)"""
+        return tuple(self._rooms.values())
+
+    def _room(self, name):
+        room = self._rooms.get(name)
+        if room is None:
+            room = self._rooms[name] = RoomStats(name)
+            counters = self._retired.pop(name, None)
+            if counters is not None:
+                room.messages, room.bytes = counters
+        return room
+
+    def _release(self, room):
+        """Bo'sh xonani o'chirish - hisoblagichlari (oxirgi ROOM_HISTORY ta) saqlanadi (registry.py kabi)"""
+        if room.members > 0:
+            return
+        del self._rooms[room.name]
+        self._retired[room.name] = (room.messages, room.bytes)
+        if len(self._retired) > ROOM_HISTORY:
+            self._retired.popitem(last=False)
+
+    def _member(self, writer, name, delta):
+        """Xona a'zolari sonini yangilash"""
+        counts = self.workers[writer]
+        count = counts.get(name, 0) + delta
+        if count > 0:
+            counts[name] = count
+        else:
+            counts.pop(name, None)      # Worker bu xonadan chiqdi - lug'at o'smaydi
+        room = self._room(name)
+        room.members += delta
+        self._release(room)
+
+    def _publish(self, writer, header, body, payload):
+        """Xona xabarini qolgan barcha workerlarga yuborish"""
+        room = self._room(header.get("room", ""))
+        room.messages += 1
+        room.bytes += len(body)
+        self._release(room)     # Oxirgi a'zo chiqqandan keyin kelgan xabar
+        frame = encode_frame(payload)
+        for other in self.workers:
+            if other is not writer:
+                other.write(frame)
+
+    async def handle(self, reader, writer):
+        """Bitta worker ulanishini xizmat qilish"""
+        self.workers[writer] = {}
+        decoder = FrameDecoder()
+        try:
+            while True:
+                data = await reader.read(BUS_READ_SIZE)
+                if not data:
+                    break
+                decoder.feed(data)
+                for payload in decoder.frames():
+                    header, body = unpack(payload)
+                    kind = header["t"]
+                    if kind == "publish":
+                        self._publish(writer, header, body, payload)
+                    elif kind == "reserve":
+                        nickname = header["nick"]
+                        ok = nickname not in self.nicknames
+                        if ok:
+                            self.nicknames[nickname] = writer
+                        writer.write(pack({"t": "reserved", "id": header["id"], "ok": ok}))
+                    elif kind == "release":
+                        if self.nicknames.get(header["nick"]) is writer:
+                            del self.nicknames[header["nick"]]
+                    elif kind == "member":
+                        self._member(writer, header["room"], header["delta"])
+                await writer.drain()
+        except (ConnectionError, ProtocolError, ValueError, KeyError):
+            pass
+        finally:
+            # Worker to'xtadi - uning nicknamelari va xona a'zolari bo'shatiladi
+            for nickname in [n for n, w in self.nicknames.items() if w is writer]:
+                del self.nicknames[nickname]
+            for name, count in self.workers.pop(writer).items():
+                room = self._rooms.get(name)
+                if room is not None:
+                    room.members -= count
+                    self._release(room)
+            writer.close()
+
+
+class BusClient:
+    """
+    Worker tomonidagi shina mijozi
+    on_message(room, body) - boshqa workerdan xona xabari kelganda chaqiriladi.
+    """
+
+    def __init__(self, on_message):
+        self.on_message = on_message
+        self._writer = None
+        self._ids = itertools.count()
+        self._pending = {}      # so'rov id -> Future
+
+    async def connect(self, path):
+        """Shinaga ulanish va o'qish vazifasini boshlash"""
+        reader, self._writer = await asyncio.open_unix_connection(path)
+        asyncio.create_task(self._read_loop(reader))
+
+    async def _read_loop(self, reader):
+        decoder = FrameDecoder()
+        while True:
+            data = await reader.read(BUS_READ_SIZE)
+            if not data:
+                print("❌ Xabar shinasi bilan aloqa uzildi")
+                os._exit(1)
+            decoder.feed(data)
+            for payload in decoder.frames():
+                header, body = unpack(payload)
+                if header["t"] == "publish":
+                    self.on_message(header["room"], body)
+                elif header["t"] == "reserved":
+                    future = self._pending.pop(header["id"], None)
+                    if future is not None and not future.done():
+                        future.set_result(header["ok"])
+
+    async def reserve(self, nickname):
+        """
+        Nicknameni butun klaster bo'yicha band qilish
+        Returns:
+            bool: Nickname boshqa mijozda bo'lsa False
+        """
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(pack({"t": "reserve", "id": request_id, "nick": nickname}))
+        return await future
+
+    def release(self, nickname):
+        """Nicknameni bo'shatish"""
+        self._writer.write(pack({"t": "release", "nick": nickname}))
+
+    def publish(self, room, message):
+        """Xona xabarini boshqa workerlarga yuborish"""
+        self._writer.write(pack({"t": "publish", "room": room}, message))
+
+    def member(self, room, delta):
+        """Xona a'zolari soni o'zgarganini xabar qilish (+1 / -1)"""
+        self._writer.write(pack({"t": "member", "room": room, "delta": delta}))
+
+
+def run_worker(index, path):
+    """Worker jarayonining kirish nuqtasi"""
+    import async_server
+
+    try:
+        asyncio.run(async_server.serve(worker=index, bus_path=path))
+    except KeyboardInterrupt:
+        pass
+
+
+async def run_hub(path, workers):
+    """Shinani ishga tushirish va workerlar ishlayotganda kutish"""
+    hub = Hub()
+    server = await asyncio.start_unix_server(hub.handle, path)
+    start_console(hub)
+
+    loop = asyncio.get_running_loop()
+    processes = []
+    context = multiprocessing.get_context("spawn")
+    for index in range(workers):
+        process = context.Process(target=run_worker, args=(index, path), daemon=True)
+        process.start()
+        processes.append(process)
+
+    async with server:
+        try:
+            # Birorta worker to'xtasa - butun klaster to'xtatiladi
+            await asyncio.wait(
+                [loop.run_in_executor(None, process.join) for process in processes],
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            print("❌ Worker jarayoni to'xtadi, klaster yopilmoqda...")
+        finally:
+            for process in processes:
+                process.terminate()
+
+
+def run_cluster(workers, port):
+    """
+    Klasterni ishga tushirish
+    Args:
+        workers: Worker jarayonlar soni
+        port: Umumiy port
+    """
+    if not hasattr(socket, "SO_REUSEPORT"):
+        raise RuntimeError("Bu tizimda SO_REUSEPORT qo'llab-quvvatlanmaydi")
+
+    path = bus_path(port)
+    if os.path.exists(path):
+        os.unlink(path)
+
+    print("=" * 60)
+    print(f"🚀 Real vaqt chat klasteri: {workers} ta worker (SO_REUSEPORT)")
+    print("=" * 60)
+    print(f"🔌 Xabar shinasi: {path}")
+    print("💡 Konsol buyruqlari: /rooms, /users")
+    print("💡 To'xtatish uchun Ctrl+C bosing\n")
+
+    try:
+        asyncio.run(run_hub(path, workers))
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Server konsoli
+Server ishlayotgan terminalda buyruqlar orqali statistikani ko'rish:
+    /rooms  - xonalar va ulardagi xabar hisoblagichlari
+    /users  - ulangan mijozlar soni
+"""
+
+import threading
+from contextlib import nullcontext
+
+from registry import format_room_stats
+
+
+def console_loop(registry, lock=None):
+    """
+    Konsoldan buyruqlarni o'qish (stdin yopilsa tugaydi)
+    Args:
+        registry: SessionRegistry
+        lock: Reestrni himoyalovchi lock (threading serveri uchun)
+    """
+    guard = lock if lock is not None else nullcontext()
+    while True:
+        try:
+            command = input().strip().lower()
+        except (EOFError, OSError):
+            return
+
+        if command == "/rooms":
+            with guard:
+                stats = format_room_stats(registry)
+            print(stats)
+        elif command == "/users":
+            print(f"👥 Jami: {len(registry)} mijoz")
+        elif command:
+            print("💡 Konsol buyruqlari: /rooms, /users")
+
+
+def start_console(registry, lock=None):
+    """Konsol buyruqlarini alohida daemon threadda o'qishni boshlash"""
+    thread = threading.Thread(target=console_loop, args=(registry, lock))
+    thread.daemon = True
+    thread.start()
+    return thread
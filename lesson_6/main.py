@@ -14,8 +14,9 @@ def print_menu():
     print("💬 Real vaqt chat dasturi")
     print("=" * 60)
     print("1. Server ishga tushirish")
-    print("2. Mijoz (Client) ishga tushirish")
-    print("3. Chiqish")
+    print("2. Server ishga tushirish (asyncio rejimi)")
+    print("3. Mijoz (Client) ishga tushirish")
+    print("4. Chiqish")
     print("=" * 60)
 
 def run_server():
@@ -28,6 +29,16 @@ def run_server():
     except KeyboardInterrupt:
         print("\n✅ Server to'xtatildi")
 
+def run_async_server():
+    """Event loop (asyncio) rejimidagi serverni ishga tushirish"""
+    try:
+        from async_server import receive
+        receive()
+    except ImportError:
+        print("❌ async_server.py fayl topilmadi!")
+    except KeyboardInterrupt:
+        print("\n✅ Server to'xtatildi")
+
 def run_client():
     """Client dasturini ishga tushirish"""
     try:
@@ -43,27 +54,33 @@ if __name__ == "__main__":
         # Command line argument orqali
         if sys.argv[1] == "server":
             run_server()
+        elif sys.argv[1] == "async":
+            run_async_server()
         elif sys.argv[1] == "client":
             run_client()
         else:
             print("❌ Noto'g'ri argument!")
-            print("💡 Foydalanish: python main.py [server|client]")
+            print("💡 Foydalanish: python main.py [server|async|client]")
     else:
         # Interaktiv menu
         while True:
             print_menu()
-            choice = input("\nTanlov kiriting (1-3): ").strip()
+            choice = input("\nTanlov kiriting (1-4): ").strip()
             
             if choice == "1":
                 print("\n🚀 Server ishga tushmoqda...\n")
                 run_server()
                 break
             elif choice == "2":
+                print("\n🚀 Server (asyncio) ishga tushmoqda...\n")
+                run_async_server()
+                break
+            elif choice == "3":
                 print("\n💬 Mijoz ishga tushmoqda...\n")
                 run_client()
                 break
-            elif choice == "3":
+            elif choice == "4":
                 print("👋 Xayr!")
                 sys.exit(0)
             else:
-                print("❌ Noto'g'ri tanlov! 1, 2 yoki 3 ni kiriting.\n")
+                print("❌ Noto'g'ri tanlov! 1, 2, 3 yoki 4 ni kiriting.\n")
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chat uchun uzunlik-prefiksli (length-prefixed) protokol
+Har bir xabar 4 baytli uzunlik (big-endian) va xabar tanasidan iborat:
+
+    +----------------+---------------------+
+    | uzunlik (u32)  |  xabar (UTF-8)      |
+    +----------------+---------------------+
+
+TCP oqim (stream) bo'lgani uchun bitta recv() bir nechta xabarni yoki xabarning
+bir qismini qaytarishi mumkin. FrameDecoder bitta qayta ishlatiladigan bufer
+orqali xabarlarni to'g'ri ajratadi.
+
+Muzokara (negotiation): server "NICK" yuborgandan so'ng, yangi mijoz HELLO
+belgisini va nicknameni frame ko'rinishida yuboradi. Eski (oddiy matnli) mijozlar
+nicknameni to'g'ridan-to'g'ri yuboradi va avvalgidek ishlayveradi.
+"""
+
+import struct
+
+HEADER = struct.Struct("!I")            # 4 baytli uzunlik
+HELLO = b"\x00FRAMED/1\n"               # Framing rejimini yoqish belgisi
+MAX_FRAME = 1024 * 1024                 # Bitta xabarning maksimal hajmi (1 MB)
+BUFFER_SIZE = 64 * 1024                 # Qabul buferining boshlang'ich hajmi
+BATCH_BYTES = 64 * 1024                 # Batch shu hajmga yetsa avtomatik yuboriladi
+COMMAND_LIMIT = 256                     # Buyruqning maksimal uzunligi (/join xona)
+
+
+class ProtocolError(ValueError):
+    """Noto'g'ri frame (masalan, ruxsat etilganidan katta xabar)"""
+
+
+def encode_frame(payload):
+    """
+    Xabarni frame ko'rinishiga o'tkazish
+    Args:
+        payload: Xabar tanasi (bytes, bytearray yoki memoryview)
+    Returns:
+        bytes: Uzunlik + xabar
+    """
+    if len(payload) > MAX_FRAME:
+        raise ProtocolError(f"Xabar juda katta: {len(payload)} bayt")
+    return HEADER.pack(len(payload)) + payload
+
+
+def parse_command(message, nickname=""):
+    """
+    Xabar buyruq ekanligini tekshirish ("/join xona", "/leave")
+    Eski mijozlar xabar oldiga "nickname: " qo'shib yuboradi, u ham hisobga olinadi.
+    Args:
+        message: Xabar tanasi (bytes yoki memoryview)
+        nickname: Yuboruvchi nickname
+    Returns:
+        tuple: (buyruq, argument) yoki None (oddiy xabar)
+    """
+    if len(message) > COMMAND_LIMIT:
+        return None
+    head = bytes(message)
+    prefix = f"{nickname}: ".encode('utf-8')
+    if nickname and head.startswith(prefix):
+        head = head[len(prefix):]
+    if not head.startswith(b"/"):
+        return None
+    parts = head.decode('utf-8', errors='replace').split(maxsplit=1)
+    return parts[0].lower(), parts[1].strip() if len(parts) > 1 else ""
+
+
+def recv_exact(sock, size):
+    """
+    Socketdan aynan size bayt o'qish
+    Returns:
+        bytes: O'qilgan ma'lumot (ulanish yopilsa - qisqaroq)
+    """
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            break
+        data += chunk
+    return bytes(data)
+
+
+class FrameDecoder:
+    """
+    Oqimdan framelarni ajratuvchi dekoder
+    Bitta bytearray bufer qayta ishlatiladi; frames() qaytaradigan memoryview
+    obyektlar nusxa olinmagan, ular keyingi feed()/recv_into() chaqiruvigacha
+    amal qiladi.
+    """
+
+    def __init__(self, size=BUFFER_SIZE, max_frame=MAX_FRAME):
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        self._start = 0     # O'qilmagan ma'lumot boshi
+        self._end = 0       # O'qilmagan ma'lumot oxiri
+        self.max_frame = max_frame
+
+    def __len__(self):
+        """Buferdagi hali ajratilmagan baytlar soni"""
+        return self._end - self._start
+
+    def _reserve(self, size):
+        """Bufer oxirida kamida size bayt bo'sh joy tayyorlash"""
+        if len(self._buf) - self._end >= size:
+            return
+        pending = self._end - self._start
+        if pending + size > len(self._buf):
+            # Bufer yetmaydi - kattaroq bufer yaratish (eski view'lar buzilmaydi)
+            new_size = len(self._buf)
+            while new_size < pending + size:
+                new_size *= 2
+            new_buf = bytearray(new_size)
+            new_buf[:pending] = self._view[self._start:self._end]
+            self._buf = new_buf
+            self._view = memoryview(new_buf)
+        else:
+            # Qolgan (to'liq bo'lmagan) qismni bufer boshiga surish
+            self._buf[:pending] = self._buf[self._start:self._end]
+        self._start = 0
+        self._end = pending
+
+    def feed(self, data):
+        """Qabul qilingan baytlarni buferga qo'shish (asyncio uchun)"""
+        size = len(data)
+        self._reserve(size)
+        self._view[self._end:self._end + size] = data
+        self._end += size
+
+    def recv_into(self, sock, size=BUFFER_SIZE):
+        """
+        Socketdan to'g'ridan-to'g'ri buferga o'qish (oraliq nusxasiz)
+        Returns:
+            int: O'qilgan baytlar soni (0 - ulanish yopilgan)
+        """
+        self._reserve(size)
+        count = sock.recv_into(self._view[self._end:])
+        self._end += count
+        return count
+
+    def frames(self):
+        """
+        Buferdagi barcha to'liq framelarni qaytarish
+        Yields:
+            memoryview: Xabar tanasi (nusxasiz)
+        """
+        header_size = HEADER.size
+        while self._end - self._start >= header_size:
+            (length,) = HEADER.unpack_from(self._buf, self._start)
+            if length > self.max_frame:
+                raise ProtocolError(f"Frame juda katta: {length} bayt")
+            begin = self._start + header_size
+            if self._end - begin < length:
+                # Frame hali to'liq kelmagan
+                break
+            self._start = begin + length
+            yield self._view[begin:self._start]
+        if self._start == self._end:
+            self._start = self._end = 0
+
+
+def recv_frame(sock, decoder):
+    """
+    Socketdan bitta to'liq frame o'qish (bloklovchi)
+    Args:
+        sock: Socket obyekti
+        decoder: FrameDecoder (qolgan framelar keyingi chaqiruvlar uchun saqlanadi)
+    Returns:
+        bytes: Xabar tanasi yoki None (ulanish yopilgan)
+    """
+    while True:
+        for payload in decoder.frames():
+            return bytes(payload)
+        if not decoder.recv_into(sock):
+            return None
+
+
+class FrameBatcher:
+    """
+    Ko'p kichik framelarni bitta sendall() ga yig'ish
+    Har bir xabar uchun alohida syscall o'rniga bitta katta yozuv qilinadi.
+    """
+
+    def __init__(self, sock, limit=BATCH_BYTES):
+        self.sock = sock
+        self.limit = limit
+        self._buf = bytearray()
+
+    def add(self, payload):
+        """Xabarni batchga qo'shish (limitga yetsa avtomatik yuboriladi)"""
+        if len(payload) > MAX_FRAME:
+            raise ProtocolError(f"Xabar juda katta: {len(payload)} bayt")
+        self._buf += HEADER.pack(len(payload))
+        self._buf += payload
+        if len(self._buf) >= self.limit:
+            self.flush()
+
+    def flush(self):
+        """Yig'ilgan framelarni bitta sendall() bilan yuborish"""
+        if self._buf:
+            self.sock.sendall(self._buf)
+            self._buf.clear()
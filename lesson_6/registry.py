@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Chat mijozlari reestri (session registry)
+Ikkita parallel ro'yxat (clients/nicknames) o'rniga ikkita lug'at (dict) indeksi:
+ulanish bo'yicha va nickname bo'yicha. Qo'shish, o'chirish va qidirish - O(1).
+Xabar tarqatish (fan-out) uchun o'zgarmas snapshot (tuple) beriladi, shuning uchun
+iteratsiya vaqtida mijoz qo'shilsa yoki chiqib ketsa ham xatolik bo'lmaydi.
+
+Xonalar (rooms): har bir mijoz bitta xonada bo'ladi, xabar faqat shu xona
+a'zolariga yuboriladi - bitta xabar narxi O(xona hajmi), O(jami mijozlar) emas.
+Bo'shagan xona o'chiriladi, lekin hisoblagichlari (oxirgi ROOM_HISTORY ta xona)
+saqlanadi va xona qayta ochilganda tiklanadi.
+"""
+
+import re
+import time
+from collections import OrderedDict
+
+DEFAULT_ROOM = "umumiy"     # Yangi mijozlar shu xonaga qo'shiladi
+ROOM_NAME_RE = re.compile(r"^[\w-]{1,32}$")
+ROOM_HISTORY = 1024         # Hisoblagichlari saqlanadigan bo'sh xonalar (eng oxirgilari)
+
+
+class Session:
+    """
+    Bitta mijoz sessiyasi va uning statistikasi
+    """
+
+    __slots__ = (
+        "conn", "nickname", "address", "decoder", "room", "connected_at",
+        "messages_in", "messages_out", "bytes_in", "bytes_out",
+    )
+
+    def __init__(self, conn, nickname, address=None, decoder=None):
+        self.conn = conn                # Ulanish kaliti (socket yoki StreamWriter)
+        self.nickname = nickname
+        self.address = address
+        self.decoder = decoder          # None - oddiy matn rejimi
+        self.room = None                # Joriy xona (Room)
+        self.connected_at = time.monotonic()
+        self.messages_in = 0
+        self.messages_out = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    @property
+    def framed(self):
+        """Mijoz uzunlik-prefiksli protokolni ishlatadimi"""
+        return self.decoder is not None
+
+    def record_in(self, size, count=1):
+        """Mijozdan kelgan xabarlarni hisobga olish"""
+        self.messages_in += count
+        self.bytes_in += size
+
+    def record_out(self, size, count=1):
+        """Mijozga yuborilgan xabarlarni hisobga olish"""
+        self.messages_out += count
+        self.bytes_out += size
+
+    def summary(self):
+        """Statistikani qisqa matn ko'rinishida qaytarish"""
+        duration = time.monotonic() - self.connected_at
+        return (f"{duration:.0f}s, qabul: {self.messages_in} xabar/{self.bytes_in} bayt, "
+                f"yuborildi: {self.messages_out} xabar/{self.bytes_out} bayt")
+
+
+class Room:
+    """
+    Chat xonasi: a'zolar to'plami va xabar hisoblagichlari
+    """
+
+    __slots__ = ("name", "members", "messages", "bytes", "_snapshot", "_dirty")
+
+    def __init__(self, name):
+        self.name = name
+        self.members = {}       # conn -> Session
+        self.messages = 0       # Xonaga yuborilgan xabarlar soni
+        self.bytes = 0          # Xonaga yuborilgan baytlar soni
+        self._snapshot = ()
+        self._dirty = False
+
+    def __len__(self):
+        return len(self.members)
+
+    def add(self, session):
+        self.members[session.conn] = session
+        self._dirty = True
+
+    def discard(self, session):
+        if self.members.pop(session.conn, None) is not None:
+            self._dirty = True
+
+    def sessions(self):
+        """Xona a'zolarining o'zgarmas snapshoti (fan-out uchun)"""
+        if self._dirty:
+            self._snapshot = tuple(self.members.values())
+            self._dirty = False
+        return self._snapshot
+
+    def record(self, size, count=1):
+        """Xonaga tarqatilgan xabarlarni hisobga olish"""
+        self.messages += count
+        self.bytes += size
+
+
+def valid_room_name(name):
+    """Xona nomi: 1-32 ta harf, raqam, '_' yoki '-'"""
+    return bool(ROOM_NAME_RE.match(name))
+
+
+class SessionRegistry:
+    """
+    Sessiyalar reestri: conn -> Session va nickname -> Session indekslari,
+    hamda xona nomi -> Room indeksi.
+    Thread-safe emas - threading serverida tashqi lock ostida chaqiriladi.
+    """
+
+    def __init__(self):
+        self._by_conn = {}
+        self._by_nickname = {}
+        self._rooms = {DEFAULT_ROOM: Room(DEFAULT_ROOM)}
+        self._retired = OrderedDict()   # bo'shagan xona nomi -> (xabarlar, baytlar)
+        self._snapshot = ()
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._by_conn)
+
+    def has_nickname(self, nickname):
+        """Nickname band qilinganmi - O(1)"""
+        return nickname in self._by_nickname
+
+    def add(self, session):
+        """
+        Sessiyani ro'yxatga qo'shish (standart xonaga)
+        Returns:
+            bool: Nickname band bo'lsa False (sessiya qo'shilmaydi)
+        """
+        if session.nickname in self._by_nickname:
+            return False
+        self._by_conn[session.conn] = session
+        self._by_nickname[session.nickname] = session
+        self._dirty = True
+        self.join(session, DEFAULT_ROOM)
+        return True
+
+    def remove(self, conn):
+        """
+        Sessiyani ulanish bo'yicha o'chirish
+        Returns:
+            Session: O'chirilgan sessiya yoki None (allaqachon o'chirilgan)
+        """
+        session = self._by_conn.pop(conn, None)
+        if session is not None:
+            del self._by_nickname[session.nickname]
+            self._dirty = True
+            self._leave_room(session)
+        return session
+
+    def join(self, session, name):
+        """
+        Sessiyani boshqa xonaga o'tkazish - O(1)
+        Returns:
+            Room: Avvalgi xona (yoki None)
+        """
+        previous = session.room
+        if previous is not None and previous.name == name:
+            return previous
+        self._leave_room(session)
+        room = self._rooms.get(name)
+        if room is None:
+            room = self._rooms[name] = Room(name)
+            counters = self._retired.pop(name, None)
+            if counters is not None:
+                room.messages, room.bytes = counters
+        room.add(session)
+        session.room = room
+        return previous
+
+    def _leave_room(self, session):
+        """Sessiyani joriy xonasidan chiqarish (bo'sh xonalar o'chiriladi, hisoblagichlari saqlanadi)"""
+        room = session.room
+        if room is None:
+            return
+        room.discard(session)
+        session.room = None
+        if not room.members and room.name != DEFAULT_ROOM:
+            del self._rooms[room.name]
+            self._retired[room.name] = (room.messages, room.bytes)
+            if len(self._retired) > ROOM_HISTORY:
+                self._retired.popitem(last=False)
+
+    def room(self, name):
+        """Xonani nomi bo'yicha topish (a'zosi yo'q xonalar uchun None)"""
+        return self._rooms.get(name)
+
+    def rooms(self):
+        """Barcha xonalar (konsol statistikasi uchun)"""
+        return tuple(self._rooms.values())
+
+    def get(self, conn):
+        """Ulanish bo'yicha sessiyani topish"""
+        return self._by_conn.get(conn)
+
+    def by_nickname(self, nickname):
+        """Nickname bo'yicha sessiyani topish"""
+        return self._by_nickname.get(nickname)
+
+    def sessions(self):
+        """
+        Barcha sessiyalarning o'zgarmas snapshoti (fan-out uchun)
+        Snapshot faqat ro'yxat o'zgargandan keyin qayta quriladi.
+        """
+        if self._dirty:
+            self._snapshot = tuple(self._by_conn.values())
+            self._dirty = False
+        return self._snapshot
+
+
+def format_room_stats(registry):
+    """
+    Xonalar statistikasini jadval ko'rinishida qaytarish (server konsoli uchun)
+    Returns:
+        str: Ko'p qatorli matn
+    """
+    lines = [f"{'Xona':<20} {'Mijozlar':>8} {'Xabarlar':>10} {'Baytlar':>12}"]
+    lines.append("-" * len(lines[0]))
+    for room in sorted(registry.rooms(), key=lambda r: r.messages, reverse=True):
+        lines.append(f"{room.name:<20} {len(room):>8} {room.messages:>10} {room.bytes:>12}")
+    return "\n".join(lines)
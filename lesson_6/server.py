@@ -9,6 +9,10 @@ import socket
 import threading
 from datetime import datetime
 
+from console import start_console
+from protocol import HELLO, FrameDecoder, encode_frame, parse_command, recv_frame
+from registry import DEFAULT_ROOM, Session, SessionRegistry, valid_room_name
+
 # Server sozlamalari
 HOST = '127.0.0.1'   # Lokal IP (localhost)
 PORT = 12345         # Port raqami
@@ -20,70 +24,216 @@ server.bind((HOST, PORT))
 server.listen()
 
 # Global o'zgaruvchilar
-clients = []        # Mijozlar ro'yxati
-nicknames = []      # Mijozlarning nomlari
+registry = SessionRegistry()    # Mijozlar reestri (socket va nickname bo'yicha O(1))
 lock = threading.Lock()  # Thread-safe operatsiyalar uchun
 
+BATCH_FRAMES = True  # Bitta recv() dagi bir nechta xabarni bitta sendall() bilan yuborish
+
 def get_timestamp():
     """Joriy vaqtni formatlangan ko'rinishda qaytaradi"""
     return datetime.now().strftime("%H:%M:%S")
 
-def broadcast(message, sender_client=None):
+def send_to(session, message):
     """
-    Barcha mijozlarga xabar yuborish
+    Bitta mijozga xabar yuborish (mijoz rejimiga mos ko'rinishda)
+    Args:
+        session: Mijoz sessiyasi
+        message: Xabar tanasi (bytes)
+    """
+    data = encode_frame(message) if session.framed else message
+    session.conn.sendall(data)
+    session.record_out(len(data))
+
+def broadcast(message, sender_client=None, room=None):
+    """
+    Xona (yoki barcha) mijozlariga xabar yuborish
     Args:
         message: Yuboriladigan xabar (bytes)
         sender_client: Xabar yuboruvchi mijoz (uni o'ziga yubormaslik uchun)
+        room: Xona (Room); None bo'lsa - barcha mijozlarga
+    """
+    broadcast_batch([message], sender_client, room)
+
+def broadcast_batch(messages, sender_client=None, room=None):
+    """
+    Bir nechta xabarni xona (yoki barcha) mijozlariga yuborish
+    Framing rejimidagi mijozlarga barcha xabarlar bitta sendall() bilan yuboriladi,
+    oddiy matnli mijozlarga esa har bir xabar alohida.
+    Args:
+        messages: Xabarlar ro'yxati (bytes yoki memoryview)
+        sender_client: Xabar yuboruvchi mijoz (uni o'ziga yubormaslik uchun)
+        room: Xona (Room); None bo'lsa - barcha mijozlarga
     """
+    frames = None
     with lock:
-        for client in clients:
+        if room is not None:
+            room.record(sum(len(message) for message in messages), len(messages))
+            targets = room.sessions()      # O(xona hajmi)
+        else:
+            targets = registry.sessions()
+        # Snapshot - o'chirish iteratsiyaga xalaqit bermaydi
+        for session in targets:
+            client = session.conn
             if client != sender_client:
                 try:
-                    client.send(message)
+                    if not session.framed:
+                        for message in messages:
+                            client.sendall(message)
+                            session.record_out(len(message))
+                    elif BATCH_FRAMES:
+                        if frames is None:
+                            # Framelar faqat bir marta kodlanadi
+                            frames = b"".join(encode_frame(message) for message in messages)
+                        client.sendall(frames)
+                        session.record_out(len(frames), len(messages))
+                    else:
+                        for message in messages:
+                            send_to(session, message)
                 except:
                     # Agar mijozga yuborib bo'lmasa, ro'yxatdan olib tashlash
-                    if client in clients:
-                        index = clients.index(client)
-                        clients.remove(client)
-                        if index < len(nicknames):
-                            nickname = nicknames[index]
-                            nicknames.remove(nickname)
-                        client.close()
+                    registry.remove(client)
+                    client.close()
 
-def handle(client):
+def read_nickname(client):
     """
-    Mijozdan kelayotgan xabarlarni qabul qilish va boshqalarga yuborish
+    Mijozdan nickname o'qish va protokol rejimini aniqlash
     Args:
         client: Mijoz socket obyekti
+    Returns:
+        tuple: (nickname, decoder) - decoder None bo'lsa mijoz oddiy matn rejimida
+    """
+    data = client.recv(1024)
+    while data and len(data) < len(HELLO) and HELLO.startswith(data):
+        # HELLO belgisi bo'linib kelgan bo'lishi mumkin
+        chunk = client.recv(1024)
+        if not chunk:
+            break
+        data += chunk
+
+    if not data.startswith(HELLO):
+        return data.decode('utf-8'), None
+
+    decoder = FrameDecoder()
+    decoder.feed(data[len(HELLO):])
+    payload = recv_frame(client, decoder)
+    if payload is None:
+        raise ConnectionError("Client disconnected")
+    return payload.decode('utf-8'), decoder
+
+def switch_room(session, name):
+    """
+    Mijozni boshqa xonaga o'tkazish va xonalarga xabar berish
+    Args:
+        session: Mijoz sessiyasi
+        name: Yangi xona nomi
+    """
+    with lock:
+        previous = registry.join(session, name)
+        room = session.room
+        send_to(session, f"[{get_timestamp()}] ✅ #{name} xonasiga o'tdingiz ({len(room)} mijoz)".encode('utf-8'))
+    
+    if previous is not None:
+        broadcast(f"[{get_timestamp()}] {session.nickname} #{previous.name} xonasidan chiqdi!".encode('utf-8'), room=previous)
+    broadcast(f"[{get_timestamp()}] {session.nickname} #{name} xonasiga qo'shildi!".encode('utf-8'), session.conn, room)
+    print(f"🚪 {session.nickname}: #{previous.name if previous else '-'} → #{name}")
+
+def run_command(session, command, arg):
+    """
+    Mijoz buyrug'ini bajarish
+    Args:
+        session: Mijoz sessiyasi
+        command: Buyruq ("/join", "/leave")
+        arg: Buyruq argumenti
     """
+    if command == "/join" and valid_room_name(arg):
+        if session.room is not None and session.room.name == arg:
+            reply = f"💡 Siz allaqachon #{arg} xonasidasiz"
+        else:
+            switch_room(session, arg)
+            return
+    elif command == "/join":
+        reply = "❌ Xona nomi: 1-32 ta harf, raqam, '_' yoki '-' (masalan: /join python)"
+    elif command == "/leave":
+        if session.room is not None and session.room.name == DEFAULT_ROOM:
+            reply = f"💡 Siz #{DEFAULT_ROOM} xonasidasiz"
+        else:
+            switch_room(session, DEFAULT_ROOM)
+            return
+    else:
+        reply = "💡 Buyruqlar: /join <xona>, /leave"
+    
+    with lock:
+        send_to(session, reply.encode('utf-8'))
+
+def dispatch(session, messages):
+    """
+    Mijozdan kelgan xabarlarni qayta ishlash: buyruqlar bajariladi,
+    oddiy xabarlar esa mijoz xonasiga yuboriladi
+    Args:
+        session: Mijoz sessiyasi
+        messages: Xabarlar ro'yxati (bytes yoki memoryview)
+    """
+    batch = []
+    for message in messages:
+        command = parse_command(message, session.nickname)
+        if command is None:
+            batch.append(message)
+            continue
+        if batch:
+            broadcast_batch(batch, session.conn, session.room)
+            batch = []
+        run_command(session, *command)
+    if batch:
+        broadcast_batch(batch, session.conn, session.room)
+
+def handle(session):
+    """
+    Mijozdan kelayotgan xabarlarni qabul qilish va boshqalarga yuborish
+    Args:
+        session: Mijoz sessiyasi (socket, nickname, decoder)
+    """
+    client = session.conn
+    decoder = session.decoder
     while True:
         try:
-            # Mijozdan xabar olish
-            message = client.recv(1024)
-            
-            if not message:
-                # Bo'sh xabar - mijoz ulanishni uzgan
-                raise Exception("Client disconnected")
-            
-            # Xabarni barcha mijozlarga yuborish
-            broadcast(message, sender_client=client)
+            if decoder is None:
+                # Mijozdan xabar olish (oddiy matn rejimi)
+                message = client.recv(1024)
+                
+                if not message:
+                    # Bo'sh xabar - mijoz ulanishni uzgan
+                    raise Exception("Client disconnected")
+                
+                session.record_in(len(message))
+                
+                # Xabarni xonadagi mijozlarga yuborish
+                dispatch(session, [message])
+            else:
+                # To'g'ridan-to'g'ri qayta ishlatiladigan buferga o'qish
+                if not decoder.recv_into(client):
+                    raise Exception("Client disconnected")
+                
+                # Bitta recv() da kelgan barcha xabarlarni birga yuborish
+                messages = list(decoder.frames())
+                if messages:
+                    session.record_in(sum(len(message) for message in messages), len(messages))
+                    dispatch(session, messages)
             
         except Exception as e:
             # Xatolik yoki ulanish uzilgan
-            try:
-                index = clients.index(client)
-                clients.remove(client)
-                nickname = nicknames[index]
-                nicknames.remove(nickname)
+            with lock:
+                room = session.room
+                removed = registry.remove(client)
+            
+            if removed is not None:
+                nickname = removed.nickname
                 
-                # Boshqa mijozlarga xabar yuborish
+                # Xonadagi boshqa mijozlarga xabar yuborish
                 leave_message = f"[{get_timestamp()}] {nickname} chatdan chiqdi!".encode('utf-8')
-                broadcast(leave_message)
+                broadcast(leave_message, room=room)
                 
-                print(f"❌ {nickname} chatdan chiqdi ({len(clients)} mijoz qoldi)")
-                
-            except (ValueError, IndexError):
-                pass
+                print(f"❌ {nickname} chatdan chiqdi ({len(registry)} mijoz qoldi)")
+                print(f"   📊 {removed.summary()}")
             
             try:
                 client.close()
@@ -102,8 +252,11 @@ def receive():
     print(f"📍 Server manzili: {HOST}:{PORT}")
     print(f"⏳ Mijozlarni kutmoqda...")
     print("=" * 60)
+    print("💡 Konsol buyruqlari: /rooms, /users")
     print("💡 To'xtatish uchun Ctrl+C bosing\n")
     
+    start_console(registry, lock)
+    
     while True:
         try:
             # Yangi mijozni qabul qilish
@@ -112,32 +265,33 @@ def receive():
             
             # Mijozdan nickname so'rash
             client.send("NICK".encode('utf-8'))  # Nickname so'rash signali
-            nickname = client.recv(1024).decode('utf-8')
+            nickname, decoder = read_nickname(client)
             
-            # Nickname tekshirish
-            if nickname in nicknames:
-                client.send("NICK_EXISTS".encode('utf-8'))
+            # Nickname tekshirish va mijozni ro'yxatga qo'shish (bitta lock ostida)
+            session = Session(client, nickname, address, decoder)
+            with lock:
+                added = registry.add(session)
+            
+            if not added:
+                reply = "NICK_EXISTS".encode('utf-8')
+                client.sendall(encode_frame(reply) if decoder is not None else reply)
                 client.close()
                 print(f"⚠️  Nickname '{nickname}' allaqachon mavjud, ulanish rad etildi")
                 continue
             
-            # Mijozni ro'yxatga qo'shish
-            with lock:
-                nicknames.append(nickname)
-                clients.append(client)
-            
-            print(f"👤 {nickname} chatga qo'shildi (Jami: {len(clients)} mijoz)")
+            print(f"👤 {nickname} chatga qo'shildi (Jami: {len(registry)} mijoz)")
             
             # Mijozga muvaffaqiyatli ulanish haqida xabar
-            welcome_message = f"[{get_timestamp()}] Serverga ulandingiz! Xush kelibsiz, {nickname}!".encode('utf-8')
-            client.send(welcome_message)
+            welcome_message = f"[{get_timestamp()}] Serverga ulandingiz! Xush kelibsiz, {nickname}! Xona: #{DEFAULT_ROOM}".encode('utf-8')
+            with lock:
+                send_to(session, welcome_message)
             
             # Boshqa mijozlarga yangi foydalanuvchi haqida xabar
             join_message = f"[{get_timestamp()}] {nickname} chatga qo'shildi!".encode('utf-8')
-            broadcast(join_message, sender_client=client)
+            broadcast(join_message, sender_client=client, room=session.room)
             
             # Mijoz uchun thread yaratish
-            thread = threading.Thread(target=handle, args=(client,))
+            thread = threading.Thread(target=handle, args=(session,))
             thread.daemon = True
             thread.start()
             
@@ -156,9 +310,9 @@ if __name__ == "__main__":
     finally:
         # Barcha ulanishlarni yopish
         print("\n📡 Barcha ulanishlar yopilmoqda...")
-        for client in clients:
+        for session in registry.sessions():
             try:
-                client.close()
+                session.conn.close()
             except:
                 pass
         server.close()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log kuzatuvchi benchmarki
+    1) Yig'ilib qolgan logni o'qish: readline() sikli (eski func) va Follower
+    2) Jonli kuzatish: boshqa jarayon faylga tez yozadi, Follower ushlab turadi
+
+    python bench_follower.py --lines 2000000
+    python bench_follower.py --lines 500000 --polling
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from follower import Follower
+
+LINE = "2025-01-01 12:00:00,123 INFO  [worker-3] request handled path=/api/items status=200 ms=%d\n"
+
+
+def write_lines(path, count, chunk=10000):
+    """Faylga `count` ta qator qo'shish (chunk lab, tez)"""
+    block = "".join(LINE % i for i in range(chunk))
+    with open(path, "a", encoding="utf-8") as f:
+        for _ in range(count // chunk):
+            f.write(block)
+            f.flush()
+
+
+def bench_readline(path):
+    """Eski usul: har qator uchun readline()"""
+    count = 0
+    started = time.perf_counter()
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        while f.readline():
+            count += 1
+    return count, time.perf_counter() - started
+
+
+def bench_catchup(path, use_inotify):
+    count = 0
+    started = time.perf_counter()
+    with Follower(path, from_start=True, use_inotify=use_inotify) as follower:
+        while True:
+            lines = follower.read_block()
+            if not lines and follower.file.tell() >= os.path.getsize(path):
+                break
+            count += len(lines)
+    return count, time.perf_counter() - started
+
+
+def bench_live(path, lines, use_inotify):
+    """Yozuvchi jarayon ishlayotganda kuzatish"""
+    open(path, "w").close()
+    follower = Follower(path, use_inotify=use_inotify)
+    follower.open()
+    writer = multiprocessing.Process(target=write_lines, args=(path, lines))
+    count = 0
+    started = time.perf_counter()
+    writer.start()
+    for batch in follower.batches():
+        count += len(batch)
+        if count >= lines:
+            break
+    elapsed = time.perf_counter() - started
+    writer.join()
+    follower.close()
+    return count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Log kuzatuvchi benchmarki")
+    parser.add_argument("--lines", type=int, default=2_000_000)
+    parser.add_argument("--polling", action="store_true", help="inotify o'rniga polling")
+    args = parser.parse_args()
+    use_inotify = not args.polling
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.log")
+        write_lines(path, args.lines)
+        size = os.path.getsize(path) / 1e6
+        print("=" * 60)
+        print(f"📄 {args.lines} qator, {size:.0f} MB, rejim: {'inotify' if use_inotify else 'polling'}")
+        print("=" * 60)
+
+        count, elapsed = bench_readline(path)
+        print(f"🐢 readline():  {elapsed:.2f} s, {count / elapsed / 1e6:.2f} M qator/s")
+        count, elapsed = bench_catchup(path, use_inotify)
+        print(f"🚀 Follower:    {elapsed:.2f} s, {count / elapsed / 1e6:.2f} M qator/s")
+
+        count, elapsed = bench_live(path, args.lines, use_inotify)
+        print(f"📡 Jonli (yozuvchi bilan birga): {elapsed:.2f} s, {count / elapsed / 1e6:.2f} M qator/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Kuzatuv holatini saqlash (checkpoint)
+Har bir fayl uchun (qurilma, inode, o'qilgan joy, tugallanmagan qator) kichik
+JSON faylga `interval` soniyada bir marta yoziladi. Qayta ishga tushganda
+Follower.resume() aynan shu joydan davom etadi - to'xtab turgan paytda
+yozilgan qatorlar yo'qolmaydi, katta fayl boshidan qayta o'qilmaydi.
+
+Yozish atomar: vaqtinchalik fayl + fsync + os.replace (yarim yozilgan holat
+fayli bo'lmaydi). Holat qatorlar qayta ishlangandan keyin yangilanadi; to'satdan
+o'chib qolishda oxirgi saqlashdan keyingi qatorlar qayta chiqishi mumkin (kamida
+bir marta), to'g'ri to'xtatishda (save(force=True)) takrorlanish bo'lmaydi.
+"""
+
+import json
+import os
+import time
+
+CHECKPOINT_INTERVAL = 5.0   # Holatni saqlash oralig'i (soniya)
+
+
+class Checkpoint:
+    """
+    Holat fayli
+    Args:
+        path: JSON holat fayli
+        interval: save() shu oraliqdan tez-tez diskka yozmaydi
+    """
+
+    def __init__(self, path, interval=CHECKPOINT_INTERVAL):
+        self.path = os.path.abspath(path)
+        self.interval = interval
+        self.states = {}            # kuzatilayotgan fayl (absolyut yo'l) -> Follower.position()
+        self.loaded = False         # Holat diskdan o'qildi (qayta ishga tushish)
+        self.saves = 0
+        self._saved_at = 0.0
+        self._dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except ValueError:
+            print(f"⚠️  Holat fayli buzilgan, e'tiborsiz qoldirildi: {self.path}")
+            return
+        self.states = data.get("files", {})
+        self.loaded = True
+
+    def get(self, file_path):
+        """
+        Returns:
+            dict: Saqlangan holat; yo'q bo'lsa None
+        """
+        return self.states.get(os.path.abspath(file_path))
+
+    def update(self, file_path, state):
+        self.states[os.path.abspath(file_path)] = state
+        self._dirty = True
+
+    def remove(self, file_path):
+        if self.states.pop(os.path.abspath(file_path), None) is not None:
+            self._dirty = True
+
+    def save(self, force=False):
+        """
+        Holatni diskka yozish (o'zgarish bo'lsa va interval o'tgan bo'lsa)
+        Returns:
+            bool: Yozildi
+        """
+        now = time.monotonic()
+        if not self._dirty or (not force and now - self._saved_at < self.interval):
+            return False
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"saved": time.time(), "files": self.states}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+        self._saved_at = now
+        self._dirty = False
+        self.saves += 1
+        return True
@@ -0,0 +1,400 @@
+"""
+Yuqori tezlikdagi log kuzatuvchi (tail -f)
+    - Linux da inotify (ctypes orqali) - fayl o'zgarmasa jarayon uxlaydi, yangi
+      yozuv darhol uyg'otadi; boshqa tizimlarda polling (time.sleep)
+    - Katta bloklab o'qish: bitta qayta ishlatiladigan bufer (readinto), blok bir
+      marta decode qilinadi va qatorlarga birdaniga bo'linadi
+    - Rotatsiya (inode o'zgardi: logrotate, mv + yangi fayl) - eski fayl oxirigacha
+      o'qiladi, keyin yangi fayl boshidan; truncate (hajm kichraydi) - boshidan
+
+    with Follower("app.log") as follower:
+        for lines in follower.batches():
+            ...
+"""
+
+import base64
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+
+BLOCK_SIZE = 1 << 20        # O'qish bloki (bayt)
+POLL_INTERVAL = 0.1         # Polling rejimida kutish (soniya)
+STAT_INTERVAL = 1.0         # inotify rejimida ham faylni shuncha vaqtda bir tekshirish (soniya)
+
+# inotify konstantalari (linux/inotify.h)
+IN_MODIFY = 0x002
+IN_ATTRIB = 0x004
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+IN_DELETE_SELF = 0x400
+IN_MOVE_SELF = 0x800
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+EVENT = struct.Struct("iIII")   # wd, mask, cookie, len (keyin len bayt nom)
+
+FILE_EVENTS = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_DELETE_SELF | IN_MOVE_SELF
+DIR_EVENTS = IN_CREATE | IN_MOVED_TO | IN_MOVED_FROM | IN_DELETE
+
+
+class Inotify:
+    """
+    Minimal inotify o'rami (ctypes). Hodisalar tarkibi kerak emas - faqat
+    "nimadir o'zgardi" signali; tafsilotni Follower os.stat orqali aniqlaydi.
+    Raises:
+        OSError: inotify mavjud emas (Linux emas yoki limit tugagan)
+    """
+
+    def __init__(self):
+        libc_name = ctypes.util.find_library("c")
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError(errno.ENOSYS, "inotify mavjud emas")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self.watches = {}       # yo'l -> watch descriptor
+        self.paths = {}         # watch descriptor -> yo'l
+
+    def add(self, path, mask):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error), path)
+        self.watches[path] = wd
+        self.paths[wd] = path
+        return wd
+
+    def remove(self, path):
+        wd = self.watches.pop(path, None)
+        if wd is not None:
+            if self.paths.get(wd) == path:
+                del self.paths[wd]
+            # Fayl o'chirilgan bo'lsa watch allaqachon yo'q - xato e'tiborsiz
+            self._libc.inotify_rm_watch(self.fd, wd)
+
+    def wait(self, timeout):
+        """
+        Hodisa yoki timeout ni kutish
+        Returns:
+            bool: Hodisa keldi
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        self.drain()
+        return True
+
+    def drain(self):
+        """Navbatdagi barcha hodisalarni o'qib tashlash"""
+        while True:
+            try:
+                if not os.read(self.fd, 65536):
+                    return
+            except BlockingIOError:
+                return
+
+    def events(self):
+        """
+        Navbatdagi hodisalarni o'qish (bloklamaydi)
+        Returns:
+            list: (kuzatilgan yo'l, mask, fayl nomi yoki "") - yo'l noma'lum bo'lsa None
+        """
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                return events
+            if not data:
+                return events
+            position = 0
+            while position < len(data):
+                wd, mask, _, length = EVENT.unpack_from(data, position)
+                position += EVENT.size
+                name = data[position:position + length].rstrip(b"\0")
+                position += length
+                events.append((self.paths.get(wd), mask, os.fsdecode(name)))
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class Follower:
+    """
+    Log faylni kuzatish
+    Args:
+        from_start: Fayl boshidan o'qish (aks holda faqat yangi qatorlar)
+        use_inotify: False bo'lsa har doim polling
+        inotify: Umumiy Inotify (bir nechta fayl uchun); uni chaqiruvchi yopadi
+    """
+
+    def __init__(self, path, from_start=False, block_size=BLOCK_SIZE, poll_interval=POLL_INTERVAL,
+                 use_inotify=True, encoding="utf-8", inotify=None):
+        self.path = os.path.abspath(path)
+        self.from_start = from_start
+        self.poll_interval = poll_interval
+        self.encoding = encoding
+        self.buffer = bytearray(block_size)
+        self.filled = 0             # Buferdagi tugallanmagan qator uzunligi
+        self.file = None
+        self.inode = None           # (st_dev, st_ino)
+        self.offset = 0             # Fayldagi o'qilgan joy
+        self.lines = 0
+        self.bytes = 0
+        self.rotations = 0
+        self.truncations = 0
+        self.running = False
+        self.inotify = inotify
+        self._owns_inotify = inotify is None
+        if inotify is None and use_inotify:
+            try:
+                self.inotify = Inotify()
+            except OSError:
+                self.inotify = None
+
+    @property
+    def mode(self):
+        return "inotify" if self.inotify is not None else "polling"
+
+    @property
+    def partial(self):
+        """Hali yangi qator belgisi kelmagan oxirgi qator (baytlar)"""
+        return bytes(self.buffer[:self.filled])
+
+    def __enter__(self):
+        self.open()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self, offset=None, partial=b"", source=None):
+        """
+        Faylni ochish
+        Args:
+            offset: Shu joydan boshlash (None - from_start ga qarab boshi yoki oxiri)
+            partial: Bufer boshiga qo'yiladigan tugallanmagan qator (checkpoint dan)
+            source: Haqiqatda ochiladigan fayl (rotatsiya qilingan eski fayl); kuzatish
+                baribir self.path bo'yicha davom etadi
+        """
+        self.file = open(source or self.path, "rb", buffering=0)
+        stat = os.fstat(self.file.fileno())
+        self.inode = (stat.st_dev, stat.st_ino)
+        if offset is None:
+            offset = 0 if self.from_start else stat.st_size
+        self.offset = self.file.seek(min(offset, stat.st_size))
+        if len(partial) >= len(self.buffer):
+            self.buffer.extend(bytes(len(partial)))
+        self.buffer[:len(partial)] = partial
+        self.filled = len(partial)
+        if self.inotify is not None:
+            self.inotify.remove(self.path)
+            try:
+                self.inotify.add(self.path, FILE_EVENTS)
+            except FileNotFoundError:
+                pass            # Yangi fayl hali yaratilmagan - papka kuzatuvi xabar beradi
+            if os.path.dirname(self.path) not in self.inotify.watches:
+                self.inotify.add(os.path.dirname(self.path), DIR_EVENTS)
+        self.running = True
+
+    def position(self):
+        """
+        Checkpoint uchun holat: fayl (qurilma, inode), o'qilgan joy va hali
+        chiqarilmagan tugallanmagan qator. Shu paytgacha qaytarilgan qatorlar
+        qayta ishlangandan keyin olinishi kerak.
+        """
+        return {
+            "dev": self.inode[0],
+            "inode": self.inode[1],
+            "offset": self.offset,
+            "partial": base64.b64encode(self.partial).decode("ascii"),
+        }
+
+    def _locate(self, inode):
+        """Inode bo'yicha faylni topish: joriy yo'l yoki rotatsiya qilingan nusxasi (app.log.1, app.log-2025...)"""
+        directory, base = os.path.split(self.path)
+        candidates = [self.path] + sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.startswith(base) and name != base
+        )
+        for candidate in candidates:
+            try:
+                stat = os.stat(candidate)
+            except OSError:
+                continue
+            if (stat.st_dev, stat.st_ino) == inode:
+                return candidate
+        return None
+
+    def resume(self, state):
+        """
+        Saqlangan holatdan davom etish (dastur to'xtab turgan paytdagi qatorlar
+        yo'qolmaydi, qayta o'qilmaydi)
+        Returns:
+            str: "resumed" - o'sha fayl o'sha joydan; "rotated" - avval rotatsiya
+                qilingan eski fayl oxirigacha, keyin yangi fayl boshidan;
+                "truncated" - fayl qisqargan, boshidan; "lost" - eski fayl topilmadi
+        """
+        source = self._locate((state["dev"], state["inode"]))
+        if source is None:
+            self.open(offset=0)
+            return "lost"
+        if os.stat(source).st_size < state["offset"]:
+            self.open(offset=0, source=source)
+            return "truncated"
+        self.open(offset=state["offset"], partial=base64.b64decode(state.get("partial", "")), source=source)
+        return "resumed" if source == self.path else "rotated"
+
+    def close(self):
+        self.running = False
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if self.inotify is not None:
+            if self._owns_inotify:
+                self.inotify.close()
+            else:
+                self.inotify.remove(self.path)
+            self.inotify = None
+
+    def stop(self):
+        """batches() siklini to'xtatish (boshqa threaddan ham chaqirish mumkin)"""
+        self.running = False
+
+    def _split(self, end):
+        """
+        buffer[:end] dan to'liq qatorlarni ajratish, qoldiqni bufer boshiga surish
+        Returns:
+            list: Qatorlar (str)
+        """
+        buffer = self.buffer
+        cut = buffer.rfind(b"\n", 0, end)
+        if cut < 0:
+            self.filled = end
+            if end == len(buffer):
+                # Bitta qator buferdan uzun - buferni kattalashtirish
+                buffer.extend(bytes(len(buffer)))
+            return []
+        with memoryview(buffer) as view:
+            # Blok qator chegarasida kesilgan - UTF-8 belgi bo'linmaydi
+            lines = str(view[:cut], self.encoding, "replace").split("\n")
+        rest = end - cut - 1
+        buffer[:rest] = buffer[cut + 1:end]
+        self.filled = rest
+        self.lines += len(lines)
+        return lines
+
+    def read_block(self):
+        """
+        Bitta blok o'qish
+        Returns:
+            list: To'liq qatorlar (ma'lumot bo'lmasa bo'sh)
+        """
+        with memoryview(self.buffer) as view:
+            count = self.file.readinto(view[self.filled:])
+        if not count:
+            return []
+        self.offset += count
+        self.bytes += count
+        return self._split(self.filled + count)
+
+    def flush_partial(self):
+        """Tugallanmagan qatorni qaytarish (fayl endi o'smaydi - rotatsiya)"""
+        if not self.filled:
+            return []
+        with memoryview(self.buffer) as view:
+            line = str(view[:self.filled], self.encoding, "replace")
+        self.filled = 0
+        self.lines += 1
+        return [line]
+
+    def check(self):
+        """
+        Rotatsiya va truncate ni tekshirish (yangi ma'lumot yo'q paytda chaqiriladi)
+        Returns:
+            list: Eski fayldan qolgan qatorlar
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # Fayl ko'chirildi, yangisi hali yaratilmagan - eski deskriptor bilan kutamiz
+            return []
+        if (stat.st_dev, stat.st_ino) != self.inode:
+            # Rotatsiya: eski fayl oxirigacha o'qiladi, keyin yangi fayl boshidan
+            lines = []
+            while True:
+                block = self.read_block()
+                if not block and self.file.tell() >= os.fstat(self.file.fileno()).st_size:
+                    break
+                lines.extend(block)
+            lines.extend(self.flush_partial())
+            self.file.close()
+            self.open(offset=0)
+            self.rotations += 1
+            return lines
+        if stat.st_size < self.offset:
+            # Truncate (copytruncate): fayl qisqardi - boshidan
+            lines = self.flush_partial()
+            self.offset = self.file.seek(0)
+            self.truncations += 1
+            return lines
+        return []
+
+    def wait(self, timeout=None):
+        """Yangi ma'lumot bo'lishi mumkin bo'lguncha kutish"""
+        if self.inotify is not None:
+            self.inotify.wait(STAT_INTERVAL if timeout is None else timeout)
+        else:
+            time.sleep(self.poll_interval if timeout is None else min(timeout, self.poll_interval))
+
+    def batches(self, idle=False):
+        """
+        Qatorlarni partiyalab qaytarish (har biri bitta blokdan)
+        Args:
+            idle: Yangi ma'lumotsiz kutishdan keyin bo'sh ro'yxat qaytarish (vaqt
+                oynalarini yopish uchun "yurak urishi")
+        Yields:
+            list: Qatorlar (str, yangi qator belgisisiz)
+        """
+        if self.file is None:
+            self.open()
+        while self.running:
+            lines = self.read_block()
+            if lines:
+                yield lines
+                continue
+            if self.filled < len(self.buffer) and self.file.tell() < os.fstat(self.file.fileno()).st_size:
+                # Blok qator o'rtasida tugadi - davom etish
+                continue
+            lines = self.check()
+            if lines:
+                yield lines
+                continue
+            self.wait()
+            if idle:
+                yield []
+
+    def __iter__(self):
+        for lines in self.batches():
+            yield from lines
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "lines": self.lines,
+            "bytes": self.bytes,
+            "rotations": self.rotations,
+            "truncations": self.truncations,
+        }
@@ -1,16 +1,64 @@
-import time
+import argparse
+import asyncio
+import sys
 from pathlib import Path
 
-def func(file_path):
-    with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-        f.seek(0, 2)
-        while True:
-            line = f.readline()
-            if not line:
-                time.sleep(0.1)
-                continue
-            print(line, end="")
+from checkpoint import CHECKPOINT_INTERVAL, Checkpoint
+from follower import Follower
+from multi import MultiFollower
+
+def func(file_path, from_start=False, checkpoint=None):
+    """Log faylni kuzatish (tail -f): inotify yoki polling, rotatsiya va truncate bilan"""
+    follower = Follower(file_path, from_start=from_start)
+    state = checkpoint.get(file_path) if checkpoint is not None else None
+    if state is None:
+        follower.open()
+    else:
+        print(f"♻️  Holatdan davom etilmoqda: {follower.resume(state)}", file=sys.stderr)
+    try:
+        print(f"👀 Kuzatilmoqda: {file_path} ({follower.mode})", file=sys.stderr)
+        for lines in follower.batches():
+            # Bitta blokdagi qatorlar bitta write bilan chiqariladi
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
+            if checkpoint is not None:
+                # Holat faqat qatorlar chiqarilgandan keyin yangilanadi
+                checkpoint.update(file_path, follower.position())
+                checkpoint.save()
+    finally:
+        if checkpoint is not None:
+            checkpoint.update(file_path, follower.position())
+            checkpoint.save(force=True)
+        follower.close()
+
+async def follow_many(patterns, window=1.0, from_start=False, checkpoint=None):
+    """Glob bo'yicha bir nechta faylni kuzatish: vaqt tartibida, manba fayl bilan"""
+    multi = MultiFollower(patterns, window=window, from_start=from_start, checkpoint=checkpoint)
+    print(f"👀 Kuzatilmoqda: {', '.join(patterns)} ({multi.mode}, oyna {window} s)", file=sys.stderr)
+    try:
+        async for batch in multi.batches():
+            sys.stdout.write("".join(f"[{line.source}] {line.text}\n" for line in batch))
+            sys.stdout.flush()
+    finally:
+        multi.close()
 
 if __name__ == "__main__":
-    log_path = Path(__file__).with_name("app.log")
-    func(str(log_path))
+    parser = argparse.ArgumentParser(description="Log kuzatuvchi (tail -f)")
+    parser.add_argument("patterns", nargs="*", help='Glob shablonlar, masalan "/var/log/app/*.log"')
+    parser.add_argument("--state", default=str(Path(__file__).with_name("tail.state")),
+                        help="Holat fayli (qayta ishga tushganda shu joydan davom etiladi)")
+    parser.add_argument("--no-state", action="store_true", help="Holatni saqlamaslik")
+    parser.add_argument("--interval", type=float, default=CHECKPOINT_INTERVAL, help="Holatni saqlash oralig'i (s)")
+    parser.add_argument("--from-start", action="store_true", help="Yangi fayllarni boshidan o'qish")
+    args = parser.parse_args()
+    checkpoint = None if args.no_state else Checkpoint(args.state, interval=args.interval)
+    try:
+        if args.patterns:
+            # python main.py "/var/log/app/*.log" "logs/*.log"
+            asyncio.run(follow_many(args.patterns, from_start=args.from_start, checkpoint=checkpoint))
+        else:
+            log_path = Path(__file__).with_name("app.log")
+            log_path.touch(exist_ok=True)
+            func(str(log_path), from_start=args.from_start, checkpoint=checkpoint)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,443 @@
+"""
+Bir nechta log faylni kuzatish (glob) va vaqt bo'yicha tartiblangan umumiy oqim
+    - Glob (masalan /var/log/app/*.log) bo'yicha fayllar; keyin paydo bo'lgan
+      fayllar ham avtomatik qo'shiladi, o'chirilganlari oxirigacha o'qib yopiladi
+    - Barcha fayllar bitta asyncio siklida: bitta umumiy inotify deskriptori
+      loop.add_reader orqali kuzatiladi (inotify yo'q bo'lsa - polling)
+    - Qatorlar vaqt belgisi bo'yicha birlashtiriladi: har bir qator `window`
+      soniyagacha ushlab turiladi (cheklangan qayta tartiblash oynasi), shu
+      oyna ichida kechikib kelgan qator ham o'z o'rniga tushadi
+    - Har bir qatorga manba fayl belgilanadi; bitta fayl ichidagi tartib saqlanadi
+      (vaqt belgisi orqaga ketsa qator oldingisidan keyin qoladi)
+    - checkpoint berilsa har fayl uchun faqat oynadan chiqarilgan qatorlargacha
+      bo'lgan joy saqlanadi - qayta ishga tushganda oynada qolganlar ham yo'qolmaydi;
+      holatda yo'q fayllar (to'xtab turgan paytda yaratilgan) boshidan o'qiladi
+
+    async for line in MultiFollower(["/var/log/app/*.log"]):
+        print(line.source, line.text)
+"""
+
+import asyncio
+import glob
+import os
+import re
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter, deque, namedtuple
+from datetime import datetime
+from operator import itemgetter
+
+from follower import BLOCK_SIZE, DIR_EVENTS, POLL_INTERVAL, Follower, Inotify
+
+REORDER_WINDOW = 1.0        # Qatorni tartiblash uchun ushlab turish (soniya)
+MAX_PENDING = 100_000       # Oynadagi maksimal qatorlar (oshsa eng eskisi darhol chiqariladi)
+RESCAN_INTERVAL = 2.0       # Globni qayta tekshirish oralig'i (soniya)
+BLOCKS_PER_ROUND = 4        # Bitta fayldan bir navbatda o'qiladigan bloklar (adolatli taqsimlash)
+
+# 2025-01-01 12:00:00,123 / 2025-01-01T12:00:00.123456Z / ...+05:00
+TIMESTAMP_RE = re.compile(
+    r"(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(?:[.,](\d{1,6}))?(Z|[+-]\d{2}:?\d{2})?"
+)
+
+LogLine = namedtuple("LogLine", "timestamp source text")
+_timestamp = itemgetter(0)
+
+
+class TimestampParser:
+    """
+    Qatordagi ISO 8601 vaqt belgisini epoch soniyaga aylantirish.
+    Bir soniyadagi qatorlar ko'p bo'ladi - soniya qismi keshlanadi; qator
+    "YYYY-MM-DD HH:MM:SS" bilan boshlansa (eng ko'p uchraydigan holat) to'liq
+    regex o'rniga faqat kasr qismi o'qiladi.
+    """
+
+    def __init__(self, head=64, cache_size=4096):
+        self.head = head
+        self.cache_size = cache_size
+        self._seconds = {}          # (sana, vaqt, zona) -> epoch
+        self._prefixes = {}         # qator boshidagi 19 belgi (zonasiz) -> epoch
+
+    def __call__(self, line):
+        """
+        Returns:
+            float: Epoch soniya; vaqt belgisi topilmasa None
+        """
+        seconds = self._prefixes.get(line[:19])
+        if seconds is not None:
+            mark = line[19:20]
+            if mark == "." or mark == ",":
+                tail = line[20:27]
+                count = len(tail) - len(tail.lstrip("0123456789"))
+                after = line[20 + count:21 + count]
+                if 0 < count <= 6 and not (after and after in "Z+-"):
+                    return seconds + int(tail[:count]) / 10 ** count
+            elif not (mark and mark in "Z+-0123456789"):
+                return seconds
+        return self._parse(line)
+
+    def _parse(self, line):
+        match = TIMESTAMP_RE.search(line, 0, self.head)
+        if match is None:
+            return None
+        date, clock, fraction, zone = match.groups()
+        key = (date, clock, zone)
+        seconds = self._seconds.get(key)
+        if seconds is None:
+            try:
+                # Zona ko'rsatilmagan bo'lsa - mahalliy vaqt
+                seconds = datetime.fromisoformat(f"{date}T{clock}{zone or ''}").timestamp()
+            except ValueError:
+                return None
+            if len(self._seconds) >= self.cache_size:
+                self._seconds.clear()
+                self._prefixes.clear()
+            self._seconds[key] = seconds
+        if match.start() == 0 and zone is None:
+            self._prefixes[line[:19]] = seconds
+        if fraction:
+            return seconds + int(fraction) / 10 ** len(fraction)
+        return seconds
+
+
+class Source:
+    """
+    Bitta kuzatilayotgan fayl: Follower va oxirgi vaqt belgisi (vaqtsiz qatorlar -
+    masalan traceback davomi - shu vaqtni oladi va o'z qatori ortidan chiqadi)
+    """
+
+    def __init__(self, follower, name):
+        self.follower = follower
+        self.name = name
+        self.last_timestamp = None
+        self.dirty = True           # O'qilmagan ma'lumot bo'lishi mumkin
+        self.base = None            # Birinchi yopilmagan partiya boshidagi Follower.position()
+        self.marks = deque()        # (partiyadagi qatorlar, partiyadan keyingi Follower.position())
+        self.emitted = 0            # base dan keyin chiqarilgan qatorlar
+        self.skip = 0               # Checkpoint dan: base dan keyin allaqachon chiqarilgan qatorlar
+
+
+class MultiFollower:
+    """
+    Glob bo'yicha fayllarni kuzatib, vaqt tartibidagi umumiy oqim
+    Args:
+        patterns: Glob ro'yxati (yoki bitta satr)
+        window: Qayta tartiblash oynasi (soniya)
+        from_start: Boshlanishda mavjud fayllarni boshidan o'qish
+            (keyin paydo bo'lgan fayllar har doim boshidan o'qiladi)
+        parse_time: qator -> epoch soniya yoki None
+        checkpoint: Checkpoint (holatni saqlash va davom etish)
+    """
+
+    def __init__(self, patterns, window=REORDER_WINDOW, max_pending=MAX_PENDING, from_start=False,
+                 rescan_interval=RESCAN_INTERVAL, poll_interval=POLL_INTERVAL, block_size=BLOCK_SIZE,
+                 use_inotify=True, parse_time=None, checkpoint=None):
+        self.patterns = [patterns] if isinstance(patterns, str) else list(patterns)
+        self.window = window
+        self.max_pending = max_pending
+        self.from_start = from_start
+        self.rescan_interval = rescan_interval
+        self.poll_interval = poll_interval
+        self.block_size = block_size
+        self.parse_time = parse_time or TimestampParser()
+        self.checkpoint = checkpoint
+        self.sources = {}           # yo'l -> Source
+        self._names = {}            # manba nomi (LogLine.source) -> Source
+        self.pending = []           # Vaqt bo'yicha tartiblangan LogLine lar
+        self.watermark = float("-inf")  # Ko'rilgan eng katta vaqt belgisi
+        self.emitted = 0
+        self.late = 0               # Oynadan kechikib kelgan (tartib buzilgan) qatorlar
+        self._incoming = []         # Oxirgi chiqarishdan keyin kelgan qatorlar (fayl tartibida)
+        self._arrivals = deque()    # (kelgan vaqti, partiyadagi eng katta vaqt belgisi)
+        self._forced = float("-inf")    # Muddati o'tgan partiyalar chegarasi
+        self._last_emitted = float("-inf")
+        self._wakeup = None
+        self._rescan_due = True
+        self.inotify = None
+        if use_inotify:
+            try:
+                self.inotify = Inotify()
+            except OSError:
+                self.inotify = None
+        if self.inotify is None:
+            # Pollingda yangi fayl haqida signal yo'q - u oynadan kechikmasligi uchun tezroq tekshiramiz
+            self.rescan_interval = max(min(rescan_interval, window / 2), poll_interval)
+
+    @property
+    def mode(self):
+        return "inotify" if self.inotify is not None else "polling"
+
+    # --- Fayllar ---
+
+    def _roots(self):
+        """Glob ning "sehrli" belgilarsiz boshlang'ich papkalari (yangi fayllarni kuzatish uchun)"""
+        roots = set()
+        for pattern in self.patterns:
+            parts = os.path.abspath(pattern).split(os.sep)
+            fixed = []
+            for part in parts[:-1]:
+                if glob.has_magic(part):
+                    break
+                fixed.append(part)
+            roots.add(os.sep.join(fixed) or os.sep)
+        return roots
+
+    def rescan(self, initial=False):
+        """Glob ni qayta tekshirish: yangi fayllarni qo'shish, yo'qolganlarini yopish"""
+        self._rescan_due = False
+        found = set()
+        for pattern in self.patterns:
+            found.update(os.path.abspath(path) for path in glob.glob(pattern) if os.path.isfile(path))
+
+        # Holat diskdan o'qilgan bo'lsa, unda yo'q fayl to'xtab turgan paytda yaratilgan - boshidan o'qiladi
+        resuming = self.checkpoint is not None and self.checkpoint.loaded
+        for path in found - self.sources.keys():
+            follower = Follower(path, from_start=self.from_start or resuming or not initial,
+                                block_size=self.block_size, poll_interval=self.poll_interval,
+                                use_inotify=False, inotify=self.inotify)
+            state = self.checkpoint.get(path) if self.checkpoint is not None else None
+            try:
+                if state is None:
+                    follower.open()
+                else:
+                    result = follower.resume(state)
+                    if result != "resumed":
+                        print(f"♻️  {path}: {result}")
+            except OSError:
+                continue
+            source = Source(follower, os.path.relpath(path))
+            self.sources[path] = source
+            self._names[source.name] = source
+            if self.checkpoint is not None:
+                source.base = follower.position()
+                if state is not None and result in ("resumed", "rotated"):
+                    # O'sha joydan keyingi qatorlar ketma-ketligi o'zgarmagan - ularni tashlab ketamiz
+                    source.skip = source.emitted = state.get("skip", 0)
+                self.checkpoint.update(path, dict(source.base, skip=source.skip))
+
+        for path in self.sources.keys() - found:
+            source = self.sources[path]
+            if os.path.exists(path):
+                continue
+            # Fayl o'chirildi yoki ko'chirildi (rotatsiya) - qolgan ma'lumotni o'qib yopish
+            self._read(source, limit=None)
+            self._push(source, source.follower.flush_partial())
+            source.follower.close()
+            del self.sources[path]
+            del self._names[source.name]
+            if self.checkpoint is not None:
+                self.checkpoint.remove(path)
+
+    # --- O'qish ---
+
+    def _on_inotify(self):
+        """inotify deskriptori o'qishga tayyor (loop.add_reader callback)"""
+        for path, mask, name in self.inotify.events():
+            source = self.sources.get(path)
+            if source is not None:
+                source.dirty = True
+            elif mask & DIR_EVENTS:
+                # Papkada fayl paydo bo'ldi/ko'chirildi - glob va rotatsiyani tekshirish
+                self._rescan_due = True
+                changed = self.sources.get(os.path.join(path or "", name))
+                if changed is not None:
+                    changed.dirty = True
+        self._wakeup.set()
+
+    def _push(self, source, lines):
+        """Qatorlarga vaqt belgisi qo'yib oynaga qo'shish"""
+        if not lines:
+            return
+        if self.checkpoint is not None:
+            source.marks.append((len(lines), source.follower.position()))
+            if source.skip:
+                skipped = min(source.skip, len(lines))
+                source.skip -= skipped
+                lines = lines[skipped:]
+                if not lines:
+                    return
+        now = time.time()
+        parse_time = self.parse_time
+        name = source.name
+        append = self._incoming.append
+        timestamp = source.last_timestamp
+        for text in lines:
+            parsed = parse_time(text)
+            if parsed is not None:
+                # Fayl ichida vaqt orqaga ketmaydi - fayl tartibi saqlanadi
+                if timestamp is None or parsed > timestamp:
+                    timestamp = parsed
+            elif timestamp is None:
+                timestamp = now
+            append(LogLine(timestamp, name, text))
+        source.last_timestamp = timestamp
+        self._arrivals.append((now, timestamp))
+        if timestamp > self.watermark:
+            self.watermark = timestamp
+
+    def _read(self, source, limit=BLOCKS_PER_ROUND):
+        """
+        Fayldan bloklarni o'qish
+        Returns:
+            bool: Yana ma'lumot qolgan bo'lishi mumkin
+        """
+        follower = source.follower
+        blocks = 0
+        while limit is None or blocks < limit:
+            lines = follower.read_block()
+            if not lines:
+                if follower.file.tell() < os.fstat(follower.file.fileno()).st_size:
+                    continue
+                # Yangi ma'lumot yo'q - rotatsiya yoki truncate bo'lmadimi
+                moved = follower.rotations + follower.truncations
+                lines = follower.check()
+                self._push(source, lines)
+                if not lines and self.checkpoint is not None and follower.rotations + follower.truncations != moved:
+                    source.marks.append((0, follower.position()))
+                return follower.file.tell() < os.fstat(follower.file.fileno()).st_size
+            self._push(source, lines)
+            blocks += 1
+        return True
+
+    # --- Chiqarish ---
+
+    def _ready(self, flush=False):
+        """
+        Oynadan chiqarishga tayyor qatorlar (vaqt tartibida)
+        Qator chiqadi, agar: undan `window` soniya keyingi vaqt belgisi ko'rilgan bo'lsa,
+        yoki u `window` soniyadan beri kutayotgan bo'lsa, yoki oyna to'lgan bo'lsa.
+        """
+        pending = self.pending
+        if self._incoming:
+            # Tartiblangan oyna + har fayldan tartiblangan bo'laklar: Timsort deyarli chiziqli.
+            # Barqaror saralash - bir xil vaqtli qatorlar kelish tartibida qoladi
+            pending.extend(self._incoming)
+            self._incoming = []
+            pending.sort(key=_timestamp)
+        if not pending:
+            return []
+
+        deadline = time.time() - self.window
+        arrivals = self._arrivals
+        while arrivals and arrivals[0][0] <= deadline:
+            self._forced = max(self._forced, arrivals.popleft()[1])
+        if flush:
+            cut = len(pending)
+        else:
+            cut = bisect_right(pending, max(self.watermark - self.window, self._forced), key=_timestamp)
+            cut = max(cut, len(pending) - self.max_pending)
+        if not cut:
+            return []
+
+        ready = pending[:cut]
+        del pending[:cut]
+        self.late += bisect_left(ready, self._last_emitted, key=_timestamp)
+        self._last_emitted = max(self._last_emitted, ready[-1].timestamp)
+        self.emitted += cut
+        if self.checkpoint is not None:
+            names = self._names
+            for name, count in Counter(line.source for line in ready).items():
+                source = names.get(name)
+                if source is not None:
+                    source.emitted += count
+        return ready
+
+    def commit(self, force=False):
+        """
+        Chiqarilgan qatorlar holatini checkpoint ga yozish (qatorlar qayta ishlangandan keyin).
+        Fayl ichidagi tartib saqlangani uchun holat = to'liq chiqqan partiyalardan
+        keyingi joy + undan keyin chiqarilgan qatorlar soni (skip); qayta ishga
+        tushganda oynada qolgan qatorlar qayta o'qiladi, chiqqanlari takrorlanmaydi.
+        """
+        if self.checkpoint is None:
+            return
+        for path, source in self.sources.items():
+            marks = source.marks
+            while marks and source.emitted >= marks[0][0]:
+                count, source.base = marks.popleft()
+                source.emitted -= count
+            self.checkpoint.update(path, dict(source.base, skip=source.emitted))
+        self.checkpoint.save(force)
+
+    def _timeout(self):
+        """Keyingi uyg'onishgacha vaqt: navbatdagi qator muddati yoki rescan"""
+        timeout = self.rescan_interval if self.inotify is not None else self.poll_interval
+        if self.pending and self._arrivals:
+            # Eng eski partiya kelgan vaqtidan `window` o'tgach chiqadi
+            timeout = min(timeout, max(self._arrivals[0][0] + self.window - time.time(), 0.0))
+        return timeout
+
+    async def batches(self, idle=False):
+        """
+        Tartiblangan qatorlarni partiyalab qaytarish
+        Args:
+            idle: Yangi qatorsiz kutishdan keyin bo'sh ro'yxat qaytarish
+        Yields:
+            list: LogLine lar
+        """
+        loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self.rescan(initial=True)
+        if self.inotify is not None:
+            for root in self._roots():
+                if os.path.isdir(root) and root not in self.inotify.watches:
+                    self.inotify.add(root, DIR_EVENTS)
+            loop.add_reader(self.inotify.fd, self._on_inotify)
+        last_rescan = time.monotonic()
+        try:
+            while True:
+                if self._rescan_due or time.monotonic() - last_rescan >= self.rescan_interval:
+                    self.rescan()
+                    last_rescan = time.monotonic()
+
+                more = False
+                for source in list(self.sources.values()):
+                    if source.dirty or self.inotify is None:
+                        source.dirty = self._read(source)
+                        more = more or source.dirty
+
+                ready = self._ready()
+                if ready or idle:
+                    yield ready
+                    # Iste'molchi partiyani qayta ishlab bo'ldi
+                    self.commit()
+                if more:
+                    # Katta hajm - boshqa vazifalarga ham navbat berib davom etish
+                    await asyncio.sleep(0)
+                    continue
+
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self._timeout())
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self.inotify is not None and self.inotify.fd >= 0:
+                loop.remove_reader(self.inotify.fd)
+
+    async def __aiter__(self):
+        async for batch in self.batches():
+            for line in batch:
+                yield line
+
+    def flush(self):
+        """Oynada qolgan barcha qatorlar (to'xtatishda)"""
+        return self._ready(flush=True)
+
+    def close(self):
+        """Yopish (flush() natijasi qayta ishlangan deb hisoblanadi)"""
+        self.commit(force=True)
+        for source in self.sources.values():
+            source.follower.close()
+        self.sources.clear()
+        if self.inotify is not None:
+            self.inotify.close()
+            self.inotify = None
+
+    def stats(self):
+        return {
+            "mode": self.mode,
+            "files": len(self.sources),
+            "pending": len(self.pending),
+            "emitted": self.emitted,
+            "late": self.late,
+        }
@@ -0,0 +1,655 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Log oqimi uchun filtr / parser / agregatsiya konveyeri
+Har bir bosqich partiyalar (list) ustida ishlaydi: process(partiya) -> partiya.
+Bosqichni generator sifatida ham ulash mumkin (stage(partiyalar) -> partiyalar),
+shuning uchun konveyer Follower (sinxron) va MultiFollower (asyncio) bilan
+birday ishlaydi. Xotira doimiy: faqat ochiq vaqt oynalari va cheklangan
+hisoblagichlar saqlanadi.
+
+    - Filtrlar: Grep (regex bir marta kompilyatsiya qilinadi), Contains
+    - Parserlar: JSONParser, KeyValueParser (key=value), CLFParser (Apache/Nginx
+      common/combined log), RegexParser (nomlangan guruhlar)
+    - Agregatsiyalar: CountBy (oyna bo'yicha hisoblash, masalan level/soniya),
+      TopK (Space-Saving - eng ko'p uchraydigan kalitlar), RateAlert (tezlik
+      chegarasi, histerezis bilan)
+    - Chiqish: JSONLines (yozuvlarni JSON qatorlar sifatida yozish)
+
+    python pipeline.py app.log --parse line --count level --alert level=ERROR:50
+    python pipeline.py app.log --parse kv --count status --top path --alert status=500:50
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from datetime import datetime
+
+from follower import Follower
+from multi import LogLine, TimestampParser
+
+# 2025-01-01 12:00:00,123 INFO [worker-3] xabar
+LINE_PATTERN = r"^(?P<time>\d{4}-\d{2}-\d{2}[T ][\d:.,]+)\s+(?P<level>[A-Z]+)\s+(?P<message>.*)$"
+
+# 127.0.0.1 - frank [10/Oct/2000:13:55:36 -0700] "GET /a.gif HTTP/1.0" 200 2326 "ref" "agent"
+CLF_RE = re.compile(
+    r'^(?P<host>\S+) (?P<ident>\S+) (?P<user>\S+) \[(?P<time>[^\]]+)\] '
+    r'"(?P<method>[A-Z]+) (?P<path>\S+)(?: (?P<protocol>[^"]*))?" (?P<status>\d{3}) (?P<bytes>\d+|-)'
+    r'(?: "(?P<referer>[^"]*)" "(?P<agent>[^"]*)")?'
+)
+KV_RE = re.compile(r'([\w.\-]+)=("(?:[^"\\]|\\.)*"|\S*)')
+
+TIME_FIELDS = ("time", "timestamp", "ts", "@timestamp")
+
+
+def _text(record):
+    """Yozuv matni: str, LogLine yoki parser natijasi (dict, "_raw")"""
+    if isinstance(record, str):
+        return record
+    if isinstance(record, LogLine):
+        return record.text
+    return record.get("_raw", "")
+
+
+class Stage:
+    """
+    Konveyer bosqichi: process() bitta partiyani qayta ishlaydi,
+    __call__ esa partiyalar oqimini generator sifatida o'raydi
+    """
+
+    def __init__(self):
+        self.seen = 0
+        self.passed = 0
+
+    def process(self, batch):
+        raise NotImplementedError
+
+    def __call__(self, batches):
+        for batch in batches:
+            yield self.process(batch)
+
+    def stats(self):
+        return {"stage": self.__class__.__name__, "seen": self.seen, "passed": self.passed}
+
+
+# --- Filtrlar ---
+
+class Grep(Stage):
+    """
+    Regex filtr
+    Args:
+        invert: Mos kelmaganlarini o'tkazish (grep -v)
+        field: dict yozuvlarda tekshiriladigan maydon (standart - butun qator)
+    """
+
+    def __init__(self, pattern, invert=False, field=None, flags=0):
+        super().__init__()
+        self.regex = re.compile(pattern, flags)
+        self.invert = invert
+        self.field = field
+
+    def process(self, batch):
+        if not batch:
+            return batch
+        search = self.regex.search
+        invert = self.invert
+        first = batch[0]
+        if isinstance(first, str):
+            out = [record for record in batch if (search(record) is None) is invert]
+        elif self.field is not None and isinstance(first, dict):
+            field = self.field
+            out = [record for record in batch if (search(str(record.get(field, ""))) is None) is invert]
+        else:
+            out = [record for record in batch if (search(_text(record)) is None) is invert]
+        self.seen += len(batch)
+        self.passed += len(out)
+        return out
+
+
+class Contains(Stage):
+    """Oddiy satr filtri (regexdan tezroq)"""
+
+    def __init__(self, substring, invert=False):
+        super().__init__()
+        self.substring = substring
+        self.invert = invert
+
+    def process(self, batch):
+        if not batch:
+            return batch
+        substring = self.substring
+        if isinstance(batch[0], str):
+            if self.invert:
+                out = [record for record in batch if substring not in record]
+            else:
+                out = [record for record in batch if substring in record]
+        else:
+            out = [record for record in batch if (substring in _text(record)) is not self.invert]
+        self.seen += len(batch)
+        self.passed += len(out)
+        return out
+
+
+# --- Parserlar ---
+
+class Parser(Stage):
+    """
+    Qatorni dict ga aylantiruvchi bosqich. Natijada "_raw" (asl qator), LogLine
+    bo'lsa "_source", vaqt topilsa "_time" (epoch soniya) bo'ladi. Vaqt maydoni
+    bo'lmasa qator boshidagi ISO vaqt olinadi ("<vaqt> key=value" qatorlar).
+    Tahlil qilinmagan qatorlar tashlab yuboriladi (errors da hisoblanadi).
+    """
+
+    def __init__(self, time_field=None, keep_raw=True):
+        super().__init__()
+        self.time_field = time_field
+        self.keep_raw = keep_raw
+        self.errors = 0
+        self._times = TimestampParser()
+
+    def parse(self, text):
+        """
+        Returns:
+            dict: Maydonlar; tahlil qilinmasa None
+        """
+        raise NotImplementedError
+
+    def parse_time(self, value):
+        if isinstance(value, str):
+            timestamp = self._times(value)
+            if timestamp is not None:
+                return timestamp
+            try:
+                value = float(value)    # key=value loglarda epoch satr bo'lib keladi
+            except ValueError:
+                return None
+        if isinstance(value, (int, float)):
+            # Millisoniyada berilgan epoch
+            return value / 1000.0 if value > 1e11 else float(value)
+        return None
+
+    def process(self, batch):
+        out = []
+        append = out.append
+        parse = self.parse
+        for record in batch:
+            if isinstance(record, LogLine):
+                text = record.text
+                fields = parse(text)
+                if fields is None:
+                    continue
+                fields["_source"] = record.source
+                fields.setdefault("_time", record.timestamp)
+            else:
+                text = record
+                fields = parse(text)
+                if fields is None:
+                    continue
+            if self.keep_raw:
+                fields["_raw"] = text
+            if "_time" not in fields:
+                names = (self.time_field,) if self.time_field else TIME_FIELDS
+                for name in names:
+                    if name in fields:
+                        timestamp = self.parse_time(fields[name])
+                        if timestamp is not None:
+                            fields["_time"] = timestamp
+                        break
+                else:
+                    # Vaqt maydoni yo'q - qatorning o'zidagi vaqt belgisi
+                    timestamp = self._times(text)
+                    if timestamp is not None:
+                        fields["_time"] = timestamp
+            append(fields)
+        self.seen += len(batch)
+        self.passed += len(out)
+        self.errors += len(batch) - len(out)
+        return out
+
+    def stats(self):
+        return {**super().stats(), "errors": self.errors}
+
+
+class JSONParser(Parser):
+    """JSON qatorlar (har qatorda bitta obyekt)"""
+
+    def __init__(self, time_field=None, keep_raw=False):
+        super().__init__(time_field, keep_raw)
+        self._loads = json.JSONDecoder().decode
+
+    def parse(self, text):
+        try:
+            value = self._loads(text)
+        except ValueError:
+            return None
+        return value if isinstance(value, dict) else None
+
+
+class KeyValueParser(Parser):
+    """key=value juftliklari (qiymat qo'shtirnoqda bo'lishi mumkin)"""
+
+    def parse(self, text):
+        pairs = KV_RE.findall(text)
+        if not pairs:
+            return None
+        fields = {}
+        for key, value in pairs:
+            if value[:1] == '"':
+                value = value[1:-1].replace('\\"', '"')
+            fields[key] = value
+        return fields
+
+
+class RegexParser(Parser):
+    """Nomlangan guruhli regex (standart: "vaqt LEVEL xabar" formatidagi qatorlar)"""
+
+    def __init__(self, pattern=LINE_PATTERN, time_field="time", keep_raw=True):
+        super().__init__(time_field, keep_raw)
+        self.regex = re.compile(pattern)
+
+    def parse(self, text):
+        match = self.regex.match(text)
+        return match.groupdict() if match is not None else None
+
+
+class CLFParser(Parser):
+    """
+    Common / Combined Log Format (Apache, Nginx). status va bytes - int,
+    vaqt ("10/Oct/2000:13:55:36 -0700") soniya aniqligida keshlanadi.
+    """
+
+    def __init__(self, keep_raw=False):
+        super().__init__("time", keep_raw)
+        self._clf_times = {}
+
+    def parse(self, text):
+        match = CLF_RE.match(text)
+        if match is None:
+            return None
+        fields = match.groupdict()
+        fields["status"] = int(fields["status"])
+        fields["bytes"] = 0 if fields["bytes"] == "-" else int(fields["bytes"])
+        return fields
+
+    def parse_time(self, value):
+        timestamp = self._clf_times.get(value)
+        if timestamp is None:
+            try:
+                timestamp = datetime.strptime(value, "%d/%b/%Y:%H:%M:%S %z").timestamp()
+            except ValueError:
+                return None
+            if len(self._clf_times) >= 4096:
+                self._clf_times.clear()
+            self._clf_times[value] = timestamp
+        return timestamp
+
+
+# --- Agregatsiyalar ---
+
+class EventClock:
+    """
+    Hodisa vaqti: yozuvlar vaqti bo'yicha oldinga yuradi; oqim jim tursa devor
+    soati bo'yicha suriladi (tarixiy logni o'qishda ham, jonli oqimda ham ishlaydi)
+    """
+
+    def __init__(self):
+        self.now = float("-inf")
+        self._wall = None
+
+    def observe(self, timestamp, wall):
+        if timestamp > self.now:
+            self.now = timestamp
+            self._wall = wall
+
+    def idle(self, wall):
+        if self._wall is not None:
+            self.now += wall - self._wall
+            self._wall = wall
+
+
+def _record_time(record, now):
+    timestamp = record.get("_time") if isinstance(record, dict) else None
+    return now if timestamp is None else timestamp
+
+
+class Windowed(Stage):
+    """
+    Vaqt oynalari bo'yicha agregatsiya (yozuvlarni o'zgartirmasdan o'tkazadi).
+    Vaqt - yozuvning "_time" maydoni, bo'lmasa hozirgi vaqt. Oyna undan
+    `lateness` soniya keyingi vaqt ko'rilganda yopiladi; oqim jim tursa (bo'sh
+    partiya) vaqt devor soati bo'yicha suriladi. Natijalar emit() ga beriladi.
+    """
+
+    def __init__(self, window=1.0, lateness=None, emit=None):
+        super().__init__()
+        self.window = window
+        self.lateness = window if lateness is None else lateness
+        self.emit = emit
+        self.windows = {}           # oyna boshi -> holat
+        self.clock = EventClock()
+        self.results = 0
+
+    def new_state(self):
+        raise NotImplementedError
+
+    def add(self, state, record):
+        raise NotImplementedError
+
+    def result(self, start, state):
+        raise NotImplementedError
+
+    def process(self, batch):
+        now = time.time()
+        window = self.window
+        windows = self.windows
+        add = self.add
+        clock = self.clock
+        closed_before = clock.now - self.lateness
+        for record in batch:
+            timestamp = _record_time(record, now)
+            start = timestamp - timestamp % window
+            if start + window <= closed_before:
+                continue            # Oyna allaqachon yopilgan - juda kech
+            state = windows.get(start)
+            if state is None:
+                state = windows[start] = self.new_state()
+            add(state, record)
+            clock.observe(timestamp, now)
+        if not batch:
+            clock.idle(now)
+        self.seen += len(batch)
+        self.passed += len(batch)
+        self._close(clock.now - self.lateness)
+        return batch
+
+    def _close(self, limit):
+        for start in sorted(start for start in self.windows if start + self.window <= limit):
+            self._emit(self.result(start, self.windows.pop(start)))
+
+    def _emit(self, result):
+        self.results += 1
+        if self.emit is not None:
+            self.emit(result)
+
+    def flush(self):
+        """Barcha ochiq oynalarni yopish (oqim tugaganda)"""
+        self._close(float("inf"))
+
+
+class CountBy(Windowed):
+    """Oyna ichida maydon qiymatlari soni (masalan level bo'yicha soniyada)"""
+
+    def __init__(self, field="level", window=1.0, lateness=None, emit=None):
+        super().__init__(window, lateness, emit)
+        self.field = field
+
+    def new_state(self):
+        return {}
+
+    def add(self, state, record):
+        key = record.get(self.field) if isinstance(record, dict) else None
+        state[key] = state.get(key, 0) + 1
+
+    def result(self, start, state):
+        return {"type": "count", "field": self.field, "start": start, "window": self.window, "counts": state}
+
+
+class SpaceSaving:
+    """
+    Space-Saving: eng ko'p uchraydigan kalitlar, `capacity` ta hisoblagich bilan
+    (doimiy xotira; hisob yuqoridan `error` qadar oshirilgan bo'lishi mumkin)
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+
+    def add(self, key, count=1):
+        counts = self.counts
+        if key in counts:
+            counts[key] += count
+        elif len(counts) < self.capacity:
+            counts[key] = count
+            self.errors[key] = 0
+        else:
+            # Eng kichik hisoblagichni yangi kalitga berish
+            victim = min(counts, key=counts.get)
+            floor = counts.pop(victim)
+            del self.errors[victim]
+            counts[key] = floor + count
+            self.errors[key] = floor
+
+    def top(self, k):
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:k]
+        return [(key, count, self.errors[key]) for key, count in ranked]
+
+
+class TopK(Windowed):
+    """Oyna ichida eng ko'p uchragan `k` ta qiymat (masalan path, ip)"""
+
+    def __init__(self, field, k=10, window=10.0, capacity=None, lateness=None, emit=None):
+        super().__init__(window, lateness, emit)
+        self.field = field
+        self.k = k
+        self.capacity = capacity or k * 10
+
+    def new_state(self):
+        return SpaceSaving(self.capacity)
+
+    def add(self, state, record):
+        if isinstance(record, dict):
+            key = record.get(self.field)
+            if key is not None:
+                state.add(key)
+
+    def result(self, start, state):
+        return {"type": "top", "field": self.field, "start": start, "window": self.window,
+                "top": state.top(self.k)}
+
+
+class RateAlert(Stage):
+    """
+    Tezlik ogohlantirishi: oxirgi `window` soniyada mos yozuvlar soni `threshold`
+    dan oshsa "alert", `threshold * clear_ratio` dan tushsa "resolved" (histerezis -
+    chegara atrofida tebranishda ogohlantirishlar yog'ilmaydi)
+    Args:
+        match: dict -> bool, yoki {"maydon": qiymat}
+    """
+
+    def __init__(self, name, match, threshold, window=10.0, clear_ratio=0.8, emit=None):
+        super().__init__()
+        self.name = name
+        if callable(match):
+            self.match = match
+        else:
+            expected = dict(match)
+            self.match = lambda record: all(record.get(key) == value for key, value in expected.items())
+        self.threshold = threshold
+        self.window = window
+        self.clear_ratio = clear_ratio
+        self.emit = emit
+        self.buckets = {}           # soniya -> mos yozuvlar (faqat oxirgi `window` soniya)
+        self.total = 0
+        self.clock = EventClock()
+        self.active = False
+        self.alerts = 0
+
+    def process(self, batch):
+        now = time.time()
+        match = self.match
+        buckets = self.buckets
+        clock = self.clock
+        for record in batch:
+            timestamp = _record_time(record, now)
+            clock.observe(timestamp, now)
+            if isinstance(record, dict) and timestamp > clock.now - self.window and match(record):
+                second = int(timestamp)
+                buckets[second] = buckets.get(second, 0) + 1
+                self.total += 1
+        if not batch:
+            clock.idle(now)
+        horizon = clock.now - self.window
+        for second in [second for second in buckets if second + 1 <= horizon]:
+            self.total -= buckets.pop(second)
+
+        if not self.active and self.total >= self.threshold:
+            self.active = True
+            self.alerts += 1
+            self._emit("alert", clock.now)
+        elif self.active and self.total < self.threshold * self.clear_ratio:
+            self.active = False
+            self._emit("resolved", clock.now)
+        self.seen += len(batch)
+        self.passed += len(batch)
+        return batch
+
+    def _emit(self, state, moment):
+        if self.emit is not None:
+            self.emit({"type": state, "name": self.name, "time": moment, "count": self.total,
+                       "window": self.window, "rate": self.total / self.window, "threshold": self.threshold})
+
+
+# --- Chiqish ---
+
+class JSONLines(Stage):
+    """Yozuvlarni JSON qatorlar sifatida yozish (log jo'natuvchi o'rniga)"""
+
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = stream or sys.stdout
+
+    def process(self, batch):
+        if batch:
+            dumps = json.dumps
+            self.stream.write("".join(
+                (record if isinstance(record, str) else
+                 dumps(record._asdict() if isinstance(record, LogLine) else record, ensure_ascii=False)) + "\n"
+                for record in batch
+            ))
+            self.stream.flush()
+        self.seen += len(batch)
+        self.passed += len(batch)
+        return batch
+
+
+class Pipeline:
+    """
+    Bosqichlar zanjiri
+        pipeline = Pipeline(Contains("ERROR"), KeyValueParser(), CountBy("level"), emit=print)
+        for batch in pipeline(follower.batches(idle=True)): ...     # generator
+        pipeline.process(batch)                                      # bittalab (asyncio)
+    Args:
+        emit: Agregatsiya natijalari uchun umumiy callback (bosqichda berilmagan bo'lsa)
+    """
+
+    def __init__(self, *stages, emit=None):
+        self.stages = list(stages)
+        for stage in self.stages:
+            if hasattr(stage, "emit") and stage.emit is None:
+                stage.emit = emit
+
+    def process(self, batch):
+        for stage in self.stages:
+            batch = stage.process(batch)
+        return batch
+
+    def __call__(self, batches):
+        stream = batches
+        for stage in self.stages:
+            stream = stage(stream)
+        return stream
+
+    def flush(self):
+        for stage in self.stages:
+            if isinstance(stage, Windowed):
+                stage.flush()
+
+    def stats(self):
+        return [stage.stats() for stage in self.stages]
+
+
+def format_result(result):
+    """Agregatsiya natijasini chiroyli satrga aylantirish"""
+    kind = result["type"]
+    if kind in ("count", "top"):
+        moment = time.strftime("%H:%M:%S", time.localtime(result["start"]))
+        if kind == "count":
+            counts = ", ".join(f"{key}={count}" for key, count in
+                               sorted(result["counts"].items(), key=lambda item: -item[1]))
+            return f"📊 {moment} +{result['window']:g}s {result['field']}: {counts}"
+        top = ", ".join(f"{key} ({count})" for key, count, _ in result["top"])
+        return f"🏆 {moment} +{result['window']:g}s top {result['field']}: {top}"
+    if kind == "alert":
+        return (f"🚨 {result['name']}: {result['count']} ta / {result['window']:g}s "
+                f"({result['rate']:.1f}/s, chegara {result['threshold']})")
+    return f"✅ {result['name']}: me'yorga qaytdi ({result['rate']:.1f}/s)"
+
+
+PARSERS = {
+    "json": JSONParser,
+    "kv": KeyValueParser,
+    "clf": CLFParser,
+    "line": RegexParser,
+}
+
+
+def build(args):
+    """CLI argumentlaridan konveyer yaratish"""
+    stages = []
+    for substring in args.contains or ():
+        stages.append(Contains(substring))
+    for pattern in args.grep or ():
+        stages.append(Grep(pattern))
+    for pattern in args.exclude or ():
+        stages.append(Grep(pattern, invert=True))
+    if args.parse:
+        stages.append(PARSERS[args.parse]())
+    for field in args.count or ():
+        stages.append(CountBy(field, window=args.window))
+    for field in args.top or ():
+        stages.append(TopK(field, k=args.k, window=args.top_window))
+    for spec in args.alert or ():
+        # level=ERROR:50 -> level maydoni ERROR bo'lgan yozuvlar, 10 soniyada 50 tadan ko'p
+        condition, _, threshold = spec.rpartition(":")
+        field, _, value = condition.partition("=")
+        stages.append(RateAlert(spec, {field: value}, int(threshold), window=args.alert_window))
+    if args.output:
+        stages.append(JSONLines())
+    return Pipeline(*stages, emit=lambda result: print(format_result(result), file=sys.stderr, flush=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Log oqimi konveyeri (filtr, parser, agregatsiya)")
+    parser.add_argument("path", help="Kuzatiladigan log fayl")
+    parser.add_argument("--from-start", action="store_true", help="Fayl boshidan o'qish")
+    parser.add_argument("--contains", action="append", help="Satr bo'lgan qatorlar")
+    parser.add_argument("--grep", action="append", help="Regex ga mos qatorlar")
+    parser.add_argument("--exclude", action="append", help="Regex ga mos kelmaydigan qatorlar")
+    parser.add_argument("--parse", choices=sorted(PARSERS), help="Qator formati")
+    parser.add_argument("--count", action="append", help="Maydon bo'yicha hisoblash (oyna: --window)")
+    parser.add_argument("--window", type=float, default=1.0)
+    parser.add_argument("--top", action="append", help="Eng ko'p uchraydigan qiymatlar")
+    parser.add_argument("-k", type=int, default=5)
+    parser.add_argument("--top-window", type=float, default=10.0)
+    parser.add_argument("--alert", action="append", help="maydon=qiymat:chegara (masalan level=ERROR:50)")
+    parser.add_argument("--alert-window", type=float, default=10.0)
+    parser.add_argument("--output", action="store_true", help="Yozuvlarni JSON qatorlar sifatida chiqarish")
+    args = parser.parse_args()
+
+    pipeline = build(args)
+    with Follower(args.path, from_start=args.from_start) as follower:
+        print(f"👀 Kuzatilmoqda: {args.path} ({follower.mode})", file=sys.stderr)
+        try:
+            for _ in pipeline(follower.batches(idle=True)):
+                pass
+        except KeyboardInterrupt:
+            pipeline.flush()
+            for stats in pipeline.stats():
+                print(f"📈 {stats}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
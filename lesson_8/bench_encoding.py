@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Metrikalar oqimi formatlari benchmarki
+Sintetik namunalar (ko'p yadroli host) ustida solishtiriladi:
+
+    send_json    - eski usul: har bir mijoz uchun json.dumps (websocket.send_json)
+    shared_json  - JSON har tickda bir marta kodlanadi (sampler.py)
+    delta        - sxema bir marta, keyin o'zgargan maydonlar binary (encoding.py)
+
+    python bench_encoding.py --cores 128 --clients 500 --ticks 300
+
+psutil kerak emas - namunalar tasodifiy yurish (random walk) bilan yaratiladi.
+"""
+
+import argparse
+import json
+import random
+import time
+
+from encoding import DeltaEncoder
+
+
+def make_samples(ticks, cores, idle, change, seed=1):
+    """
+    Sintetik namunalar ketma-ketligi
+    Args:
+        idle: Doim 0% bo'lgan yadrolar ulushi
+        change: Har tickda qiymati o'zgaradigan yadrolar ehtimoli
+    """
+    rng = random.Random(seed)
+    busy = [i >= int(cores * idle) for i in range(cores)]
+    per_core = [round(rng.uniform(5, 60), 1) if b else 0.0 for b in busy]
+    sent = recv = 10 ** 9
+    memory_used = 8 * 1024 ** 3
+    samples = []
+    for _ in range(ticks):
+        for i in range(cores):
+            if busy[i] and rng.random() < change:
+                per_core[i] = round(min(100.0, max(0.0, per_core[i] + rng.uniform(-5, 5))), 1)
+        up = rng.randrange(0, 200_000)
+        down = rng.randrange(0, 2_000_000)
+        sent += up
+        recv += down
+        if rng.random() < 0.3:
+            memory_used += rng.randrange(-4096, 4096) * 1024
+        samples.append({
+            "cpu_percent": round(sum(per_core) / cores, 1),
+            "cpu_per_core": list(per_core),
+            "memory_percent": round(memory_used / (64 * 1024 ** 3) * 100, 1),
+            "memory_used": memory_used,
+            "memory_total": 64 * 1024 ** 3,
+            "load_1": 3.52,
+            "load_5": 3.11,
+            "load_15": 2.87,
+            "net_bytes_sent": sent,
+            "net_bytes_recv": recv,
+            "net_upload_bps": up,
+            "net_download_bps": down,
+        })
+    return samples
+
+
+def bench_send_json(samples, clients):
+    """Har bir mijoz uchun alohida json.dumps (starlette send_json kabi)"""
+    total = 0
+    start = time.perf_counter()
+    for sample in samples:
+        for _ in range(clients):
+            total += len(json.dumps(sample, separators=(",", ":"), ensure_ascii=False).encode('utf-8'))
+    return time.perf_counter() - start, total
+
+
+def bench_shared_json(samples, clients):
+    """JSON tickda bir marta kodlanadi, baytlar har bir mijozga yuboriladi"""
+    total = 0
+    start = time.perf_counter()
+    for sample in samples:
+        total += len(json.dumps(sample, separators=(",", ":")).encode('utf-8')) * clients
+    return time.perf_counter() - start, total
+
+
+def bench_delta(samples, clients):
+    """Sxema bir marta, keyin delta kadrlar (tickda bir marta kodlanadi)"""
+    encoder = DeltaEncoder()
+    total = 0
+    start = time.perf_counter()
+    for sample in samples:
+        frame = encoder.encode(sample, text="")
+        total += len(frame.delta) * clients
+    elapsed = time.perf_counter() - start
+    total += len(encoder.schema) * clients
+    return elapsed, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Metrikalar oqimi formatlari benchmarki")
+    parser.add_argument("--cores", type=int, default=128, help="CPU yadrolari soni")
+    parser.add_argument("--clients", type=int, default=100, help="WebSocket mijozlari soni")
+    parser.add_argument("--ticks", type=int, default=300, help="Tick (soniya) soni")
+    parser.add_argument("--idle", type=float, default=0.5, help="Bo'sh (0%%) yadrolar ulushi")
+    parser.add_argument("--change", type=float, default=0.5, help="Yadro qiymati o'zgarish ehtimoli")
+    parser.add_argument("--output", help="Natijani JSON faylga yozish")
+    args = parser.parse_args()
+
+    samples = make_samples(args.ticks, args.cores, args.idle, args.change)
+    results = {}
+    for name, bench in (
+        ("send_json", bench_send_json),
+        ("shared_json", bench_shared_json),
+        ("delta", bench_delta),
+    ):
+        elapsed, total = bench(samples, args.clients)
+        results[name] = {
+            "bytes_per_tick_per_client": round(total / args.ticks / args.clients, 1),
+            "bytes_per_sec_all_clients": round(total / args.ticks),
+            "encode_us_per_tick": round(elapsed / args.ticks * 1e6, 1),
+        }
+
+    print("=" * 72)
+    print(f"📊 {args.cores} yadro, {args.clients} mijoz, {args.ticks} tick (1 tick/s)")
+    print("=" * 72)
+    print(f"{'format':<14}{'bayt/tick/mijoz':>18}{'bayt/s (jami)':>18}{'kodlash µs/tick':>20}")
+    for name, result in results.items():
+        print(
+            f"{name:<14}{result['bytes_per_tick_per_client']:>18}"
+            f"{result['bytes_per_sec_all_clients']:>18}{result['encode_us_per_tick']:>20}"
+        )
+    base = results["send_json"]
+    delta = results["delta"]
+    print("-" * 72)
+    print(f"💡 delta: {base['bytes_per_sec_all_clients'] / max(delta['bytes_per_sec_all_clients'], 1):.1f}x kam bayt, "
+          f"{base['encode_us_per_tick'] / max(delta['encode_us_per_tick'], 0.1):.1f}x tezroq kodlash (send_json ga nisbatan)")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"params": vars(args), "results": results}, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+Ixcham (delta) metrikalar formati
+Har tickda to'liq JSON (uzun kalit nomlari va butun cpu_per_core ro'yxati) yuborish
+o'rniga mijoz bir marta sxemani (schema) oladi, keyin faqat o'zgargan maydonlar
+joylangan binary kadrlar keladi.
+
+Sxema (matnli kadr, JSON):
+    {"type": "schema", "version": 1,
+     "fields": [{"name": "cpu_percent", "type": "f", "count": 1}, ...]}
+
+Binary kadr (little-endian):
+    B   turi: 1 - to'liq (key) kadr, 2 - delta kadr
+    H   sxema versiyasi
+    I   tartib raqami (seq)
+    bitmap - har bir slot uchun 1 bit (o'zgargan slotlar)
+    qiymatlar - o'zgargan slotlar tartibida: "f" - float32, "d" - float64
+
+Delta kadr oldingi tickka nisbatan kodlanadi; kadr tashlab yuborilgan mijozga
+(seq ketma-ketligi buzilganda) to'liq kadr yuboriladi.
+"""
+
+import json
+import struct
+
+KEY_FRAME = 1
+DELTA_FRAME = 2
+HEADER = struct.Struct("<BHI")
+
+# Maydon turlari: foizlar va load - float32, baytlar hisoblagichlari - float64
+FIELD_TYPES = {
+    "cpu_percent": "f",
+    "cpu_per_core": "f",
+    "memory_percent": "f",
+    "memory_used": "d",
+    "memory_total": "d",
+    "load_1": "f",
+    "load_5": "f",
+    "load_15": "f",
+    "net_bytes_sent": "d",
+    "net_bytes_recv": "d",
+    "net_upload_bps": "d",
+    "net_download_bps": "d",
+}
+
+
+class Frame:
+    """
+    Bitta tick uchun barcha formatlardagi kadrlar
+    JSON va delta bir marta kodlanadi, to'liq kadr esa faqat kerak bo'lganda.
+    """
+
+    __slots__ = ("text", "seq", "version", "schema", "delta", "_values", "_types", "_key")
+
+    def __init__(self, text, seq, version, schema, delta, values, types):
+        self.text = text            # To'liq JSON (format=json mijozlar uchun)
+        self.seq = seq
+        self.version = version
+        self.schema = schema        # Sxema matni (shu versiya uchun)
+        self.delta = delta          # Oldingi tickka nisbatan delta kadr
+        self._values = values
+        self._types = types
+        self._key = None
+
+    @property
+    def key(self):
+        """To'liq kadr (birinchi murojaatda bir marta kodlanadi)"""
+        if self._key is None:
+            count = len(self._values)
+            header = HEADER.pack(KEY_FRAME, self.version, self.seq)
+            bitmap = bytes([0xFF]) * (count // 8)
+            if count % 8:
+                bitmap += bytes([(1 << (count % 8)) - 1])
+            self._key = header + bitmap + struct.pack("<" + self._types, *self._values)
+        return self._key
+
+
+class DeltaEncoder:
+    """
+    Namunalarni sxema + delta binary kadrlarga kodlash
+    """
+
+    def __init__(self):
+        self.version = 0
+        self.seq = 0
+        self.schema = None      # Joriy sxema matni
+        self._layout = None     # ((nomi, soni), ...) - sxema o'zgarganini aniqlash uchun
+        self._types = ""        # Har bir slot turi ("f"/"d")
+        self._prev = None       # Oldingi tick qiymatlari
+
+    def _build_schema(self, layout):
+        """Yangi sxemani yaratish (masalan, yadrolar soni o'zgarganda)"""
+        self.version = (self.version + 1) & 0xFFFF
+        self._layout = layout
+        self._types = "".join(FIELD_TYPES.get(name, "d") * count for name, count in layout)
+        self._prev = None
+        self.schema = json.dumps({
+            "type": "schema",
+            "version": self.version,
+            "fields": [
+                {"name": name, "type": FIELD_TYPES.get(name, "d"), "count": count}
+                for name, count in layout
+            ],
+        }, separators=(",", ":"))
+
+    def _flatten(self, sample):
+        """Namunani slotlar ro'yxatiga yoyish; ro'yxat maydonlari bir nechta slot oladi"""
+        layout = []
+        values = []
+        for name, value in sample.items():
+            if isinstance(value, (list, tuple)):
+                layout.append((name, len(value)))
+                values.extend(value)
+            else:
+                layout.append((name, 1))
+                values.append(value)
+        return tuple(layout), values
+
+    def encode(self, sample, text=None):
+        """
+        Bitta namunani kodlash
+        Args:
+            sample: Sampler namunasi (dict)
+            text: Tayyor JSON matni (bo'lmasa shu yerda kodlanadi)
+        Returns:
+            Frame
+        """
+        layout, values = self._flatten(sample)
+        if layout != self._layout:
+            self._build_schema(layout)
+
+        self.seq = (self.seq + 1) & 0xFFFFFFFF
+        prev = self._prev
+        count = len(values)
+        bitmap = bytearray((count + 7) // 8)
+        changed = []
+        fmt = ["<"]
+        types = self._types
+        for i, value in enumerate(values):
+            if prev is None or prev[i] != value:
+                bitmap[i >> 3] |= 1 << (i & 7)
+                changed.append(value)
+                fmt.append(types[i])
+        self._prev = values
+
+        delta = (
+            HEADER.pack(DELTA_FRAME, self.version, self.seq)
+            + bytes(bitmap)
+            + struct.pack("".join(fmt), *changed)
+        )
+        if text is None:
+            text = json.dumps(sample, separators=(",", ":"))
+        return Frame(text, self.seq, self.version, self.schema, delta, values, types)
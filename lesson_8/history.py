@@ -0,0 +1,187 @@
+"""
+Metrikalar tarixi: xotiradagi halqa buferlar (ring buffer)
+Har bir daraja (tier) - belgilangan o'lchamdagi `array` massivlari va bosh indeks,
+yangi yozuv eng eskisining o'rniga yoziladi, xotira hajmi o'zgarmaydi:
+
+    1s  - har soniyadagi qiymat, 1 soat (3600 nuqta)
+    10s - 10 soniyalik min/max/avg, 24 soat (8640 nuqta)
+
+Yangi ochilgan dashboard /history orqali grafiklarni darhol to'ldiradi.
+"""
+
+import re
+import time
+from array import array
+
+# Tarixda saqlanadigan skalyar metrikalar
+METRICS = (
+    "cpu_percent",
+    "memory_percent",
+    "load_1",
+    "load_5",
+    "load_15",
+    "net_upload_bps",
+    "net_download_bps",
+)
+
+# (nomi, qadam soniyalarda, nuqtalar soni)
+TIERS = (
+    ("1s", 1, 3600),
+    ("10s", 10, 8640),
+)
+
+RANGE_RE = re.compile(r"^(\d+)([smhd]?)$")
+RANGE_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_range(text):
+    """
+    Vaqt oralig'ini soniyalarga o'tkazish: "300", "90s", "15m", "1h", "24h"
+    Raises:
+        ValueError: Noto'g'ri format
+    """
+    match = RANGE_RE.match(text.strip().lower())
+    if not match or int(match.group(1)) <= 0:
+        raise ValueError(f"Noto'g'ri oraliq: {text!r} (masalan: 300, 15m, 1h, 24h)")
+    return int(match.group(1)) * RANGE_UNITS[match.group(2)]
+
+
+class Tier:
+    """
+    Bitta tarix darajasi: har bir metrika uchun belgilangan o'lchamdagi massivlar
+    step == 1 bo'lsa faqat qiymat saqlanadi, aks holda avg/min/max.
+    """
+
+    def __init__(self, name, step, capacity, metrics=METRICS):
+        self.name = name
+        self.step = step
+        self.capacity = capacity
+        self.metrics = metrics
+        self.aggregated = step > 1
+        self.times = array("q", bytes(8 * capacity))        # Bucket boshlanish vaqti (epoch s)
+        self.avg = {m: array("d", bytes(8 * capacity)) for m in metrics}
+        if self.aggregated:
+            self.min = {m: array("d", bytes(8 * capacity)) for m in metrics}
+            self.max = {m: array("d", bytes(8 * capacity)) for m in metrics}
+        self.head = 0       # Keyingi yoziladigan indeks
+        self.count = 0      # To'ldirilgan nuqtalar soni
+
+        # Joriy (hali yopilmagan) bucket yig'indilari
+        self._bucket = None
+        self._sum = dict.fromkeys(metrics, 0.0)
+        self._min = dict.fromkeys(metrics, 0.0)
+        self._max = dict.fromkeys(metrics, 0.0)
+        self._n = 0
+
+    def _write(self, bucket, avg, low=None, high=None):
+        """Bitta nuqtani bufer boshiga yozish (eng eskisi ustidan)"""
+        i = self.head
+        self.times[i] = bucket
+        for m in self.metrics:
+            self.avg[m][i] = avg[m]
+            if self.aggregated:
+                self.min[m][i] = low[m]
+                self.max[m][i] = high[m]
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def _flush(self):
+        """Joriy bucketni yopib, min/max/avg ni yozish"""
+        if self._n:
+            avg = {m: self._sum[m] / self._n for m in self.metrics}
+            self._write(self._bucket, avg, self._min, self._max)
+
+    def add(self, ts, values):
+        """
+        Yangi namuna qo'shish
+        Args:
+            ts: Vaqt (epoch soniya)
+            values: {metrika: qiymat}
+        """
+        bucket = int(ts) // self.step * self.step
+        if not self.aggregated:
+            if self.count and self.times[self.head - 1] == bucket:
+                return      # Shu soniya uchun nuqta allaqachon bor
+            self._write(bucket, values)
+            return
+
+        if bucket != self._bucket:
+            self._flush()
+            self._bucket = bucket
+            self._n = 0
+        for m in self.metrics:
+            value = values[m]
+            if self._n == 0:
+                self._sum[m] = value
+                self._min[m] = value
+                self._max[m] = value
+            else:
+                self._sum[m] += value
+                if value < self._min[m]:
+                    self._min[m] = value
+                if value > self._max[m]:
+                    self._max[m] = value
+        self._n += 1
+
+    def query(self, metric, since):
+        """
+        since vaqtidan keyingi nuqtalarni ustunlar (columnar) ko'rinishida qaytarish
+        Returns:
+            dict: t (boshlanishdan siljish), avg [, min, max]
+        """
+        # Eng eski nuqtadan boshlab tartiblangan indekslar
+        start = (self.head - self.count) % self.capacity
+        order = [(start + k) % self.capacity for k in range(self.count)]
+        times = self.times
+        order = [i for i in order if times[i] >= since]
+
+        t0 = times[order[0]] if order else int(since)
+        result = {
+            "tier": self.name,
+            "step": self.step,
+            "t0": t0,
+            "t": [times[i] - t0 for i in order],
+            "avg": [round(self.avg[metric][i], 2) for i in order],
+        }
+        if self.aggregated:
+            result["min"] = [round(self.min[metric][i], 2) for i in order]
+            result["max"] = [round(self.max[metric][i], 2) for i in order]
+        return result
+
+
+class MetricsHistory:
+    """
+    Bir nechta darajali metrikalar tarixi
+    """
+
+    def __init__(self, metrics=METRICS, tiers=TIERS):
+        self.metrics = metrics
+        self.tiers = [Tier(name, step, capacity, metrics) for name, step, capacity in tiers]
+
+    def record(self, ts, sample):
+        """Sampler namunasini barcha darajalarga yozish"""
+        values = {m: float(sample.get(m, 0.0)) for m in self.metrics}
+        for tier in self.tiers:
+            tier.add(ts, values)
+
+    def tier_for(self, seconds):
+        """Oraliqni qoplaydigan eng aniq (kichik qadamli) daraja"""
+        for tier in self.tiers:
+            if tier.step * tier.capacity >= seconds:
+                return tier
+        return self.tiers[-1]
+
+    def query(self, metric, seconds, now=None):
+        """
+        Metrikaning oxirgi `seconds` soniyalik tarixi
+        Raises:
+            KeyError: Noma'lum metrika
+        """
+        if metric not in self.metrics:
+            raise KeyError(metric)
+        now = time.time() if now is None else now
+        tier = self.tier_for(seconds)
+        result = tier.query(metric, int(now) - seconds)
+        result["metric"] = metric
+        return result
@@ -1,10 +1,29 @@
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, Query, WebSocket, WebSocketDisconnect, Request
 from fastapi.templating import Jinja2Templates
-import asyncio
-import psutil
-import os
 
-app = FastAPI()
+from history import MetricsHistory, parse_range
+from sampler import MetricsSampler
+
+# Barcha WebSocket mijozlari uchun bitta umumiy sampler
+sampler = MetricsSampler()
+
+# Metrikalar tarixi (1s - 1 soat, 10s - 24 soat)
+history = MetricsHistory()
+sampler.add_listener(history.record)
+
+STREAM_FORMATS = ("json", "delta")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    sampler.start()
+    yield
+    await sampler.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 templates = Jinja2Templates(directory="templates")
 
@@ -16,56 +35,73 @@ async def index(request: Request):
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "subscribers": len(sampler.subscribers),
+        "ticks": sampler.ticks,
+    }
+
+
+@app.get("/history")
+async def metrics_history(metric: str = "cpu_percent", range_: str = Query("15m", alias="range")):
+    """
+    Metrika tarixi (grafiklarni darhol to'ldirish uchun)
+    Javob ustunlar ko'rinishida: t0 + t[] siljishlar, avg[] (10s darajada min[]/max[] ham)
+    """
+    try:
+        seconds = parse_range(range_)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if metric not in history.metrics:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Noma'lum metrika: {metric} (mavjud: {', '.join(history.metrics)})",
+        )
+    return history.query(metric, seconds)
 
 
 @app.websocket("/ws/metrics")
 async def websocket_metrics(websocket: WebSocket):
+    """
+    Metrikalar oqimi
+    ?format=json  - har tickda to'liq JSON (standart)
+    ?format=delta - avval sxema (matn), keyin faqat o'zgargan maydonlar (binary)
+    """
+    stream_format = websocket.query_params.get("format", "json")
+    if stream_format not in STREAM_FORMATS:
+        await websocket.close(code=1003)
+        return
     await websocket.accept()
-    prev_net = psutil.net_io_counters()
+    subscriber = sampler.subscribe()
+    version = None      # Mijozga yuborilgan sxema versiyasi
+    last_seq = None     # Mijozga yuborilgan oxirgi kadr raqami
     try:
+        # Yangi mijoz keyingi tickni kutmasdan oxirgi kadrni oladi
+        frame = sampler.latest
         while True:
-            cpu_percent = psutil.cpu_percent(interval=None)
-            cpu_per_core = psutil.cpu_percent(interval=None, percpu=True)
-            virtual_mem = psutil.virtual_memory()
-
-            try:
-                load1, load5, load15 = os.getloadavg()
-            except (OSError, AttributeError):
-                load1 = load5 = load15 = 0.0
-
-            current_net = psutil.net_io_counters()
-            if prev_net is not None:
-                bytes_sent_diff = max(current_net.bytes_sent - prev_net.bytes_sent, 0)
-                bytes_recv_diff = max(current_net.bytes_recv - prev_net.bytes_recv, 0)
-            else:
-                bytes_sent_diff = 0
-                bytes_recv_diff = 0
-
-            upload_bps = bytes_sent_diff
-            download_bps = bytes_recv_diff
-
-            data = {
-                "cpu_percent": cpu_percent,
-                "cpu_per_core": cpu_per_core,
-                "memory_percent": virtual_mem.percent,
-                "memory_used": virtual_mem.used,
-                "memory_total": virtual_mem.total,
-                "load_1": load1,
-                "load_5": load5,
-                "load_15": load15,
-                "net_bytes_sent": current_net.bytes_sent,
-                "net_bytes_recv": current_net.bytes_recv,
-                "net_upload_bps": upload_bps,
-                "net_download_bps": download_bps,
-            }
-
-            prev_net = current_net
-
-            await websocket.send_json(data)
-            await asyncio.sleep(1)
+            if frame is not None:
+                if stream_format == "json":
+                    await websocket.send_text(frame.text)
+                else:
+                    if frame.version != version:
+                        await websocket.send_text(frame.schema)
+                        version = frame.version
+                        last_seq = None
+                    # Kadr tashlab yuborilgan bo'lsa - delta emas, to'liq kadr
+                    if last_seq is not None and frame.seq == (last_seq + 1) & 0xFFFFFFFF:
+                        await websocket.send_bytes(frame.delta)
+                    else:
+                        await websocket.send_bytes(frame.key)
+                    last_seq = frame.seq
+            frame = await subscriber.get()
+            if frame is None:
+                # Mijoz juda sekin - sampler uni kutmaydi
+                await websocket.close(code=1013)
+                break
     except WebSocketDisconnect:
         pass
+    finally:
+        sampler.unsubscribe(subscriber)
 
 
 if __name__ == "__main__":
@@ -76,8 +112,9 @@ if __name__ == "__main__":
     print("=" * 60)
     print("📍 Server: http://localhost:8000")
     print("📊 Dashboard: http://localhost:8000")
-    print("🔌 WebSocket: ws://localhost:8000/ws/metrics")
+    print("🔌 WebSocket: ws://localhost:8000/ws/metrics (?format=delta - ixcham binary)")
     print("💚 Health Check: http://localhost:8000/health")
+    print("📈 Tarix: http://localhost:8000/history?metric=cpu_percent&range=1h")
     print("📖 API Docs: http://localhost:8000/docs")
     print("=" * 60)
     print("💡 Real vaqt rejimida sistema metrikalarini ko'rsatadi:")
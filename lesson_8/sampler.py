@@ -0,0 +1,173 @@
+"""
+Umumiy metrikalar sampleri
+Har bir WebSocket ulanishi o'zi psutil chaqirishi o'rniga bitta fon vazifasi
+har tickda metrikalarni bir marta yig'adi, JSON ni bir marta kodlaydi va tayyor
+matnni barcha obunachilarga (subscriber) cheklangan navbatlar orqali yuboradi.
+Sekin mijoz navbatidagi eski kadrlar tashlab yuboriladi; juda uzoq orqada qolgan
+mijoz esa uziladi - sampler hech qachon kutib qolmaydi.
+Har tick uchun JSON va ixcham delta kadr (encoding.py) birga tayyorlanadi.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import psutil
+
+from encoding import DeltaEncoder
+
+SAMPLE_INTERVAL = 1.0   # Tick oralig'i (soniya)
+QUEUE_SIZE = 4          # Har bir obunachi navbatidagi maksimal kadrlar soni
+MAX_SKIPS = 30          # Ketma-ket shuncha kadr tashlansa - mijoz uziladi
+
+
+class Subscriber:
+    """
+    Bitta WebSocket obunachisi: cheklangan kadrlar navbati
+    """
+
+    __slots__ = ("queue", "skipped", "lagging", "dropped")
+
+    def __init__(self, size=QUEUE_SIZE):
+        self.queue = asyncio.Queue(maxsize=size)
+        self.skipped = 0        # Jami tashlab yuborilgan kadrlar
+        self.lagging = 0        # Ketma-ket tashlab yuborilgan kadrlar
+        self.dropped = False    # Mijoz juda sekin - uzilishi kerak
+
+    def offer(self, payload, max_skips=MAX_SKIPS):
+        """
+        Kadrni navbatga qo'yish (hech qachon bloklanmaydi)
+        Navbat to'la bo'lsa eng eski kadr tashlanadi.
+        """
+        if self.dropped:
+            return
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.skipped += 1
+            self.lagging += 1
+            if self.lagging >= max_skips:
+                # Navbatni tozalab, uzish signalini (None) qo'yish
+                self.dropped = True
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.queue.put_nowait(None)
+                return
+        else:
+            self.lagging = 0
+        self.queue.put_nowait(payload)
+
+    async def get(self):
+        """Keyingi kadrni kutish (None - mijoz uzilishi kerak)"""
+        return await self.queue.get()
+
+
+class MetricsSampler:
+    """
+    Metrikalarni bitta fon vazifasida yig'ib, barcha obunachilarga tarqatish
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL, queue_size=QUEUE_SIZE, max_skips=MAX_SKIPS):
+        self.interval = interval
+        self.queue_size = queue_size
+        self.max_skips = max_skips
+        self.subscribers = set()
+        self.listeners = []         # Har bir namuna uchun chaqiriladi: listener(ts, data)
+        self.latest = None          # Oxirgi kodlangan kadr (yangi obunachilar uchun)
+        self.encoder = DeltaEncoder()
+        self.ticks = 0
+        self._prev_net = None
+        self._task = None
+
+    def collect(self):
+        """Bitta metrikalar namunasini yig'ish"""
+        cpu_percent = psutil.cpu_percent(interval=None)
+        cpu_per_core = psutil.cpu_percent(interval=None, percpu=True)
+        virtual_mem = psutil.virtual_memory()
+
+        try:
+            load1, load5, load15 = os.getloadavg()
+        except (OSError, AttributeError):
+            load1 = load5 = load15 = 0.0
+
+        current_net = psutil.net_io_counters()
+        if self._prev_net is not None:
+            bytes_sent_diff = max(current_net.bytes_sent - self._prev_net.bytes_sent, 0)
+            bytes_recv_diff = max(current_net.bytes_recv - self._prev_net.bytes_recv, 0)
+        else:
+            bytes_sent_diff = 0
+            bytes_recv_diff = 0
+        self._prev_net = current_net
+
+        return {
+            "cpu_percent": cpu_percent,
+            "cpu_per_core": cpu_per_core,
+            "memory_percent": virtual_mem.percent,
+            "memory_used": virtual_mem.used,
+            "memory_total": virtual_mem.total,
+            "load_1": load1,
+            "load_5": load5,
+            "load_15": load15,
+            "net_bytes_sent": current_net.bytes_sent,
+            "net_bytes_recv": current_net.bytes_recv,
+            "net_upload_bps": bytes_sent_diff,
+            "net_download_bps": bytes_recv_diff,
+        }
+
+    def subscribe(self):
+        """Yangi obunachi yaratish"""
+        subscriber = Subscriber(self.queue_size)
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        self.subscribers.discard(subscriber)
+
+    def add_listener(self, listener):
+        """Xom namunalarni qabul qiluvchini qo'shish (masalan, tarix buferi)"""
+        self.listeners.append(listener)
+
+    def publish(self, payload):
+        """Tayyor kadrni (encoding.Frame) barcha obunachilarga yuborish"""
+        self.latest = payload
+        for subscriber in tuple(self.subscribers):
+            subscriber.offer(payload, self.max_skips)
+
+    async def run(self):
+        """Asosiy sikl: har tickda bir marta yig'ish, kodlash va tarqatish"""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            # Tick vaqtini siljitmaslik uchun monoton soat bo'yicha kutish
+            next_tick += self.interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+            data = self.collect()
+            now = time.time()
+            for listener in self.listeners:
+                listener(now, data)
+            text = json.dumps(data, separators=(",", ":"))
+            self.publish(self.encoder.encode(data, text))
+            self.ticks += 1
+
+    def start(self):
+        """Fon vazifasini ishga tushirish"""
+        if self._task is None:
+            # Birinchi cpu_percent(None) chaqiruvi 0.0 qaytaradi - oldindan chaqirib qo'yamiz
+            psutil.cpu_percent(interval=None)
+            psutil.cpu_percent(interval=None, percpu=True)
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Fon vazifasini to'xtatish"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None